@@ -0,0 +1,158 @@
+"""Tests for the expression compiler (toys/common/expressions.py)."""
+import sys
+import os
+import numpy as np
+import math
+
+import pytest
+
+# Ensure toys/ is on path so common.expressions can be imported
+ROOT_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), '..'))
+TOYS_DIR = os.path.join(ROOT_DIR, 'toys')
+if TOYS_DIR not in sys.path:
+    sys.path.insert(0, TOYS_DIR)
+
+from common.expressions import (
+    MAX_DERIVATIVE_ORDER, compile_derivatives, compile_expression,
+    differentiate, evaluate_expression, normalize_expression
+)
+
+
+def test_compile_collects_params():
+    expr = compile_expression('a*sin(b*x) + x**2')
+    assert expr['params'] == ('a', 'b')
+    x = np.linspace(-2, 2, 9)
+    y = expr['evaluate'](x, {'a': 2, 'b': 3})
+    np.testing.assert_allclose(y, 2 * np.sin(3 * x) + x**2)
+
+
+def test_school_notation():
+    x = np.array([1.0, 2.0, 3.0])
+    y = evaluate_expression('2·x^2 − pi', x)
+    np.testing.assert_allclose(y, 2 * x**2 - math.pi)
+
+
+def test_constant_expression_broadcasts():
+    y = evaluate_expression('e', np.zeros(4))
+    np.testing.assert_allclose(y, [math.e] * 4)
+
+
+def test_domain_masking():
+    x = np.array([-1.0, 0.0, 1.0, 4.0])
+    y = evaluate_expression('ln(x)', x)
+    assert np.isnan(y[0]) and np.isnan(y[1])
+    np.testing.assert_allclose(y[2:], [0.0, math.log(4)])
+
+    y = evaluate_expression('sqrt(x) + 1/x', x)
+    assert np.isnan(y[0]) and np.isnan(y[1])
+    np.testing.assert_allclose(y[3], 2.25)
+
+    y = evaluate_expression('x^0.5', np.array([-4.0, 4.0]))
+    assert np.isnan(y[0])
+    assert y[1] == pytest.approx(2.0)
+
+
+def test_compile_cache_uses_normalized_source():
+    a = compile_expression('a*x+1')
+    b = compile_expression('  a * x  +  1 ')
+    assert a is b
+    assert a['source'] == normalize_expression('a*x + 1')[0]
+
+
+def test_missing_param():
+    with pytest.raises(ValueError):
+        evaluate_expression('a*x', np.zeros(3))
+
+
+@pytest.mark.parametrize('source', [
+    '__import__("os").system("ls")',
+    'x.real',
+    'x[0]',
+    'lambda: 1',
+    'x if x else 1',
+    'exp(x, 2)',
+    'gamma(x)',
+    'sin',
+    'x < 1',
+    '"abc"',
+    'True',
+    '2x',
+    '',
+    'x+' * 200 + 'x',
+])
+def test_rejects_unsafe_or_invalid(source):
+    with pytest.raises(ValueError):
+        compile_expression(source)
+
+
+def test_huge_integer_power_does_not_hang():
+    y = evaluate_expression('9**9**9 + x', np.zeros(2))
+    assert np.all(np.isnan(y))
+
+
+def test_differentiate_simplifies():
+    assert differentiate('a*x + b') == 'a'
+    assert differentiate('x^3', 2) == '6.0 * x'
+    assert differentiate('sin(x)', 2) == '-sin(x)'
+    assert differentiate('5') == '0.0'
+
+
+@pytest.mark.parametrize('source,expected', [
+    ('x*exp(x)', lambda x: (x + 1) * np.exp(x)),
+    ('x^x', lambda x: x**x * (np.log(x) + 1)),
+    ('1/(1 + x^2)', lambda x: -2 * x / (1 + x**2)**2),
+    ('atan(x) + asin(x/3)', lambda x: 1 / (1 + x**2) + 1 / np.sqrt(9 - x**2)),
+    ('log10(x) * cosh(x)',
+     lambda x: np.cosh(x) / (x * math.log(10)) + np.log10(x) * np.sinh(x)),
+    ('2^x', lambda x: 2**x * math.log(2)),
+])
+def test_first_derivative_matches_analytic(source, expected):
+    x = np.linspace(0.2, 2.5, 50)
+    y, dy = compile_derivatives(source, 1)['evaluate'](x)
+    np.testing.assert_allclose(dy, expected(x), rtol=1e-10)
+
+
+def test_higher_order_derivatives():
+    x = np.linspace(-2, 2, 21)
+    values = compile_derivatives('a*sin(b*x + c)', 4)['evaluate'](
+        x, {'a': 2, 'b': 3, 'c': 0.5}
+    )
+    u = 3 * x + 0.5
+    np.testing.assert_allclose(values[1], 6 * np.cos(u), atol=1e-10)
+    np.testing.assert_allclose(values[2], -18 * np.sin(u), atol=1e-10)
+    np.testing.assert_allclose(values[4], 162 * np.sin(u), atol=1e-8)
+
+
+def test_derivative_shares_subexpressions():
+    compiled = compile_derivatives('a*sin(b*x + c)', 2)
+    # b*x + c i sin(b*x + c) liczone raz dla f, f' i f''
+    assert compiled['nodes'] < compiled['tree_nodes'] / 2
+
+
+def test_derivative_masked_outside_function_domain():
+    x = np.array([-1.0, 0.0, 1.0])
+    y, dy = compile_derivatives('sqrt(x)', 1)['evaluate'](x)
+    assert np.isnan(dy[0]) and np.isnan(dy[1])
+    assert dy[2] == pytest.approx(0.5)
+    # |x| nie ma pochodnej w zerze
+    y, dy = compile_derivatives('abs(x)', 1)['evaluate'](x)
+    np.testing.assert_array_equal(np.isnan(dy), [False, True, False])
+
+
+def test_zero_parameter_annihilates_derivative_term():
+    """(x^n)' for n = 0 is 0 everywhere, also at x = 0."""
+    x = np.array([-1.0, 0.0, 1.0])
+    y, dy = compile_derivatives('a*x^n', 1)['evaluate'](x, {'a': 1, 'n': 0})
+    np.testing.assert_array_equal(dy, [0.0, 0.0, 0.0])
+
+
+def test_invalid_derivative_order():
+    with pytest.raises(ValueError):
+        compile_derivatives('x', 7)
+
+
+def test_derivative_node_budget():
+    source = 'sin(x)*cos(x)*exp(x)*ln(x)*sqrt(x)*tan(x)*atan(x)*sinh(x)*cosh(x)'
+    compile_derivatives(source, 1)
+    with pytest.raises(ValueError, match='zbyt złożona'):
+        compile_derivatives(source, MAX_DERIVATIVE_ORDER)
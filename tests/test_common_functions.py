@@ -4,15 +4,20 @@ import os
 import numpy as np
 import math
 
+import pytest
+
 # Ensure toys/ is on path so common.functions can be imported
 ROOT_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), '..'))
 TOYS_DIR = os.path.join(ROOT_DIR, 'toys')
 if TOYS_DIR not in sys.path:
     sys.path.insert(0, TOYS_DIR)
 
+import common.functions as functions_module
+from common.expressions import compile_derivatives
 from common.functions import (
-    FUNCTION_REGISTRY, evaluate_function, evaluate_derivative,
-    get_all_functions, resolve_params
+    FUNCTION_REGISTRY, NUMBA_KERNELS, available_backends,
+    compile_custom_function, evaluate_function, evaluate_derivative,
+    get_all_functions, get_backend, resolve_params, set_backend
 )
 
 
@@ -182,3 +187,139 @@ def test_power_fractional_exponent_domain():
     assert abs(y[1]) < 1e-10
     assert abs(y[2] - 1.0) < 1e-10
     assert abs(y[3] - 2.0) < 1e-10
+
+
+def test_custom_function_matches_registry():
+    """A registry 'expression' compiled as a custom formula gives the same f and f'."""
+    x = np.linspace(-3, 3, 61)
+    for func_id, info in FUNCTION_REGISTRY.items():
+        params = resolve_params(func_id, {})
+        custom = compile_custom_function(info['expression'], params)
+        y, dy = custom['evaluate'](x)
+        y_ref = evaluate_function(func_id, x, params)
+        dy_ref = evaluate_derivative(func_id, x, params)
+        both = np.isfinite(y) & np.isfinite(y_ref)
+        np.testing.assert_allclose(y[both], y_ref[both], rtol=1e-12, atol=1e-12)
+        both = np.isfinite(dy) & np.isfinite(dy_ref)
+        np.testing.assert_allclose(dy[both], dy_ref[both], rtol=1e-9, atol=1e-9)
+
+
+def test_custom_function_formulas_and_default_params():
+    custom = compile_custom_function('a*x^2 + sin(x)', {})
+    assert custom['params'] == {'a': 1.0}
+    assert custom['formula'] == 'f(x) = a * x^2 + sin(x)'
+    assert custom['derivative_formula'].startswith("f'(x) = ")
+
+
+@pytest.mark.parametrize('params', [
+    {'a': 'abc'}, {'a': None}, {'a': float('inf')}, {'a': 11},
+])
+def test_custom_function_rejects_bad_params(params):
+    with pytest.raises(ValueError):
+        compile_custom_function('a*x', params)
+
+
+@pytest.mark.parametrize('func_id', list(FUNCTION_REGISTRY))
+def test_derivative_matches_symbolic_expression(func_id):
+    """Hand-written derivatives agree with the symbolic derivative of 'expression'."""
+    rng = np.random.default_rng(3)
+    x = np.linspace(-3, 3, 61)
+    compiled = compile_derivatives(FUNCTION_REGISTRY[func_id]['expression'], 1)
+    for _ in range(20):
+        params = {
+            p['id']: float(rng.uniform(0.5, 3) * rng.choice([-1, 1]))
+            for p in FUNCTION_REGISTRY[func_id]['params']
+        }
+        dy = evaluate_derivative(func_id, x, params)
+        _, expected = compiled['evaluate'](x, params)
+        both = np.isfinite(dy) & np.isfinite(expected)
+        np.testing.assert_allclose(dy[both], expected[both], rtol=1e-9, atol=1e-9)
+
+
+def test_power_derivative_zero_exponent():
+    x = np.array([-1, 0, 1], dtype=float)
+    dy = evaluate_derivative('power', x, {'a': 3, 'n': 0})
+    np.testing.assert_allclose(dy, [0, 0, 0])
+
+
+def test_backend_fallback_without_package(monkeypatch):
+    monkeypatch.setitem(functions_module._backend_modules, 'numba', None)
+    monkeypatch.setitem(functions_module._backend_modules, 'numexpr', None)
+    assert available_backends() == ('numpy',)
+    previous = get_backend()
+    try:
+        assert set_backend('numba') == 'numpy'
+        assert get_backend() == 'numpy'
+    finally:
+        set_backend(previous)
+    x = np.linspace(-2, 2, 11)
+    y = evaluate_function('cubic', x, {'a': 1, 'b': 0, 'c': 0, 'd': 0}, backend='numexpr')
+    np.testing.assert_allclose(y, x**3)
+
+
+def test_backend_packages_imported_lazily(monkeypatch):
+    imported = []
+
+    def fake_import(name):
+        imported.append(name)
+        raise ImportError(name)
+
+    monkeypatch.delitem(functions_module._backend_modules, 'numexpr', raising=False)
+    monkeypatch.setattr(functions_module.importlib, 'import_module', fake_import)
+    previous = get_backend()
+    try:
+        set_backend('numpy')
+        evaluate_function('sin', np.zeros(3), {'a': 1, 'b': 1, 'c': 0})
+        assert imported == []
+        assert set_backend('numexpr') == 'numpy'
+        assert imported == ['numexpr']
+    finally:
+        set_backend(previous)
+        functions_module._backend_modules.pop('numexpr', None)
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        set_backend('fortran')
+    with pytest.raises(ValueError):
+        evaluate_function('linear', np.zeros(3), {'a': 1, 'b': 0}, backend='gpu')
+
+
+def test_unknown_env_backend_falls_back_to_numpy(monkeypatch):
+    """A bad MATH_TOYS_BACKEND warns instead of breaking every toy at import."""
+    monkeypatch.setenv('MATH_TOYS_BACKEND', 'bogus')
+    previous = get_backend()
+    try:
+        with pytest.warns(RuntimeWarning, match='bogus'):
+            assert functions_module._set_backend_from_env() == 'numpy'
+        assert get_backend() == 'numpy'
+    finally:
+        set_backend(previous)
+
+
+@pytest.mark.parametrize('func_id', sorted(NUMBA_KERNELS))
+def test_numba_kernels_match_numpy(func_id):
+    """The loop kernels (run here as plain Python) agree with numpy."""
+    kernel, param_order = NUMBA_KERNELS[func_id]
+    x = np.concatenate([np.linspace(-5, 5, 101), [0.0]])
+    for n in (2, -1, 0.5):
+        params = resolve_params(func_id, {'n': n} if func_id == 'power' else {})
+        out = np.empty_like(x)
+        with np.errstate(all='ignore'):
+            kernel(x, out, *(float(params[p]) for p in param_order))
+        expected = evaluate_function(func_id, x, params, backend='numpy')
+        np.testing.assert_allclose(out, expected, rtol=1e-12, equal_nan=True)
+
+
+@pytest.mark.parametrize('backend', ['numexpr', 'numba'])
+def test_accelerated_backends_match_numpy(backend):
+    if backend not in available_backends():
+        pytest.skip(f'{backend} nie jest zainstalowany')
+    x = np.linspace(-5, 5, 1001)
+    for func_id in FUNCTION_REGISTRY:
+        params = resolve_params(func_id, {})
+        y = evaluate_function(func_id, x, params, backend=backend)
+        expected = evaluate_function(func_id, x, params, backend='numpy')
+        expected = np.where(np.isfinite(expected), expected, np.nan)
+        y = np.where(np.isfinite(y), y, np.nan)
+        np.testing.assert_allclose(y, expected, rtol=1e-10, equal_nan=True)
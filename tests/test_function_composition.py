@@ -1,5 +1,6 @@
 """Tests for the function_composition Flask backend."""
 import math
+import pytest
 
 
 # --- Basic endpoint tests ---
@@ -304,3 +305,390 @@ def test_compute_y_range_present(function_composition_client):
     assert 'y_range' in data
     assert len(data['y_range']) == 2
     assert data['y_range'][0] < data['y_range'][1]
+
+
+# --- Chain form ---
+
+def test_chain_three_functions(function_composition_client):
+    """chain [t+1, t^2, 2t], x0=2: 3 -> 9 -> 18."""
+    resp = function_composition_client.post('/api/compute', json={
+        'chain': [
+            {'id': 'shift', 'param': 1},
+            {'id': 'power', 'param': 2},
+            {'id': 'scale', 'param': 2},
+        ],
+        'x0': 2.0,
+    })
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert data['success'] is True
+    assert data['chain_x0'] == [3.0, 9.0, 18.0]
+    assert len(data['chain_curves']) == 3
+    assert all(len(c['y']) == 500 for c in data['chain_curves'])
+    assert len(data['x']) == 500
+    # Pipeline: x0 plus one step per function
+    assert len(data['pipeline']) == 4
+    assert abs(data['pipeline'][3]['value'] - 18.0) < 1e-6
+    assert data['pipeline'][3]['label'] == 'f₃(f₂(f₁(x₀)))'
+
+
+def test_chain_matches_two_function_form(function_composition_client):
+    """chain [g, f] gives the same f(g(x)) curve as the f/g form."""
+    fg = function_composition_client.post('/api/compute', json={
+        'f_id': 'sin', 'f_param': 2,
+        'g_id': 'shift', 'g_param': 1,
+        'x0': 0.5,
+    }).get_json()
+    chain = function_composition_client.post('/api/compute', json={
+        'chain': [{'id': 'shift', 'param': 1}, {'id': 'sin', 'param': 2}],
+        'x0': 0.5,
+    }).get_json()
+    assert chain['chain_curves'][1]['y'] == fg['fg_curve']['y']
+    assert chain['chain_labels'][1] == fg['fg_label']
+    assert [step['value'] for step in chain['pipeline']] == \
+        [step['value'] for step in fg['pipeline_fg']]
+
+
+def test_chain_undefined_propagates(function_composition_client):
+    """ln of a negative value is undefined for every later stage too."""
+    resp = function_composition_client.post('/api/compute', json={
+        'chain': [{'id': 'shift', 'param': -5}, {'id': 'ln'}, {'id': 'abs'}],
+        'x0': 1.0,
+    })
+    data = resp.get_json()
+    assert data['success'] is True
+    assert data['chain_x0'] == [-4.0, None, None]
+    assert data['pipeline'][3]['detail'] == 'niezdefiniowane'
+
+
+def test_chain_too_long(function_composition_client):
+    resp = function_composition_client.post('/api/compute', json={
+        'chain': [{'id': 'abs'}] * 9,
+        'x0': 1.0,
+    })
+    assert resp.status_code == 400
+    assert resp.get_json()['success'] is False
+
+
+def test_chain_unknown_function(function_composition_client):
+    resp = function_composition_client.post('/api/compute', json={
+        'chain': [{'id': 'abs'}, {'id': 'nonexistent'}],
+        'x0': 1.0,
+    })
+    assert resp.status_code == 400
+    assert resp.get_json()['success'] is False
+
+
+# --- Evaluation plan ---
+
+def test_evaluation_plan_shares_nodes(function_composition_module, monkeypatch):
+    """Identical (func, param, input) nodes are evaluated only once."""
+    import numpy as np
+    calls = []
+    original = function_composition_module._evaluate_func
+
+    def counting(func_id, param, t_arr):
+        calls.append((func_id, param))
+        return original(func_id, param, t_arr)
+
+    monkeypatch.setattr(function_composition_module, '_evaluate_func', counting)
+    plan = {
+        'g': ('sin', 1, 'x'),
+        'f': ('sin', 1, 'x'),
+        'fg': ('sin', 1, 'g'),
+        'gf': ('sin', 1, 'f'),
+    }
+    values = function_composition_module._evaluate_plan(plan, np.array([0.5, 1.0]))
+    assert len(calls) == 2
+    assert values['fg'] is values['gf']
+
+
+def test_compute_evaluates_each_curve_once(function_composition_client,
+                                           function_composition_module, monkeypatch):
+    """A request evaluates g, f, f(g), g(f) once each, x0 included."""
+    calls = []
+    original = function_composition_module._evaluate_func
+
+    def counting(func_id, param, t_arr):
+        calls.append(len(t_arr))
+        return original(func_id, param, t_arr)
+
+    monkeypatch.setattr(function_composition_module, '_evaluate_func', counting)
+    resp = function_composition_client.post('/api/compute', json={
+        'f_id': 'power', 'f_param': 2,
+        'g_id': 'shift', 'g_param': 3,
+        'x0': 2.0,
+    })
+    data = resp.get_json()
+    assert abs(data['f_g_x0'] - 25.0) < 1e-6
+    assert calls == [501] * 4
+
+
+# --- Chain rule ---
+
+def test_derivatives_match_finite_differences(function_composition_module):
+    """Analytic derivatives agree with central differences."""
+    import numpy as np
+    mod = function_composition_module
+    t = np.array([-1.3, -0.4, 0.6, 1.7])
+    h = 1e-6
+    for func_id, info in mod.FUNCTIONS.items():
+        params = info.get('param_values') or [info['param_default']]
+        for param in params:
+            y = mod._evaluate_func(func_id, param, t)
+            d = mod._evaluate_derivative(func_id, param, t, y)
+            numeric = (mod._evaluate_func(func_id, param, t + h)
+                       - mod._evaluate_func(func_id, param, t - h)) / (2 * h)
+            defined = np.isfinite(numeric)
+            np.testing.assert_allclose(d[defined], numeric[defined], rtol=1e-5)
+
+
+def test_chain_rule_square_shift(function_composition_client):
+    """f=t^2, g=t+3, x0=2: (f∘g)'(2) = 2·5·1 = 10, (g∘f)'(2) = 1·4 = 4."""
+    resp = function_composition_client.post('/api/compute', json={
+        'f_id': 'power', 'f_param': 2,
+        'g_id': 'shift', 'g_param': 3,
+        'x0': 2.0,
+    })
+    data = resp.get_json()
+    assert data['success'] is True
+    assert abs(data['chain_rule_fg']['outer'] - 10.0) < 1e-6
+    assert abs(data['chain_rule_fg']['inner'] - 1.0) < 1e-6
+    assert abs(data['chain_rule_fg']['value'] - 10.0) < 1e-6
+    assert abs(data['chain_rule_gf']['value'] - 4.0) < 1e-6
+    assert len(data['fg_derivative_curve']['y']) == 500
+    assert len(data['gf_derivative_curve']['y']) == 500
+
+
+def test_chain_rule_sin_scale(function_composition_client):
+    """f=sin(t), g=3t: (f∘g)'(x) = 3cos(3x)."""
+    x0 = 0.4
+    resp = function_composition_client.post('/api/compute', json={
+        'f_id': 'sin', 'f_param': 1,
+        'g_id': 'scale', 'g_param': 3,
+        'x0': x0,
+    })
+    data = resp.get_json()
+    assert abs(data['chain_rule_fg']['value'] - 3 * math.cos(3 * x0)) < 1e-6
+
+
+# --- Interval domain analysis ---
+
+def test_domain_sqrt_of_shift(function_composition_client):
+    """f=sqrt(t), g=t+3: f(g(x)) defined on [-3, 5], values [0, sqrt(8)]."""
+    resp = function_composition_client.post('/api/compute', json={
+        'f_id': 'power', 'f_param': 0.5,
+        'g_id': 'shift', 'g_param': 3,
+        'x0': 1.0,
+    })
+    data = resp.get_json()
+    assert data['success'] is True
+    assert data['fg_domain'] == '[-3, 5]'
+    assert data['fg_values'] == '[0, 2.828]'
+
+
+def test_domain_ln_of_sin(function_composition_client):
+    """ln(sin(x)) on [-5, 5] is defined on [-5, -pi) and (0, pi)."""
+    resp = function_composition_client.post('/api/compute', json={
+        'f_id': 'ln',
+        'g_id': 'sin', 'g_param': 1,
+        'x0': 1.0,
+    })
+    data = resp.get_json()
+    assert data['fg_domain'] == '[-5, -3.142) ∪ (0, 3.142)'
+    assert data['fg_values'] == '(-∞, 0]'
+
+
+@pytest.mark.parametrize('f_id,f_param,g_id,g_param,expected', [
+    ('scale', 0, 'ln', 1, '{0}'),
+    ('exp', 0, 'ln', 1, '{1}'),
+    ('scale', 0, 'power', -1, '{0}'),
+])
+def test_constant_outer_function_image_is_point(function_composition_client,
+                                                f_id, f_param, g_id, g_param, expected):
+    """A constant f on an open/unbounded range of g still attains its value."""
+    resp = function_composition_client.post('/api/compute', json={
+        'f_id': f_id, 'f_param': f_param,
+        'g_id': g_id, 'g_param': g_param,
+        'x0': 1.0,
+    })
+    data = resp.get_json()
+    assert data['success'] is True
+    assert data['fg_values'] == expected
+
+
+def test_domain_drives_sampling(function_composition_client):
+    """f=ln, g=ln: no curve is defined for x <= 0, so no points are sampled there."""
+    resp = function_composition_client.post('/api/compute', json={
+        'f_id': 'ln',
+        'g_id': 'ln',
+        'x0': 2.0,
+    })
+    data = resp.get_json()
+    assert data['fg_domain'] == '(1, 5]'
+    xs = data['fg_curve']['x']
+    assert min(xs) > 0
+    assert max(xs) == 5.0
+    assert abs(data['f_g_x0'] - math.log(math.log(2.0))) < 1e-6
+
+
+def test_preimage_finds_narrow_intervals(function_composition_module):
+    """Every interval of sin(5x) > 0.999 is found, however narrow."""
+    mod = function_composition_module
+    x_set = [(-5.0, 5.0, True, True)]
+    target = [(0.999, math.inf, False, False)]
+    pre = mod._preimage('sin', 5, target, x_set)
+    assert len(pre) == 8
+    for lo, hi, _, _ in pre:
+        assert hi - lo < 0.02
+        assert math.sin(5 * (lo + hi) / 2) > 0.999
+
+
+def test_interval_set_operations(function_composition_module):
+    mod = function_composition_module
+    merged = mod._normalize_intervals([(0, 1, True, False), (1, 2, True, True), (3, 3, False, True)])
+    assert merged == [(0, 2, True, True)]
+    inter = mod._intersect_intervals([(0, 2, True, True)], [(1, 5, False, True)])
+    assert inter == [(1, 2, False, True)]
+    assert mod._format_interval_set([]) == '∅'
+
+
+# --- Parameter heatmap ---
+
+def test_param_heatmap_scale_shift(function_composition_client):
+    """f=a·t, g=t+b, x0=1: value = a·(1+b) on the whole grid."""
+    resp = function_composition_client.post('/api/param_heatmap', json={
+        'f_id': 'scale', 'g_id': 'shift', 'x0': 1.0,
+    })
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert data['success'] is True
+    # scale: -3..3 step 0.5, shift: -5..5 step 0.5
+    assert len(data['f_params']) == 13
+    assert len(data['g_params']) == 21
+    assert len(data['values']) == 13
+    for a, row in zip(data['f_params'], data['values']):
+        for b, v in zip(data['g_params'], row):
+            assert abs(v - a * (1 + b)) < 1e-6
+
+
+def test_param_heatmap_matches_compute(function_composition_client):
+    """Every heatmap cell equals f_g_x0 from /api/compute."""
+    heat = function_composition_client.post('/api/param_heatmap', json={
+        'f_id': 'power', 'g_id': 'sin', 'x0': 0.7, 'g_steps': 5,
+    }).get_json()
+    assert heat['f_params'] == [-2, -1, 0.5, 1, 2, 3]
+    for i, fp in enumerate(heat['f_params']):
+        for j, gp in enumerate(heat['g_params']):
+            single = function_composition_client.post('/api/compute', json={
+                'f_id': 'power', 'f_param': fp,
+                'g_id': 'sin', 'g_param': gp,
+                'x0': 0.7,
+            }).get_json()
+            assert heat['values'][i][j] == single['f_g_x0']
+
+
+def test_param_heatmap_no_param_function(function_composition_client):
+    """Functions without a parameter give a single row/column."""
+    data = function_composition_client.post('/api/param_heatmap', json={
+        'f_id': 'ln', 'g_id': 'shift', 'x0': 0.0,
+    }).get_json()
+    assert data['f_params'] == [None]
+    assert len(data['values']) == 1
+    # ln(0 + b) undefined for b <= 0
+    assert data['values'][0][0] is None
+    assert data['values'][0][-1] is not None
+
+
+def test_param_heatmap_invalid_steps(function_composition_client):
+    resp = function_composition_client.post('/api/param_heatmap', json={
+        'f_id': 'scale', 'g_id': 'shift', 'x0': 1.0, 'f_steps': 1000,
+    })
+    assert resp.status_code == 400
+    assert resp.get_json()['success'] is False
+
+
+def test_iterate_contraction_converges(function_composition_client):
+    """x -> 0.5*(x + 1) has the single fixed point x = 1."""
+    data = function_composition_client.post('/api/iterate', json={
+        'f_id': 'scale', 'f_param': 0.5, 'g_id': 'shift', 'g_param': 1,
+        'seed_range': {'min': -5, 'max': 5, 'count': 101},
+    }).get_json()
+    assert data['success'] is True
+    assert data['seeds_count'] == 101
+    assert data['summary']['converged'] == 101
+    assert data['attractors'] == [pytest.approx(1.0, abs=1e-6)]
+    assert set(data['basins']) == {0}
+    orbit = data['orbits'][0]
+    assert orbit['values'][0] == orbit['seed']
+    assert orbit['values'][1] == pytest.approx(0.5 * (orbit['seed'] + 1))
+
+
+def test_iterate_classifies_basins(function_composition_client):
+    """x -> 2x: only 0 is fixed, the rest diverges."""
+    data = function_composition_client.post('/api/iterate', json={
+        'f_id': 'scale', 'f_param': 2, 'g_id': 'shift', 'g_param': 0,
+        'seeds': [-1.0, 0.0, 1.0],
+    }).get_json()
+    assert data['basins'] == [-1, 0, -1]
+    assert data['attractors'] == [0.0]
+    assert data['summary']['diverged'] == 2
+
+
+def test_iterate_undefined_and_undecided(function_composition_client):
+    # ln(x) leaves the domain after a few steps
+    data = function_composition_client.post('/api/iterate', json={
+        'f_id': 'ln', 'g_id': 'shift', 'g_param': 0,
+        'seeds': [0.5, 5.0],
+    }).get_json()
+    assert data['basins'] == [-2, -2]
+    # x -> -x oscillates without converging
+    data = function_composition_client.post('/api/iterate', json={
+        'f_id': 'scale', 'f_param': -1, 'g_id': 'shift', 'g_param': 0,
+        'seeds': [1.0], 'max_iter': 10,
+    }).get_json()
+    assert data['basins'] == [-3]
+    assert data['iterations'] == [10]
+
+
+def test_iterate_many_seeds(function_composition_client):
+    data = function_composition_client.post('/api/iterate', json={
+        'f_id': 'cos', 'f_param': 1, 'g_id': 'scale', 'g_param': 1,
+        'seed_range': {'min': -5, 'max': 5, 'count': 100000},
+        'max_iter': 200,
+    }).get_json()
+    assert data['summary']['converged'] == 100000
+    assert data['attractors'] == [pytest.approx(0.7390851332, abs=1e-6)]
+    assert len(data['orbits']) == 5
+
+
+def test_iterate_invalid_input(function_composition_client):
+    resp = function_composition_client.post('/api/iterate', json={
+        'f_id': 'cos', 'g_id': 'scale',
+        'seed_range': {'min': 0, 'max': 1, 'count': 100001},
+    })
+    assert resp.status_code == 400
+    resp = function_composition_client.post('/api/iterate', json={
+        'f_id': 'cos', 'g_id': 'scale', 'seeds': [1.0], 'tol': -1,
+    })
+    assert resp.status_code == 400
+
+
+def test_composition_label_substitutes_variable(function_composition_module):
+    """The inner label is built in x directly, not by replacing the letter t."""
+    mod = function_composition_module
+    assert mod._make_composition_label('shift', 1, 'exp', 1) == '(eˣ) + 1'
+    assert mod._make_composition_label('ln', None, 'scale', 2) == 'ln(2·x)'
+    # Nazwa zawierająca 't' nie jest psuta
+    assert mod._make_composition_label('abs', None, 'sqrt', None) == '|sqrt|'
+    assert mod._make_label('power', 2, 'x') == 'x²'
+
+
+def test_labels_memoized(function_composition_module):
+    mod = function_composition_module
+    mod._make_label.cache_clear()
+    mod._make_label('sin', 2.0)
+    mod._make_label('sin', 2.0)
+    info = mod._make_label.cache_info()
+    assert info.hits == 1 and info.misses == 1
+    assert mod._format_detail('power', 0.5, 4, 2) == '√4 = 2'
@@ -1,6 +1,8 @@
 """Tests for the function_derivatives Flask backend."""
 import math
 
+import pytest
+
 
 def test_index_returns_200(function_derivatives_client):
     resp = function_derivatives_client.get('/')
@@ -186,3 +188,53 @@ def test_compute_y_ranges_returned(function_derivatives_client):
     assert 'y_range_combined' in data
     assert len(data['y_range_func']) == 2
     assert data['y_range_func'][0] < data['y_range_func'][1]
+
+
+def test_compute_custom_expression(function_derivatives_client):
+    """f(x) = a*sin(b*x) + x^2 through the expression compiler."""
+    resp = function_derivatives_client.post('/api/compute', json={
+        'expression': 'a*sin(b*x) + x^2',
+        'params': {'a': 2, 'b': 3},
+        'view_mode': 'separate',
+        'x_min': -2,
+        'x_max': 2,
+    })
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert data['success'] is True
+    assert data['params'] == {'a': 2.0, 'b': 3.0}
+    assert data['func_formula'] == 'f(x) = a * sin(b * x) + x^2'
+    for x, y, dy in zip(data['func_data']['x'], data['func_data']['y'],
+                        data['derivative_data']['y']):
+        assert y == pytest.approx(2 * math.sin(3 * x) + x ** 2, abs=1e-7)
+        assert dy == pytest.approx(6 * math.cos(3 * x) + 2 * x, abs=1e-7)
+
+
+def test_compute_custom_expression_default_params(function_derivatives_client):
+    resp = function_derivatives_client.post('/api/compute', json={
+        'expression': 'a*x',
+        'view_mode': 'combined',
+    })
+    data = resp.get_json()
+    assert resp.status_code == 200
+    assert data['params'] == {'a': 1.0}
+    assert data['func_data']['x'][0] == -10
+
+
+@pytest.mark.parametrize('expression', [
+    '__import__("os")',
+    'os.system("ls")',
+    'x.__class__',
+    'open("app.py")',
+    '+'.join(['x'] * 60),
+    'x +',
+])
+def test_compute_rejects_bad_expression(function_derivatives_client, expression):
+    resp = function_derivatives_client.post('/api/compute', json={
+        'expression': expression,
+        'view_mode': 'separate',
+    })
+    assert resp.status_code == 400
+    data = resp.get_json()
+    assert data['success'] is False
+    assert data['error']
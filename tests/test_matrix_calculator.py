@@ -1,4 +1,17 @@
 """Tests for the matrix_calculator Flask backend."""
+import base64
+import io
+import json
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _fresh_result_cache(matrix_calculator_module):
+    """Call-counting tests must not hit a result cached by another test."""
+    matrix_calculator_module._clear_result_cache()
 
 
 def test_index_returns_200(matrix_calculator_client):
@@ -89,7 +102,7 @@ def test_compute_missing_matrix_field(matrix_calculator_client):
 
 
 def test_compute_matrix_too_large(matrix_calculator_client):
-    big = [[1] * 7 for _ in range(7)]
+    big = [[1] for _ in range(2001)]
     resp = matrix_calculator_client.post('/api/compute', json={
         'matrix': big,
     })
@@ -113,3 +126,1136 @@ def test_presets_endpoint(matrix_calculator_client):
     assert 'presets' in data
     assert 'identity_3' in data['presets']
     assert 'singular' in data['presets']
+
+
+# --- Single-factorization pipeline ---
+
+def _count_calls(monkeypatch, names):
+    calls = {name: 0 for name in names}
+    for name in names:
+        original = getattr(np.linalg, name)
+
+        def wrapper(*args, _name=name, _original=original, **kwargs):
+            calls[_name] += 1
+            return _original(*args, **kwargs)
+        monkeypatch.setattr(np.linalg, name, wrapper)
+    return calls
+
+
+def test_compute_factors_once(matrix_calculator_client, monkeypatch):
+    """rank/det/inverse come from the Gauss elimination, not separate LAPACK calls."""
+    calls = _count_calls(monkeypatch, ['matrix_rank', 'det', 'inv', 'svd'])
+    data = matrix_calculator_client.post('/api/compute', json={
+        'matrix': [[0, 2, 1], [1, 1, 0], [3, 0, 1]],
+    }).get_json()
+    assert calls == {'matrix_rank': 0, 'det': 0, 'inv': 0, 'svd': 0}
+    A = np.array([[0, 2, 1], [1, 1, 0], [3, 0, 1]], dtype=float)
+    assert data['det'] == pytest.approx(np.linalg.det(A))
+    np.testing.assert_allclose(data['inverse'], np.linalg.inv(A), atol=1e-8)
+
+
+def test_compute_det_sign_from_swaps(matrix_calculator_client):
+    data = matrix_calculator_client.post('/api/compute', json={
+        'matrix': [[0, 1], [1, 0]],
+    }).get_json()
+    assert data['det'] == -1.0
+    assert data['inverse'] == [[0.0, 1.0], [1.0, 0.0]]
+
+
+def test_compute_tiny_matrix_falls_back_to_svd(matrix_calculator_client, monkeypatch):
+    """Entries below the elimination threshold: rank decided by SVD."""
+    calls = _count_calls(monkeypatch, ['svd'])
+    data = matrix_calculator_client.post('/api/compute', json={
+        'matrix': [[1e-13, 0], [0, 2e-13]],
+    }).get_json()
+    assert calls['svd'] == 1
+    assert data['rank'] == 2
+    np.testing.assert_allclose(data['inverse'], [[1e13, 0], [0, 5e12]], rtol=1e-9, atol=1e-2)
+
+
+# --- Large matrices: steps modes, blocked elimination, upload, streaming ---
+
+def test_compute_steps_modes(matrix_calculator_client):
+    matrix = [[0, 2, 1], [1, 1, 0], [3, 0, 1]]
+    full = matrix_calculator_client.post('/api/compute', json={
+        'matrix': matrix,
+    }).get_json()
+    assert full['steps_mode'] == 'full'
+    summary = matrix_calculator_client.post('/api/compute', json={
+        'matrix': matrix, 'steps': 'summary',
+    }).get_json()
+    assert summary['steps_mode'] == 'summary'
+    assert len(summary['gauss_steps']) == 4
+    assert ([op for step in summary['gauss_steps'] for op in step['ops']]
+            == [op for step in full['gauss_steps'] for op in step['ops']])
+    none = matrix_calculator_client.post('/api/compute', json={
+        'matrix': matrix, 'steps': 'none',
+    }).get_json()
+    assert none['gauss_steps'] == []
+    assert none['rref'] == full['rref']
+    assert none['det'] == pytest.approx(full['det'])
+    np.testing.assert_allclose(none['inverse'], full['inverse'], atol=1e-8)
+
+
+def test_compute_steps_mode_errors(matrix_calculator_client):
+    resp = matrix_calculator_client.post('/api/compute', json={
+        'matrix': [[1]], 'steps': 'all',
+    })
+    assert resp.status_code == 400
+    resp = matrix_calculator_client.post('/api/compute', json={
+        'matrix': [[1] * 11 for _ in range(11)], 'steps': 'full',
+    })
+    assert resp.status_code == 400
+
+
+def test_compute_auto_skips_steps_above_limit(matrix_calculator_client):
+    data = matrix_calculator_client.post('/api/compute', json={
+        'matrix': np.eye(12).tolist(),
+    }).get_json()
+    assert data['steps_mode'] == 'none'
+    assert data['gauss_steps'] == []
+    assert data['rank'] == 12
+    assert data['det'] == 1.0
+
+
+@pytest.mark.parametrize('shape,rank', [((150, 150), 150), ((130, 90), 40), ((70, 140), 70)])
+def test_blocked_matches_row_by_row(matrix_calculator_module, shape, rank):
+    rng = np.random.default_rng(7)
+    rows, cols = shape
+    A = rng.uniform(-5, 5, (rows, rank)) @ rng.uniform(-5, 5, (rank, cols))
+    augment = np.eye(rows) if rows == cols else None
+    _, rref, info = matrix_calculator_module._gauss_elimination_steps(A, augment, 'summary')
+    rref_blocked, info_blocked = matrix_calculator_module._gauss_jordan_blocked(A, augment)
+    assert len(info_blocked['pivots']) == len(info['pivots']) == rank
+    assert info_blocked['swaps'] % 2 == info['swaps'] % 2
+    np.testing.assert_allclose(rref_blocked, rref, atol=1e-8)
+    if augment is not None:
+        np.testing.assert_allclose(info_blocked['augment'] @ A, np.eye(rows), atol=1e-8)
+
+
+def test_compute_large_matrix_streams(matrix_calculator_client):
+    rng = np.random.default_rng(3)
+    A = rng.uniform(-10, 10, (100, 100))
+    resp = matrix_calculator_client.post('/api/compute', json={'matrix': A.tolist()})
+    assert resp.status_code == 200
+    assert resp.is_streamed
+    data = json.loads(resp.get_data(as_text=True))
+    assert data['success'] is True
+    assert data['rank'] == 100
+    assert data['det'] == pytest.approx(np.linalg.det(A), rel=1e-8)
+    np.testing.assert_allclose(data['inverse'], np.linalg.inv(A), atol=1e-6)
+
+
+def test_compute_stream_flag(matrix_calculator_client):
+    resp = matrix_calculator_client.post('/api/compute', json={
+        'matrix': [[2, 0], [0, 3]], 'stream': True,
+    })
+    assert resp.is_streamed
+    data = json.loads(resp.get_data(as_text=True))
+    assert data['det'] == 6.0
+
+
+def test_compute_stream_sends_fields_as_computed(matrix_calculator_module,
+                                                 matrix_calculator_client, monkeypatch):
+    calls = []
+    original = matrix_calculator_module._gauss_elimination_steps
+
+    def counted(*args, **kwargs):
+        calls.append(1)
+        return original(*args, **kwargs)
+    monkeypatch.setattr(matrix_calculator_module, '_gauss_elimination_steps', counted)
+
+    resp = matrix_calculator_client.post('/api/compute', json={
+        'matrix': [[2, 0], [0, 3]], 'stream': True,
+    })
+    chunks = (chunk.decode() for chunk in resp.response)
+    head = ''
+    while '"transpose"' not in head:
+        head += next(chunks)
+    assert calls == []     # cheap fields go out before the elimination runs
+    text = head + ''.join(chunks)
+    resp.close()
+    assert text.index('"transpose"') < text.index('"rank"') < text.index('"eigenvalues"')
+    assert json.loads(text)['success'] is True
+
+
+def test_compute_stream_error_mid_response(matrix_calculator_module,
+                                          matrix_calculator_client, monkeypatch):
+    def failing(matrix):
+        raise ValueError('eig failed')
+    monkeypatch.setattr(matrix_calculator_module, '_compute_eigenvalues', failing)
+    resp = matrix_calculator_client.post('/api/compute', json={
+        'matrix': [[2, 0], [0, 3]], 'stream': True,
+    })
+    data = json.loads(resp.get_data(as_text=True))
+    assert data['rank'] == 2
+    assert data['success'] is False
+    assert data['error'] == 'eig failed'
+
+
+@pytest.mark.parametrize('size,options', [
+    (300, {}),                  # large enough to stream on its own
+    (60, {'stream': True}),
+])
+def test_compute_stream_rejects_steps_mode_up_front(matrix_calculator_client, size, options):
+    """Steps mode is validated before streaming starts: a clean 400, not a cut 200."""
+    resp = matrix_calculator_client.post('/api/compute', json={
+        'matrix': np.eye(size).tolist(), 'steps': 'summary', **options,
+    })
+    assert resp.status_code == 400
+    data = resp.get_json()
+    assert data['success'] is False
+    assert 'Kroki skrocone' in data['error']
+
+
+def _compute(client, matrix, **options):
+    resp = client.post('/api/compute', json={'matrix': matrix, **options})
+    assert resp.status_code == 200
+    # Large results are streamed, so parse the raw body
+    return json.loads(resp.get_data(as_text=True))
+
+
+def test_compute_determinant_outside_float_range(matrix_calculator_client):
+    data = _compute(matrix_calculator_client, [[1e-200, 0], [0, 1e-200]])
+    assert data['rank'] == 2 and data['inverse'] is not None
+    assert data['det'] is None
+    assert data['det_log'] == {'sign': 1, 'log10_abs': pytest.approx(-400)}
+
+    A = np.random.default_rng(8).integers(-9, 10, (200, 200))
+    data = _compute(matrix_calculator_client, A.tolist(), steps='none')
+    sign, logabs = np.linalg.slogdet(A)
+    assert data['rank'] == 200 and data['det'] is None
+    assert data['det_log']['sign'] == sign
+    assert data['det_log']['log10_abs'] == pytest.approx(logabs / np.log(10), rel=1e-9)
+
+
+def test_compute_small_determinant_not_rounded_to_zero(matrix_calculator_client):
+    data = _compute(matrix_calculator_client, [[1e-5, 0], [0, -1e-5]])
+    assert data['det'] == pytest.approx(-1e-10)
+    assert data['det_log']['sign'] == -1
+
+
+def test_content_limit_fits_max_matrix(matrix_calculator_module):
+    mod = matrix_calculator_module
+    # Worst-case element text: full float precision with exponent
+    row = json.dumps([-1.2345678901234567e-05] * mod.MAX_MATRIX_SIZE)
+    body = len('{"matrix": []}') + mod.MAX_MATRIX_SIZE * (len(row) + 2)
+    assert body < mod.app.config['MAX_CONTENT_LENGTH']
+
+
+@pytest.mark.parametrize('endpoint', ['/api/compute', '/api/solve', '/api/decompose'])
+def test_request_too_large_returns_413(matrix_calculator_module, matrix_calculator_client,
+                                       monkeypatch, endpoint):
+    monkeypatch.setitem(matrix_calculator_module.app.config, 'MAX_CONTENT_LENGTH', 1000)
+    resp = matrix_calculator_client.post(endpoint, json={
+        'matrix': np.ones((30, 30)).tolist(), 'b': [1] * 30,
+    })
+    assert resp.status_code == 413
+    assert resp.get_json()['success'] is False
+
+
+def test_compute_file_upload(matrix_calculator_client):
+    resp = matrix_calculator_client.post('/api/compute', data={
+        'file': (io.BytesIO(b'1, 2\n3, 4\n'), 'matrix.csv'),
+    }, content_type='multipart/form-data')
+    data = resp.get_json()
+    assert data['success'] is True
+    assert data['det'] == pytest.approx(-2.0)
+
+
+def test_compute_file_upload_semicolon_decimal_comma(matrix_calculator_client):
+    resp = matrix_calculator_client.post('/api/compute', data={
+        'file': (io.BytesIO('\ufeff0,5;1\n2;4,5\n'.encode('utf-8')), 'arkusz.csv'),
+        'steps': 'none',
+    }, content_type='multipart/form-data')
+    data = resp.get_json()
+    assert data['steps_mode'] == 'none'
+    assert data['transpose'] == [[0.5, 2.0], [1.0, 4.5]]
+
+
+def test_compute_file_upload_invalid(matrix_calculator_client):
+    for content in (b'1 2\n3\n', b'1 x\n', b'', b'\xff\xfe'):
+        resp = matrix_calculator_client.post('/api/compute', data={
+            'file': (io.BytesIO(content), 'bad.txt'),
+        }, content_type='multipart/form-data')
+        assert resp.status_code == 400
+        assert resp.get_json()['success'] is False
+
+
+# --- Operation log ---
+
+def _replay(initial, steps):
+    m = np.array(initial, dtype=float)
+    snapshots = []
+    for step in steps:
+        for op in step['ops']:
+            if op['op'] == 'swap':
+                m[[op['i'], op['j']]] = m[[op['j'], op['i']]]
+            elif op['op'] == 'scale':
+                m[op['i']] *= op['s']
+            else:
+                m[op['i']] += op['s'] * m[op['j']]
+        snapshots.append(m.copy())
+    return snapshots
+
+
+def test_compute_steps_are_op_log(matrix_calculator_client):
+    matrix = [[0, 2, 1], [1, 1, 0], [3, 0, 1]]
+    data = matrix_calculator_client.post('/api/compute', json={
+        'matrix': matrix,
+    }).get_json()
+    assert data['gauss_initial'] == [[0.0, 2.0, 1.0], [1.0, 1.0, 0.0], [3.0, 0.0, 1.0]]
+    steps = data['gauss_steps']
+    assert all('matrix' not in step for step in steps)
+    assert steps[0]['ops'] == []
+    assert steps[1] == {
+        'description': 'Zamiana w1 <-> w3', 'operation': 'swap',
+        'ops': [{'op': 'swap', 'i': 0, 'j': 2}],
+    }
+    assert all(len(step['ops']) == 1 for step in steps[1:])
+    final = _replay(data['gauss_initial'], steps)[-1]
+    np.testing.assert_allclose(final, data['rref'], atol=1e-12)
+
+
+def test_compute_no_initial_without_steps(matrix_calculator_client):
+    data = matrix_calculator_client.post('/api/compute', json={
+        'matrix': [[1, 2], [3, 4]], 'steps': 'none',
+    }).get_json()
+    assert data['gauss_initial'] is None
+
+
+def test_steps_endpoint_rebuilds_snapshots(matrix_calculator_client):
+    matrix = [[2, 1, -1], [-3, -1, 2], [-2, 1, 2]]
+    data = matrix_calculator_client.post('/api/compute', json={
+        'matrix': matrix,
+    }).get_json()
+    expected = _replay(data['gauss_initial'], data['gauss_steps'])
+    resp = matrix_calculator_client.post('/api/steps?from=2&to=4', json={
+        'matrix': matrix,
+    })
+    assert resp.status_code == 200
+    result = resp.get_json()
+    assert result['total'] == len(data['gauss_steps'])
+    assert [snap['index'] for snap in result['snapshots']] == [2, 3, 4]
+    for snap in result['snapshots']:
+        assert snap['ops'] == data['gauss_steps'][snap['index']]['ops']
+        np.testing.assert_allclose(snap['matrix'], expected[snap['index']], atol=1e-8)
+
+
+def test_steps_endpoint_defaults_and_clamp(matrix_calculator_client):
+    matrix = [[1, 2], [3, 4]]
+    result = matrix_calculator_client.post('/api/steps?to=999', json={
+        'matrix': matrix, 'steps': 'summary',
+    }).get_json()
+    assert result['steps_mode'] == 'summary'
+    assert len(result['snapshots']) == result['total'] == 3
+    assert result['snapshots'][0]['matrix'] == [[1.0, 2.0], [3.0, 4.0]]
+    assert result['snapshots'][-1]['matrix'] == [[1.0, 0.0], [0.0, 1.0]]
+
+
+@pytest.mark.parametrize('query,body', [
+    ('?from=3&to=1', {'matrix': [[1, 2], [3, 4]]}),
+    ('?from=x', {'matrix': [[1, 2], [3, 4]]}),
+    ('', {'matrix': [[1, 2], [3, 4]], 'steps': 'none'}),
+    ('', {}),
+])
+def test_steps_endpoint_invalid(matrix_calculator_client, query, body):
+    resp = matrix_calculator_client.post('/api/steps' + query, json=body)
+    assert resp.status_code == 400
+    assert resp.get_json()['success'] is False
+
+
+@pytest.mark.parametrize('query', ['?from=abc', '?to=1.5'])
+def test_steps_endpoint_bad_index_message(matrix_calculator_client, query):
+    resp = matrix_calculator_client.post('/api/steps' + query, json={'matrix': [[1, 2], [3, 4]]})
+    assert resp.status_code == 400
+    error = resp.get_json()['error']
+    assert 'liczba calkowita' in error
+    assert 'invalid literal' not in error
+
+
+# --- Exact mode (Bareiss) ---
+
+def _exact(client, matrix, **options):
+    return client.post('/api/compute', json={'matrix': matrix, 'mode': 'exact', **options})
+
+
+def test_exact_mode_fractions(matrix_calculator_client):
+    data = _exact(matrix_calculator_client, [[1, 2], [3, '1/3']]).get_json()
+    assert data['success'] is True
+    assert data['mode'] == 'exact'
+    assert data['det'] == '-17/3'
+    assert data['trace'] == '4/3'
+    assert data['inverse'] == [['-1/17', '6/17'], ['9/17', '-3/17']]
+    assert data['rref'] == [['1', '0'], ['0', '1']]
+    assert data['transpose'] == [['1', '3'], ['2', '1/3']]
+
+
+def test_exact_mode_shows_thirds(matrix_calculator_client):
+    data = _exact(matrix_calculator_client, [[3, 1], [0, 3]]).get_json()
+    assert data['inverse'] == [['1/3', '-1/9'], ['0', '1/3']]
+
+
+def test_exact_mode_decimal_inputs(matrix_calculator_client):
+    data = _exact(matrix_calculator_client, [[0.1, 0.2], [0.5, '2.5']]).get_json()
+    assert data['det'] == '3/20'
+    assert data['gauss_steps'][0]['description'] == 'Macierz wejsciowa * 10 (wspolny mianownik)'
+    assert data['gauss_steps'][0]['matrix'] == [['1', '2'], ['5', '25']]
+
+
+def test_exact_mode_rank_deficient_rectangular(matrix_calculator_client):
+    data = _exact(matrix_calculator_client, [[1, 2, 3, 4], [2, 4, 6, 8], [1, 0, 1, 0]]).get_json()
+    assert data['rank'] == 2
+    assert data['det'] is None
+    assert data['inverse'] is None
+    assert data['rref'] == [['1', '0', '1', '0'], ['0', '1', '1', '2'], ['0', '0', '0', '0']]
+
+
+def test_exact_mode_singular(matrix_calculator_client):
+    data = _exact(matrix_calculator_client, [[1, 2], [2, 4]]).get_json()
+    assert data['det'] == '0'
+    assert data['rank'] == 1
+    assert data['inverse'] is None
+
+
+def test_exact_mode_hilbert_10(matrix_calculator_client):
+    n = 10
+    hilbert = [[f'1/{i + j + 1}' for j in range(n)] for i in range(n)]
+    data = _exact(matrix_calculator_client, hilbert).get_json()
+    assert data['rank'] == n
+    # The inverse of a Hilbert matrix has integer entries
+    inverse = [[Fraction(v) for v in row] for row in data['inverse']]
+    assert all(v.denominator == 1 for row in inverse for v in row)
+    assert inverse[0][0] == 100
+    A = [[Fraction(1, i + j + 1) for j in range(n)] for i in range(n)]
+    product = [[sum(A[i][k] * inverse[k][j] for k in range(n)) for j in range(n)] for i in range(n)]
+    assert product == [[int(i == j) for j in range(n)] for i in range(n)]
+    assert Fraction(data['det']) == Fraction(
+        1, 46206893947914691316295628839036278726983680000000000
+    )
+
+
+def test_exact_mode_steps_are_integer(matrix_calculator_client):
+    data = _exact(matrix_calculator_client, [[2, 1, -1], [-3, -1, 2], [-2, 1, 2]]).get_json()
+    assert data['steps_mode'] == 'bareiss'
+    # Documented exception to the op log: exact steps carry snapshots
+    assert data['gauss_initial'] is None
+    for step in data['gauss_steps']:
+        assert 'ops' not in step
+        assert all(int(v) == Fraction(v) for row in step['matrix'] for v in row)
+    # The last snapshot is d * RREF with d = +-det
+    assert data['gauss_steps'][-1]['matrix'] == [['-1', '0', '0'], ['0', '-1', '0'], ['0', '0', '-1']]
+    assert data['det'] == '-1'
+
+
+def test_exact_mode_matches_float(matrix_calculator_client):
+    rng = np.random.default_rng(5)
+    for _ in range(20):
+        n = int(rng.integers(1, 7))
+        matrix = rng.integers(-9, 10, (n, n)).tolist()
+        exact = _exact(matrix_calculator_client, matrix, steps='none').get_json()
+        approx = matrix_calculator_client.post('/api/compute', json={'matrix': matrix}).get_json()
+        assert exact['gauss_steps'] == []
+        assert exact['rank'] == approx['rank']
+        assert float(Fraction(exact['det'])) == pytest.approx(approx['det'], abs=1e-6)
+        if exact['inverse'] is not None:
+            np.testing.assert_allclose(
+                [[float(Fraction(v)) for v in row] for row in exact['inverse']],
+                approx['inverse'], atol=1e-6,
+            )
+
+
+def test_exact_mode_file_upload(matrix_calculator_client):
+    resp = matrix_calculator_client.post('/api/compute', data={
+        'file': (io.BytesIO(b'0.5 1\n1 4\n'), 'matrix.txt'),
+        'mode': 'exact',
+    }, content_type='multipart/form-data')
+    assert resp.get_json()['det'] == '1'
+
+
+@pytest.mark.parametrize('content,det,inverse', [
+    (b'1/3 1\n0 3\n', '1', [['3', '-1'], ['0', '1/3']]),
+    (b'1/2, 1/3\n1/4, 1/5\n', '1/60', [['12', '-20'], ['-15', '30']]),
+    ('0,1;1/3\n0;1\n'.encode('utf-8'), '1/10', [['10', '-10/3'], ['0', '1']]),
+])
+def test_exact_mode_file_upload_fractions(matrix_calculator_client, content, det, inverse):
+    """Exact mode parses file tokens as fractions instead of going through float."""
+    resp = matrix_calculator_client.post('/api/compute', data={
+        'file': (io.BytesIO(content), 'matrix.txt'),
+        'mode': 'exact',
+    }, content_type='multipart/form-data')
+    data = resp.get_json()
+    assert data['success'] is True
+    assert data['det'] == det
+    assert data['inverse'] == inverse
+
+
+@pytest.mark.parametrize('content', [b'1/0 1\n', b'1/3 x\n', b'1 2\n3\n', b'1,,2\n'])
+def test_exact_mode_file_upload_invalid(matrix_calculator_client, content):
+    resp = matrix_calculator_client.post('/api/compute', data={
+        'file': (io.BytesIO(content), 'bad.txt'),
+        'mode': 'exact',
+    }, content_type='multipart/form-data')
+    assert resp.status_code == 400
+    assert resp.get_json()['success'] is False
+
+
+@pytest.mark.parametrize('body', [
+    {'matrix': [[1] * 11 for _ in range(11)], 'mode': 'exact'},
+    {'matrix': [['1/0']], 'mode': 'exact'},
+    {'matrix': [['abc']], 'mode': 'exact'},
+    {'matrix': [[True]], 'mode': 'exact'},
+    {'matrix': [['20001/2']], 'mode': 'exact'},
+    {'matrix': [['1' * 40]], 'mode': 'exact'},
+    {'matrix': [[1]], 'mode': 'symbolic'},
+])
+def test_exact_mode_invalid(matrix_calculator_client, body):
+    resp = matrix_calculator_client.post('/api/compute', json=body)
+    assert resp.status_code == 400
+    assert resp.get_json()['success'] is False
+
+
+# --- Batch compute ---
+
+def test_compute_batch_mixed_shapes(matrix_calculator_client):
+    matrices = [
+        [[2, 0], [0, 3]],
+        [[1, 2, 3], [4, 5, 6]],
+        [[1, 2], [2, 4]],
+        [[0, 1], [1, 0]],
+    ]
+    resp = matrix_calculator_client.post('/api/compute_batch', json={'matrices': matrices})
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert data['success'] is True
+    assert data['count'] == 4
+    assert data['groups'] == [{'rows': 2, 'cols': 2, 'count': 3}, {'rows': 2, 'cols': 3, 'count': 1}]
+    diag, rect, singular, swap = data['results']
+    assert diag['det'] == 6.0 and diag['trace'] == 5.0
+    np.testing.assert_allclose(diag['inverse'], [[0.5, 0], [0, 1 / 3]])
+    assert diag['eigenvalues'] == [3.0, 2.0]
+    assert rect['rank'] == 2 and rect['det'] is None and rect['inverse'] is None
+    assert singular['rank'] == 1 and singular['det'] == 0 and singular['inverse'] is None
+    assert swap['det'] == -1.0 and swap['inverse'] == [[0.0, 1.0], [1.0, 0.0]]
+
+
+def test_compute_batch_matches_single(matrix_calculator_client):
+    rng = np.random.default_rng(11)
+    matrices = [rng.integers(-5, 6, (3, 3)).tolist() for _ in range(50)]
+    matrices += [[[1, 2, 3], [2, 4, 6], [1, 1, 1]]]
+    data = matrix_calculator_client.post('/api/compute_batch', json={'matrices': matrices}).get_json()
+    for matrix, batch in zip(matrices, data['results']):
+        single = matrix_calculator_client.post('/api/compute', json={'matrix': matrix}).get_json()
+        assert batch['rank'] == single['rank']
+        assert batch['det'] == pytest.approx(single['det'], abs=1e-6)
+        assert batch['trace'] == single['trace']
+        assert batch['eigenvalues_complex'] == single['eigenvalues_complex']
+        if single['inverse'] is None:
+            assert batch['inverse'] is None
+        else:
+            np.testing.assert_allclose(batch['inverse'], single['inverse'], atol=1e-6)
+
+
+def test_compute_batch_uses_stacked_linalg(matrix_calculator_client, monkeypatch):
+    calls = _count_calls(monkeypatch, ['slogdet', 'inv', 'eigvals', 'matrix_rank'])
+    matrices = [np.eye(3).tolist() for _ in range(20)]
+    matrix_calculator_client.post('/api/compute_batch', json={'matrices': matrices})
+    assert calls == {'slogdet': 1, 'inv': 1, 'eigvals': 1, 'matrix_rank': 1}
+
+
+def test_compute_batch_determinant_out_of_float_range(matrix_calculator_client):
+    matrices = [[[1e-200, 0], [0, 1e-200]], (1e-3 * np.eye(4)).tolist(), [[1, 2], [2, 4]]]
+    resp = matrix_calculator_client.post('/api/compute_batch', json={'matrices': matrices})
+    tiny, small, singular = resp.get_json()['results']
+    assert tiny['rank'] == 2
+    assert tiny['det'] is None
+    assert tiny['det_log'] == {'sign': 1, 'log10_abs': pytest.approx(-400)}
+    assert small['det'] == pytest.approx(1e-12)
+    assert singular['det'] == 0 and singular['det_log'] is None
+
+
+@pytest.mark.parametrize('body,message', [
+    ({}, "matrices"),
+    ({'matrices': []}, "matrices"),
+    ({'matrices': [[[1]]] * 1001}, "1000"),
+    ({'matrices': [[[1, 2], [3, 4]], [[1, 2], [3]]]}, "Macierz 2"),
+    ({'matrices': [[[1, 2], [3, 4]], [[1, 'x'], [3, 4]]]}, "Macierz 2: Element [1,2]"),
+    ({'matrices': [[[1]], [[1] * 51]]}, "Macierz 2"),
+    ({'matrices': [[[1]], [[10001]]]}, "Macierz 2: Element [1,1]"),
+])
+def test_compute_batch_invalid(matrix_calculator_client, body, message):
+    resp = matrix_calculator_client.post('/api/compute_batch', json=body)
+    assert resp.status_code == 400
+    data = resp.get_json()
+    assert data['success'] is False
+    assert message in data['error']
+
+
+# --- Result cache ---
+
+def _count_computes(module, monkeypatch):
+    calls = {'float': 0, 'exact': 0}
+    original_float = module._compute_matrix
+    original_exact = module._compute_matrix_exact
+
+    def counted_float(*args, **kwargs):
+        calls['float'] += 1
+        return original_float(*args, **kwargs)
+
+    def counted_exact(*args, **kwargs):
+        calls['exact'] += 1
+        return original_exact(*args, **kwargs)
+    monkeypatch.setattr(module, '_compute_matrix', counted_float)
+    monkeypatch.setattr(module, '_compute_matrix_exact', counted_exact)
+    return calls
+
+
+def test_presets_served_from_cache(matrix_calculator_client, matrix_calculator_module,
+                                   monkeypatch):
+    calls = _count_computes(matrix_calculator_module, monkeypatch)
+    for preset in matrix_calculator_module.PRESETS.values():
+        for mode in ('float', 'exact'):
+            data = matrix_calculator_client.post('/api/compute', json={
+                'matrix': preset['matrix'], 'mode': mode,
+            }).get_json()
+            assert data['success'] is True
+            assert data['mode'] == mode
+    assert calls == {'float': 0, 'exact': 0}
+    singular = matrix_calculator_module.PRESETS['singular']['matrix']
+    data = matrix_calculator_client.post('/api/compute', json={'matrix': singular}).get_json()
+    assert data['rank'] == 2
+    assert data['det'] == 0
+
+
+def test_repeated_matrix_computed_once(matrix_calculator_client, matrix_calculator_module,
+                                       monkeypatch):
+    calls = _count_computes(matrix_calculator_module, monkeypatch)
+    first = matrix_calculator_client.post('/api/compute', json={
+        'matrix': [[1, 2], [3, 4]],
+    }).get_json()
+    # Same content, different spelling: 1.0 for 1
+    second = matrix_calculator_client.post('/api/compute', json={
+        'matrix': [[1.0, 2], [3, 4.0]],
+    }).get_json()
+    assert first == second
+    assert calls['float'] == 1
+    matrix_calculator_client.post('/api/compute', json={'matrix': [[0, 1], [1, 0]]})
+    matrix_calculator_client.post('/api/compute', json={'matrix': [[-0.0, 1], [1, 0]]})
+    assert calls['float'] == 2
+
+
+def test_cache_key_includes_options(matrix_calculator_client, matrix_calculator_module,
+                                    monkeypatch):
+    calls = _count_computes(matrix_calculator_module, monkeypatch)
+    matrix = [[1, 2], [3, 5]]
+    full = matrix_calculator_client.post('/api/compute', json={'matrix': matrix}).get_json()
+    none = matrix_calculator_client.post('/api/compute', json={
+        'matrix': matrix, 'steps': 'none',
+    }).get_json()
+    assert full['gauss_steps'] and none['gauss_steps'] == []
+    exact = matrix_calculator_client.post('/api/compute', json={
+        'matrix': [['1/2', 1], [0, 1]], 'mode': 'exact',
+    }).get_json()
+    again = matrix_calculator_client.post('/api/compute', json={
+        'matrix': [[0.5, '1'], [0, 1]], 'mode': 'exact',
+    }).get_json()
+    assert exact == again
+    assert calls == {'float': 2, 'exact': 1}
+
+
+def test_cache_evicts_least_recently_used(matrix_calculator_client, matrix_calculator_module,
+                                          monkeypatch):
+    monkeypatch.setattr(matrix_calculator_module, 'RESULT_CACHE_SIZE', 2)
+    calls = _count_computes(matrix_calculator_module, monkeypatch)
+
+    def post(value):
+        matrix_calculator_client.post('/api/compute', json={'matrix': [[value]]})
+    post(1)
+    post(2)
+    post(1)   # 1 becomes most recently used
+    post(3)   # evicts 2
+    assert calls['float'] == 3
+    post(1)
+    assert calls['float'] == 3
+    post(2)
+    assert calls['float'] == 4
+
+
+def test_cache_respects_byte_budget(matrix_calculator_client, matrix_calculator_module,
+                                    monkeypatch):
+    monkeypatch.setattr(matrix_calculator_module, 'RESULT_CACHE_MAX_BYTES', 1)
+    calls = _count_computes(matrix_calculator_module, monkeypatch)
+    for _ in range(2):
+        matrix_calculator_client.post('/api/compute', json={'matrix': [[7]]})
+    assert calls['float'] == 2
+    assert len(matrix_calculator_module._result_cache) == 0
+
+
+def test_streamed_results_not_cached(matrix_calculator_client, matrix_calculator_module):
+    matrix_calculator_client.post('/api/compute', json={
+        'matrix': [[1, 2], [3, 4]], 'stream': True,
+    })
+    assert len(matrix_calculator_module._result_cache) == 0
+
+
+# --- Linear systems ---
+
+def _solve(client, **body):
+    return client.post('/api/solve', json=body)
+
+
+def test_solve_lu(matrix_calculator_client):
+    data = _solve(matrix_calculator_client, matrix=[[2, 1], [1, 3]], b=[3, 5]).get_json()
+    assert data['success'] is True
+    assert data['status'] == 'solved'
+    np.testing.assert_allclose(data['x'], [0.8, 1.4])
+    assert data['residual'] < 1e-14
+
+
+def test_solve_lu_reuses_factorization(matrix_calculator_client, monkeypatch,
+                                       matrix_calculator_module):
+    calls = {'n': 0}
+    original = matrix_calculator_module.lu_factor
+
+    def counted(*args, **kwargs):
+        calls['n'] += 1
+        return original(*args, **kwargs)
+    monkeypatch.setattr(matrix_calculator_module, 'lu_factor', counted)
+    matrix = [[4, -2, 1], [3, 6, -4], [2, 1, 8]]
+    first = _solve(matrix_calculator_client, matrix=matrix, b=[1, 2, 3]).get_json()
+    second = _solve(matrix_calculator_client, matrix=matrix, b=[-1, 0, 5]).get_json()
+    assert calls['n'] == 1
+    assert first['factorization_reused'] is False
+    assert second['factorization_reused'] is True
+    np.testing.assert_allclose(np.array(matrix) @ second['x'], [-1, 0, 5], atol=1e-12)
+
+
+def test_solve_singular(matrix_calculator_client):
+    resp = _solve(matrix_calculator_client, matrix=[[1, 2], [2, 4]], b=[1, 2])
+    assert resp.status_code == 400
+    assert 'osobliwa' in resp.get_json()['error']
+
+
+@pytest.mark.parametrize('method', ['jacobi', 'gauss_seidel', 'cg'])
+def test_solve_iterative_converges(matrix_calculator_client, method):
+    rng = np.random.default_rng(2)
+    n = 60
+    A = rng.uniform(-1, 1, (n, n))
+    A = A + A.T + np.diag(np.abs(A).sum(axis=1) * 2 + 1)   # symmetric, diagonally dominant
+    b = rng.uniform(-1, 1, n)
+    data = _solve(matrix_calculator_client, matrix=A.tolist(), b=b.tolist(),
+                  method=method, tol=1e-10).get_json()
+    assert data['status'] == 'converged'
+    assert data['trace'][0] == pytest.approx(1.0)
+    assert data['trace'][-1] <= 1e-10
+    assert data['iterations'] == len(data['trace']) - 1
+    assert data['residual'] == pytest.approx(data['trace'][-1], rel=1e-3, abs=1e-13)
+    np.testing.assert_allclose(data['x'], np.linalg.solve(A, b), atol=1e-8)
+
+
+def test_gauss_seidel_matches_sequential_sweep(matrix_calculator_module):
+    A = np.array([[4.0, 1, 2], [1, 5, 1], [2, 1, 6]])
+    b = np.array([1.0, 2, 3])
+    x, _, _ = matrix_calculator_module._solve_gauss_seidel(A, b, np.zeros(3), 0.0, 2)
+    expected = np.zeros(3)
+    for _ in range(2):
+        for i in range(3):
+            expected[i] = (b[i] - A[i] @ expected + A[i, i] * expected[i]) / A[i, i]
+    np.testing.assert_allclose(x, expected, rtol=1e-14)
+
+
+def test_solve_iterative_stops_early_and_reports_status(matrix_calculator_client):
+    matrix = [[10, 1], [1, 10]]
+    limited = _solve(matrix_calculator_client, matrix=matrix, b=[1, 1],
+                     method='jacobi', max_iter=2).get_json()
+    assert limited['status'] == 'max_iter'
+    assert len(limited['trace']) == 3
+    exact_start = _solve(matrix_calculator_client, matrix=matrix, b=[11, 11],
+                         method='jacobi', x0=[1, 1]).get_json()
+    assert exact_start['status'] == 'converged'
+    assert exact_start['iterations'] == 0
+    diverged = _solve(matrix_calculator_client, matrix=[[1, 2], [3, 1]], b=[1, 1],
+                      method='jacobi').get_json()
+    assert diverged['status'] == 'diverged'
+    assert diverged['iterations'] < 100
+
+
+@pytest.mark.parametrize('body', [
+    {'matrix': [[1, 2, 3], [4, 5, 6]], 'b': [1, 2]},
+    {'matrix': [[1, 0], [0, 1]], 'b': [1]},
+    {'matrix': [[1, 0], [0, 1]], 'b': [1, 'x']},
+    {'matrix': [[1, 0], [0, 1]]},
+    {'matrix': [[1, 0], [0, 1]], 'b': [1, 1], 'method': 'sor'},
+    {'matrix': [[1, 0], [0, 1]], 'b': [1, 1], 'method': 'jacobi', 'tol': 0},
+    {'matrix': [[1, 0], [0, 1]], 'b': [1, 1], 'method': 'jacobi', 'max_iter': 10001},
+    {'matrix': [[1, 0], [0, 1]], 'b': [1, 1], 'method': 'jacobi', 'x0': [0]},
+    {'matrix': [[0, 1], [1, 0]], 'b': [1, 1], 'method': 'jacobi'},
+    {'matrix': [[0, 1], [1, 0]], 'b': [1, 1], 'method': 'gauss_seidel'},
+    {'matrix': [[1, 2], [0, 1]], 'b': [1, 1], 'method': 'cg'},
+    {'matrix': [[1, 2], [2, 1]], 'b': [1, -1], 'method': 'cg'},
+])
+def test_solve_invalid(matrix_calculator_client, body):
+    resp = matrix_calculator_client.post('/api/solve', json=body)
+    assert resp.status_code == 400
+    assert resp.get_json()['success'] is False
+
+
+@pytest.mark.parametrize('options,error', [
+    ({'tol': 'abc'}, 'Parametr tol musi byc liczba'),
+    ({'tol': None}, 'Parametr tol musi byc liczba'),
+    ({'tol': [1e-6]}, 'Parametr tol musi byc liczba'),
+    ({'tol': 'inf'}, 'Parametr tol musi byc liczba skonczona'),
+    ({'max_iter': 2.7}, 'Parametr max_iter musi byc liczba calkowita'),
+    ({'max_iter': 'dużo'}, 'Parametr max_iter musi byc liczba calkowita'),
+    ({'max_iter': None}, 'Parametr max_iter musi byc liczba calkowita'),
+    ({'max_iter': True}, 'Parametr max_iter musi byc liczba calkowita'),
+])
+def test_solve_option_messages(matrix_calculator_client, options, error):
+    resp = matrix_calculator_client.post('/api/solve', json={
+        'matrix': [[4, 1], [1, 3]], 'b': [1, 2], 'method': 'jacobi', **options,
+    })
+    assert resp.status_code == 400
+    assert resp.get_json()['error'] == error
+
+
+def test_solve_accepts_integral_float_and_string_options(matrix_calculator_client):
+    data = matrix_calculator_client.post('/api/solve', json={
+        'matrix': [[4, 1], [1, 3]], 'b': [1, 2], 'method': 'jacobi',
+        'max_iter': 50.0, 'tol': '1e-8',
+    }).get_json()
+    assert data['success'] is True
+    assert data['status'] == 'converged'
+
+
+# --- Decompositions ---
+# Factors are serialised with 8 decimals, hence atol=1e-7 below.
+
+def _decompose(client, matrix, **options):
+    resp = client.post('/api/decompose', json={'matrix': matrix, **options})
+    assert resp.status_code == 200, resp.get_json()
+    return resp.get_json()
+
+
+def _playback(module, data):
+    snapshots = list(module._replay_steps(data['initial'], data['steps']))
+    return snapshots[-1][1]
+
+
+def test_decompose_lu(matrix_calculator_client, matrix_calculator_module):
+    A = np.array([[1, 2, 0], [3, 1, 4], [2, 5, 1]], dtype=float)
+    data = _decompose(matrix_calculator_client, A.tolist(), kind='lu')
+    assert data['factors'] == ['P', 'L', 'U']
+    P, L, U = (np.array(data[name]) for name in data['factors'])
+    np.testing.assert_allclose(P @ A, L @ U, atol=1e-7)
+    np.testing.assert_allclose(np.diag(L), 1.0)
+    assert np.allclose(np.triu(L, 1), 0) and np.allclose(np.tril(U, -1), 0)
+    assert data['steps'][0]['ops'][0] == {'op': 'swap', 'i': 0, 'j': 1}
+    assert {op['op'] for step in data['steps'] for op in step['ops']} == {'swap', 'add'}
+    np.testing.assert_allclose(_playback(matrix_calculator_module, data), U, atol=1e-7)
+    assert data['reconstruction_error'] < 1e-15
+
+
+@pytest.mark.parametrize('algorithm', ['householder', 'givens'])
+@pytest.mark.parametrize('shape', [(4, 4), (5, 3), (3, 5)])
+def test_decompose_qr(matrix_calculator_client, matrix_calculator_module, algorithm, shape):
+    A = np.random.default_rng(4).uniform(-5, 5, shape)
+    data = _decompose(matrix_calculator_client, A.tolist(), kind='qr', algorithm=algorithm)
+    assert data['algorithm'] == algorithm
+    Q, R = np.array(data['Q']), np.array(data['R'])
+    np.testing.assert_allclose(Q @ Q.T, np.eye(shape[0]), atol=1e-7)
+    np.testing.assert_allclose(Q @ R, A, atol=1e-7)
+    assert np.allclose(np.tril(R, -1), 0)
+    assert np.all(np.diag(R) >= 0)
+    np.testing.assert_allclose(_playback(matrix_calculator_module, data), R, atol=1e-7)
+    # R is unique (non-negative diagonal): it matches LAPACK
+    lapack = _decompose(matrix_calculator_client, A.tolist(), kind='qr', log=False)
+    assert lapack['steps'] is None
+    np.testing.assert_allclose(lapack['R'], R, atol=1e-7)
+
+
+def test_decompose_cholesky(matrix_calculator_client, matrix_calculator_module):
+    A = [[4, 2, 2], [2, 5, 3], [2, 3, 6]]
+    data = _decompose(matrix_calculator_client, A, kind='cholesky')
+    L = np.array(data['L'])
+    np.testing.assert_allclose(L, np.linalg.cholesky(A), atol=1e-7)
+    np.testing.assert_allclose(_playback(matrix_calculator_module, data), L.T, atol=1e-7)
+    lapack = _decompose(matrix_calculator_client, A, kind='cholesky', log=False)
+    np.testing.assert_allclose(lapack['L'], L, atol=1e-7)
+
+
+def test_decompose_svd(matrix_calculator_client):
+    A = [[3, 1, 1], [-1, 3, 1]]
+    data = _decompose(matrix_calculator_client, A, kind='svd')
+    assert data['factors'] == ['U', 'S', 'Vt']
+    assert data['steps'] is None
+    np.testing.assert_allclose(data['S'], [np.sqrt(12), np.sqrt(10)])
+    assert data['reconstruction_error'] < 1e-14
+
+
+def test_decompose_binary_format(matrix_calculator_client):
+    A = np.random.default_rng(8).uniform(-1, 1, (6, 4))
+    as_json = _decompose(matrix_calculator_client, A.tolist(), kind='qr')
+    as_binary = _decompose(matrix_calculator_client, A.tolist(), kind='qr', format='binary')
+    for name in ('Q', 'R'):
+        encoded = as_binary[name]
+        assert encoded['dtype'] == '<f8'
+        array = np.frombuffer(base64.b64decode(encoded['data']), dtype='<f8')
+        array = array.reshape(encoded['shape'])
+        np.testing.assert_allclose(array, as_json[name], atol=1e-7)
+
+
+def test_decompose_log_defaults(matrix_calculator_client):
+    small = _decompose(matrix_calculator_client, np.eye(3).tolist())
+    assert small['steps'] is not None and small['initial'] == np.eye(3).tolist()
+    large = _decompose(matrix_calculator_client, (np.eye(12) * 2).tolist())
+    assert large['steps'] is None and large['initial'] is None
+    forced = _decompose(matrix_calculator_client, (np.eye(12) * 2).tolist(), log=True)
+    assert len(forced['steps']) == 11
+
+
+def test_decompose_large_matches_lapack(matrix_calculator_client):
+    A = np.random.default_rng(9).uniform(-10, 10, (120, 120))
+    resp = matrix_calculator_client.post('/api/decompose', json={'matrix': A.tolist()})
+    assert resp.is_streamed
+    data = json.loads(resp.get_data(as_text=True))
+    P, L, U = (np.array(data[name]) for name in ('P', 'L', 'U'))
+    np.testing.assert_allclose(P.T @ L @ U, A, atol=1e-5)
+
+
+@pytest.mark.parametrize('body', [
+    {'matrix': [[1, 2], [3, 4]], 'kind': 'eig'},
+    {'matrix': [[1, 2], [3, 4]], 'kind': 'qr', 'algorithm': 'gram_schmidt'},
+    {'matrix': [[1, 2], [3, 4]], 'format': 'npz'},
+    {'matrix': [[1, 2], [3, 4]], 'kind': 'svd', 'log': True},
+    {'matrix': [[1] * 51] * 51, 'log': True},
+    {'matrix': [[1, 2], [3, 4]], 'kind': 'cholesky'},
+    {'matrix': [[1, 2], [2, 1]], 'kind': 'cholesky'},
+    {'matrix': [[1, 2], [2, 1]], 'kind': 'cholesky', 'log': False},
+    {'matrix': [[1, 2, 3], [2, 1, 0]], 'kind': 'cholesky'},
+    {},
+])
+def test_decompose_invalid(matrix_calculator_client, body):
+    resp = matrix_calculator_client.post('/api/decompose', json=body)
+    assert resp.status_code == 400
+    assert resp.get_json()['success'] is False
+
+
+# --- Cofactor expansion ---
+
+def _cofactor(client, matrix, **options):
+    resp = client.post('/api/cofactor', json={'matrix': matrix, **options})
+    assert resp.status_code == 200, resp.get_json()
+    return resp.get_json()
+
+
+def test_cofactor_dense_4x4_reuses_minors(matrix_calculator_client):
+    A = [[1, 2, 3, 4], [5, 6, 7, 8], [2, 3, 5, 7], [1, 1, 2, 9]]
+    data = _cofactor(matrix_calculator_client, A)
+    assert int(data['det']) == round(np.linalg.det(A))
+    assert data['lu_agrees'] is True
+    # First-row expansion: one minor per non-empty column subset
+    assert data['minors'] == 2 ** 4 - 1
+    assert data['terms'] == 4 + 4 * 3 + 6 * 2
+    assert data['reused'] == data['terms'] - (data['minors'] - 1)
+    assert data['naive_calls'] == 1 + 4 + 4 * 3 + 4 * 3 * 2
+
+
+def test_cofactor_tree_structure(matrix_calculator_client):
+    data = _cofactor(matrix_calculator_client, [[2, -1, 0], [1, 3, 4], [0, 5, 1]])
+    nodes = data['nodes']
+    root = nodes[data['root']]
+    assert data['root'] == len(nodes) - 1
+    assert root['rows'] == root['cols'] == [0, 1, 2]
+    assert root['line'] == {'axis': 'row', 'index': 0}
+    assert [term['col'] for term in root['terms']] == [0, 1]   # zero entry skipped
+    assert [term['sign'] for term in root['terms']] == [1, -1]
+    assert int(root['det']) == sum(
+        term['sign'] * int(term['entry']) * int(nodes[term['minor']]['det'])
+        for term in root['terms']
+    )
+    assert all(node['line'] is None for node in nodes if len(node['rows']) == 1)
+    assert sum(node['uses'] for node in nodes) == 1 + data['terms']
+
+
+def test_cofactor_sparse_strategy(matrix_calculator_client):
+    A = [[1, 2, 3], [4, 5, 6], [0, 0, 7]]
+    data = _cofactor(matrix_calculator_client, A, strategy='sparse')
+    root = data['nodes'][data['root']]
+    assert root['line'] == {'axis': 'row', 'index': 2}
+    assert len(root['terms']) == 1
+    assert data['det'] == '-21'
+    assert _cofactor(matrix_calculator_client, A)['det'] == '-21'
+
+
+def test_cofactor_exact_fractions(matrix_calculator_client):
+    n = 6
+    hilbert = [[f'1/{i + j + 1}' for j in range(n)] for i in range(n)]
+    data = _cofactor(matrix_calculator_client, hilbert)
+    assert data['det'] == '1/186313420339200000'
+    assert data['lu_agrees'] is True
+
+
+def test_cofactor_10x10_stays_polynomial(matrix_calculator_client):
+    A = np.random.default_rng(12).integers(1, 10, (10, 10))
+    data = _cofactor(matrix_calculator_client, A.tolist())
+    assert data['minors'] == 2 ** 10 - 1
+    assert data['naive_calls'] == 6235301
+    assert data['lu_agrees'] is True
+    assert int(data['det']) == pytest.approx(np.linalg.det(A), rel=1e-9)
+
+
+@pytest.mark.parametrize('body', [
+    {'matrix': [[1, 2, 3], [4, 5, 6]]},
+    {'matrix': [[1] * 11 for _ in range(11)]},
+    {'matrix': [[1, 2], [3, 4]], 'strategy': 'column'},
+    {'matrix': [['x']]},
+    {},
+])
+def test_cofactor_invalid(matrix_calculator_client, body):
+    resp = matrix_calculator_client.post('/api/cofactor', json=body)
+    assert resp.status_code == 400
+    assert resp.get_json()['success'] is False
+
+
+# --- Eigenvalue iteration (NDJSON stream) ---
+
+def _eigen_stream(client, matrix, **options):
+    resp = client.post('/api/eigen_iterate', json={'matrix': matrix, **options})
+    assert resp.status_code == 200, resp.get_json()
+    assert resp.mimetype == 'application/x-ndjson'
+    return [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+
+
+def _eigen_complex(values):
+    return np.sort_complex(np.array(
+        [v['re'] + 1j * v['im'] if isinstance(v, dict) else v for v in values]
+    ))
+
+
+def test_eigen_power_stream(matrix_calculator_client):
+    events = _eigen_stream(matrix_calculator_client, [[2, 1], [1, 3]], method='power')
+    assert events[0] == {'type': 'start', 'method': 'power', 'n': 2,
+                         'tol': 1e-10, 'max_iter': 500}
+    iterates = [e for e in events if e['type'] == 'iterate']
+    assert [e['k'] for e in iterates] == list(range(1, len(iterates) + 1))
+    result = events[-1]
+    assert result['type'] == 'result'
+    assert result['converged'] is True
+    assert result['iterations'] == iterates[-1]['k']
+    assert result['eigenvalue'] == pytest.approx((5 + 5 ** 0.5) / 2)
+    v = np.array(result['eigenvector'])
+    assert np.allclose(np.array([[2, 1], [1, 3]]) @ v, result['eigenvalue'] * v, atol=1e-6)
+
+
+def test_eigen_inverse_with_shift(matrix_calculator_client):
+    events = _eigen_stream(matrix_calculator_client, [[2, 1], [1, 3]],
+                           method='inverse', shift=1)
+    result = events[-1]
+    assert result['converged'] is True
+    assert result['eigenvalue'] == pytest.approx((5 - 5 ** 0.5) / 2)
+    # Shift close to the eigenvalue: faster than plain power iteration
+    power = _eigen_stream(matrix_calculator_client, [[2, 1], [1, 3]], method='power')
+    assert result['iterations'] < power[-1]['iterations']
+
+
+@pytest.mark.parametrize('method', ['qr', 'shifted_qr'])
+def test_eigen_qr_matches_numpy(matrix_calculator_client, method):
+    A = [[4, 1, 0], [1, 3, 1], [0, 1, 1]]
+    events = _eigen_stream(matrix_calculator_client, A, method=method)
+    result = events[-1]
+    assert result['converged'] is True
+    assert np.allclose(_eigen_complex(result['eigenvalues']),
+                       np.sort_complex(np.linalg.eigvals(A)), atol=1e-6)
+    # Small matrices carry the Hessenberg iterate for animation
+    first = next(e for e in events if e['type'] == 'iterate')
+    assert np.array(first['matrix']).shape == (3, 3)
+
+
+def test_eigen_shifted_qr_complex_pair(matrix_calculator_client):
+    A = [[0, -1, 0], [1, 0, 0], [0, 0, 2]]
+    result = _eigen_stream(matrix_calculator_client, A, method='shifted_qr')[-1]
+    assert result['converged'] is True
+    assert result['eigenvalues_complex'] is True
+    assert np.allclose(_eigen_complex(result['eigenvalues']),
+                       np.sort_complex(np.array([2, 1j, -1j])), atol=1e-6)
+
+
+@pytest.mark.parametrize('n', [3, 5, 8])
+def test_eigen_shifted_qr_cyclic_permutation(matrix_calculator_client, n):
+    """Shifts are symmetric about the spectrum; only the exceptional shift breaks the stall."""
+    A = np.roll(np.eye(n), 1, axis=1)     # n=3: [[0,1,0],[0,0,1],[1,0,0]]
+    result = _eigen_stream(matrix_calculator_client, A.tolist(), method='shifted_qr')[-1]
+    assert result['converged'] is True
+    assert result['iterations'] < 100
+    roots = np.exp(2j * np.pi * np.arange(n) / n)
+    assert np.allclose(_eigen_complex(result['eigenvalues']),
+                       np.sort_complex(roots), atol=1e-6)
+
+
+def test_eigen_shifted_qr_random_50(matrix_calculator_client):
+    A = np.random.default_rng(5).uniform(-1, 1, (50, 50))
+    events = _eigen_stream(matrix_calculator_client, A.tolist(),
+                           method='shifted_qr', every=50)
+    result = events[-1]
+    assert result['converged'] is True
+    assert result['iterations'] < 300
+    assert np.allclose(_eigen_complex(result['eigenvalues']),
+                       np.sort_complex(np.linalg.eigvals(A)), atol=1e-5)
+    iterates = [e for e in events if e['type'] == 'iterate']
+    assert all('matrix' not in e for e in iterates)
+    assert np.iscomplexobj(np.linalg.eigvals(A))
+    assert result['eigenvalues_complex'] is True
+
+
+def test_eigen_every_keeps_last_iterate(matrix_calculator_client):
+    events = _eigen_stream(matrix_calculator_client, [[2, 1], [1, 3]],
+                           method='power', every=7)
+    ks = [e['k'] for e in events if e['type'] == 'iterate']
+    result = events[-1]
+    assert all(k % 7 == 0 for k in ks[:-1])
+    assert ks[-1] == result['iterations']
+
+
+def test_eigen_max_iter_not_converged(matrix_calculator_client):
+    result = _eigen_stream(matrix_calculator_client, [[2, 1], [1, 3]],
+                           method='qr', max_iter=2)[-1]
+    assert result['converged'] is False
+    assert result['iterations'] == 2
+    assert len(result['eigenvalues']) == 2
+
+
+@pytest.mark.parametrize('body', [
+    {'matrix': [[1, 2, 3], [4, 5, 6]]},
+    {'matrix': [[1] * 201 for _ in range(201)]},
+    {'matrix': [[1, 2], [3, 4]], 'method': 'jacobi'},
+    {'matrix': [[1, 2], [3, 4]], 'tol': 0},
+    {'matrix': [[1, 2], [3, 4]], 'max_iter': 5001},
+    {'matrix': [[1, 2], [3, 4]], 'every': 0},
+    {'matrix': [[1, 2], [3, 4]], 'x0': [0, 0]},
+    {'matrix': [[1, 2], [3, 4]], 'x0': [1, 2, 3]},
+    {'matrix': [[2, 0], [0, 3]], 'method': 'inverse', 'shift': 2},
+    {},
+])
+def test_eigen_iterate_invalid(matrix_calculator_client, body):
+    resp = matrix_calculator_client.post('/api/eigen_iterate', json=body)
+    assert resp.status_code == 400
+    assert resp.get_json()['success'] is False
+
+
+@pytest.mark.parametrize('options,error', [
+    ({'tol': 'abc'}, 'Parametr tol musi byc liczba'),
+    ({'tol': None}, 'Parametr tol musi byc liczba'),
+    ({'max_iter': 2.7}, 'Parametr max_iter musi byc liczba calkowita'),
+    ({'max_iter': 'abc'}, 'Parametr max_iter musi byc liczba calkowita'),
+    ({'every': 1.5}, 'Parametr every musi byc liczba calkowita'),
+    ({'every': None}, 'Parametr every musi byc liczba calkowita'),
+    ({'method': 'inverse', 'shift': 'abc'}, 'Parametr shift musi byc liczba'),
+    ({'method': 'inverse', 'shift': 'nan'}, 'Parametr shift musi byc liczba skonczona'),
+    ({'method': 'inverse', 'shift': {}}, 'Parametr shift musi byc liczba'),
+])
+def test_eigen_iterate_option_messages(matrix_calculator_client, options, error):
+    resp = matrix_calculator_client.post('/api/eigen_iterate', json={
+        'matrix': [[2, 1], [1, 3]], **options,
+    })
+    assert resp.status_code == 400
+    assert resp.get_json()['error'] == error
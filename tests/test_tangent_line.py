@@ -1,6 +1,8 @@
 """Tests for the tangent_line Flask backend."""
 import math
 
+import pytest
+
 
 def test_index_returns_200(tangent_line_client):
     resp = tangent_line_client.get('/')
@@ -163,3 +165,60 @@ def test_compute_tangent_data_length(tangent_line_client):
     assert data['success'] is True
     assert len(data['tangent_data']['x']) == 500
     assert len(data['func_data']['x']) == 500
+
+
+def test_compute_custom_expression(tangent_line_client):
+    """f(x) = a*x^3 - x at x0 = 2: f(2) = 14, f'(2) = 23 for a = 2."""
+    resp = tangent_line_client.post('/api/compute', json={
+        'expression': 'a*x^3 - x',
+        'params': {'a': 2},
+        'x0': 2,
+    })
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert data['success'] is True
+    assert data['params'] == {'a': 2.0}
+    assert data['func_formula'] == 'f(x) = a * x^3 - x'
+    assert data['func_value_at_x0'] == pytest.approx(14)
+    assert data['slope'] == pytest.approx(23)
+
+
+BAD_EXPRESSIONS = [
+    '__import__("os")',
+    'os.system("ls")',
+    'x.real',
+    'lambda: 1',
+    '+'.join(['x'] * 60),
+    '',
+    12,
+]
+
+
+@pytest.mark.parametrize('expression', BAD_EXPRESSIONS)
+def test_compute_rejects_bad_expression(tangent_line_client, expression):
+    resp = tangent_line_client.post('/api/compute', json={
+        'expression': expression,
+        'x0': 1,
+    })
+    assert resp.status_code == 400
+    data = resp.get_json()
+    assert data['success'] is False
+    assert data['error']
+
+
+def test_compute_expression_too_many_nodes_message(tangent_line_client):
+    resp = tangent_line_client.post('/api/compute', json={
+        'expression': '+'.join(['x'] * 60),
+        'x0': 1,
+    })
+    assert '100' in resp.get_json()['error']
+
+
+def test_compute_expression_bad_param(tangent_line_client):
+    resp = tangent_line_client.post('/api/compute', json={
+        'expression': 'a*x',
+        'params': {'a': 'abc'},
+        'x0': 1,
+    })
+    assert resp.status_code == 400
+    assert resp.get_json()['error'] == 'Parametr a musi być liczbą'
@@ -1,6 +1,8 @@
 """Tests for the taylor_series Flask backend."""
 import math
 
+import pytest
+
 
 def test_index_returns_200(taylor_series_client):
     resp = taylor_series_client.get('/')
@@ -134,3 +136,256 @@ def test_compute_nonzero_center(taylor_series_client):
     assert data['success'] is True
     assert data['center'] == 1.0
     assert len(data['coefficients']) == 6
+
+
+def test_maclaurin_exact_coefficients(taylor_series_module):
+    from fractions import Fraction
+    coeffs = taylor_series_module._maclaurin_coefficients('sqrt1px', 4, exact=True)
+    # C(1/2, n): 1, 1/2, -1/8, 1/16, -5/128
+    assert coeffs == [Fraction(1), Fraction(1, 2), Fraction(-1, 8),
+                      Fraction(1, 16), Fraction(-5, 128)]
+    sin_coeffs = taylor_series_module._maclaurin_coefficients('sin', 5, exact=True)
+    assert sin_coeffs == [0, 1, 0, Fraction(-1, 6), 0, Fraction(1, 120)]
+
+
+def test_maclaurin_float_matches_exact(taylor_series_module):
+    for func_id in taylor_series_module.FUNCTIONS:
+        approx = taylor_series_module._maclaurin_coefficients(func_id, 20)
+        exact = taylor_series_module._maclaurin_coefficients(func_id, 20, exact=True)
+        for a, b in zip(approx, exact):
+            assert math.isclose(a, float(b), rel_tol=1e-14, abs_tol=1e-300)
+
+
+def test_compute_high_precision(taylor_series_client):
+    resp = taylor_series_client.post('/api/compute', json={
+        'func': 'ln1px',
+        'degree': 20,
+        'center': 0,
+        'eval_point': 0.9,
+        'precision': 'high',
+    })
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert data['success'] is True
+    assert data['precision'] == 'high'
+    assert data['coefficients_exact'][:4] == ['0', '1', '-1/2', '1/3']
+    # |R_20(0.9)| <= 0.9^21 / 21
+    assert data['error_at_point'] < 0.9 ** 21 / 21
+
+
+def test_high_precision_more_accurate_than_standard(taylor_series_client,
+                                                   taylor_series_module):
+    from decimal import Decimal, getcontext
+    from fractions import Fraction
+    import numpy as np
+    mod = taylor_series_module
+    x, degree = 0.9, 20
+    exact_coeffs = mod._taylor_coefficients('ln1px', 0, degree, exact=True)
+    t_exact = sum(c * Fraction(x) ** k for k, c in enumerate(exact_coeffs))
+    getcontext().prec = 40
+    true_error = abs(Decimal(1.9).ln() - Decimal(t_exact.numerator) / t_exact.denominator)
+
+    # The endpoint rounds error_at_point to 1e-10: both modes report the true
+    # truncation error |ln(1.9) - T_20(0.9)| at that resolution
+    errors = {}
+    for precision in ('standard', 'high'):
+        resp = taylor_series_client.post('/api/compute', json={
+            'func': 'ln1px', 'degree': degree, 'center': 0,
+            'eval_point': x, 'precision': precision,
+        })
+        errors[precision] = resp.get_json()['error_at_point']
+        assert errors[precision] == pytest.approx(float(true_error), abs=2e-10)
+
+    # Unrounded, the high-precision polynomial is closer to the exact one
+    deviation = {}
+    for high in (False, True):
+        coeffs = mod._taylor_coefficients('ln1px', 0, degree, exact=high)
+        value = mod._evaluate_taylor(coeffs, 0, np.array([x]), compensated=high)[0]
+        deviation[high] = abs(Fraction(value) - t_exact)
+    assert deviation[True] < deviation[False] / 10
+
+
+def test_compute_invalid_precision(taylor_series_client):
+    resp = taylor_series_client.post('/api/compute', json={
+        'func': 'sin',
+        'degree': 5,
+        'precision': 'quad',
+    })
+    assert resp.status_code == 400
+    assert resp.get_json()['success'] is False
+
+
+def test_error_surface_shape(taylor_series_client):
+    resp = taylor_series_client.post('/api/error_surface', json={
+        'func': 'ln1px',
+        'center': 0,
+        'points': 50,
+    })
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert data['success'] is True
+    assert data['degrees'] == list(range(21))
+    assert len(data['log_error']) == 21
+    assert all(len(row) == 50 for row in data['log_error'])
+    # ln(1+x) is undefined for x <= -1 -> null cells
+    assert data['log_error'][5][0] is None
+    assert data['convergence_radius'] == 1
+
+
+def test_partial_sums_match_individual_polynomials(taylor_series_module):
+    import numpy as np
+    x = np.linspace(-1.0, 1.0, 7)
+    coeffs = taylor_series_module._taylor_coefficients('exp', 0, 6)
+    sums = taylor_series_module._taylor_partial_sums(coeffs, 0, x)
+    for n in range(7):
+        expected = taylor_series_module._evaluate_taylor(coeffs[:n + 1], 0, x)
+        np.testing.assert_allclose(sums[n], expected, rtol=1e-12)
+
+
+def test_error_surface_cell_matches_compute(taylor_series_client):
+    surface = taylor_series_client.post('/api/error_surface', json={
+        'func': 'ln1px', 'center': 0, 'points': 50,
+    }).get_json()
+    degree = 5
+    i = next(i for i, x in enumerate(surface['x']) if x > 0.5)
+    x = surface['x'][i]
+    resp = taylor_series_client.post('/api/compute', json={
+        'func': 'ln1px', 'degree': degree, 'center': 0, 'eval_point': x,
+    })
+    error = resp.get_json()['error_at_point']
+    assert error > 1e-6    # well above the 1e-10 rounding of error_at_point
+    assert surface['log_error'][degree][i] == pytest.approx(math.log10(error), abs=1e-3)
+
+
+def test_error_surface_invalid_degree(taylor_series_client):
+    resp = taylor_series_client.post('/api/error_surface', json={
+        'func': 'sin',
+        'max_degree': 30,
+    })
+    assert resp.status_code == 400
+    assert resp.get_json()['success'] is False
+
+
+def test_complex_error_image(taylor_series_client):
+    import base64
+    import numpy as np
+    resp = taylor_series_client.post('/api/complex_error', json={
+        'func': 'atan',
+        'degree': 10,
+        'center': 0,
+        'size': 64,
+    })
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert data['success'] is True
+    image = np.frombuffer(base64.b64decode(data['image']), dtype=np.uint8)
+    assert image.shape == (64 * 64,)
+    image = image.reshape(64, 64)
+    # Singularities of arctan at +-i determine R = 1
+    assert data['convergence_radius'] == 1
+    assert {'re': 0.0, 'im': 1.0} in data['singularities']
+    # Error near the centre is far smaller than at the corners of the grid
+    assert image[32, 32] < image[0, 0]
+
+
+def test_complex_error_cached(taylor_series_client, taylor_series_module):
+    body = {'func': 'exp', 'degree': 4, 'center': 0, 'size': 32}
+    taylor_series_client.post('/api/complex_error', json=body)
+    hits = taylor_series_module._complex_error_image.cache_info().hits
+    resp = taylor_series_client.post('/api/complex_error', json=body)
+    assert resp.get_json()['convergence_radius'] is None
+    assert taylor_series_module._complex_error_image.cache_info().hits == hits + 1
+
+
+def test_complex_error_invalid_size(taylor_series_client):
+    resp = taylor_series_client.post('/api/complex_error', json={
+        'func': 'sin',
+        'size': 4096,
+    })
+    assert resp.status_code == 400
+    assert resp.get_json()['success'] is False
+
+
+def test_nth_derivative_matches_numerical(taylor_series_module):
+    import numpy as np
+    x = np.array([-0.5, 0.3, 0.7])
+    for func_id in taylor_series_module.FUNCTIONS:
+        for n in (1, 2, 3):
+            analytic = taylor_series_module._nth_derivative(func_id, n, x)
+            numeric = [taylor_series_module._nth_derivative_numerical(func_id, v, n, 1e-3)
+                       for v in x]
+            np.testing.assert_allclose(analytic, numeric, rtol=1e-3, atol=1e-4)
+
+
+def test_compute_remainder_bound(taylor_series_client):
+    resp = taylor_series_client.post('/api/compute', json={
+        'func': 'cos',
+        'degree': 4,
+        'center': 0,
+        'eval_point': 1.0,
+    })
+    assert resp.status_code == 200
+    data = resp.get_json()
+    assert len(data['remainder_bound']['y']) == len(data['func_data']['x'])
+    # |cos^(5)| <= 1, so the bound at x = 1 is at most 1/5!
+    assert data['bound_at_point'] <= 1 / 120 + 1e-12
+    assert data['error_at_point'] <= data['bound_at_point']
+    for err, bound in zip(data['error_data']['y'], data['remainder_bound']['y']):
+        assert err <= bound + 1e-9
+
+
+def test_remainder_bound_unbounded_outside_domain(taylor_series_client):
+    resp = taylor_series_client.post('/api/compute', json={
+        'func': 'ln1px',
+        'degree': 3,
+        'center': 0,
+    })
+    data = resp.get_json()
+    # The segment [x, 0] crosses x = -1 for the leftmost points
+    assert data['remainder_bound']['y'][0] is None
+    assert data['remainder_bound']['y'][-1] is not None
+
+
+def test_pade_geometric_series_is_exact(taylor_series_module):
+    import numpy as np
+    # 1/(1-x) has Pade [L/1] equal to the function itself
+    coeffs = taylor_series_module._maclaurin_coefficients('one_over_1mx', 4)
+    p, q = taylor_series_module._pade_coefficients(coeffs, 1)
+    np.testing.assert_allclose(q, [1, -1], atol=1e-12)
+    x = np.array([-3.0, 0.5, 2.0])
+    np.testing.assert_allclose(taylor_series_module._evaluate_pade(p, q, 0, x),
+                               1 / (1 - x), rtol=1e-12)
+
+
+def test_chebyshev_interpolates_at_nodes(taylor_series_module):
+    import numpy as np
+    cheb = taylor_series_module._chebyshev_coefficients('exp', 6, [-1.0, 1.0])
+    x = np.linspace(-1, 1, 9)
+    approx = taylor_series_module._evaluate_chebyshev(cheb, [-1.0, 1.0], x)
+    np.testing.assert_allclose(approx, np.exp(x), atol=1e-4)
+
+
+def test_compute_all_approximations(taylor_series_client):
+    resp = taylor_series_client.post('/api/compute', json={
+        'func': 'atan',
+        'degree': 8,
+        'center': 0,
+        'approximation': 'all',
+    })
+    assert resp.status_code == 200
+    data = resp.get_json()
+    approx = data['approximations']
+    assert set(approx) == {'taylor', 'pade', 'chebyshev'}
+    assert all(len(a['y']) == len(data['func_data']['x']) for a in approx.values())
+    # Outside |x| < 1 the Taylor polynomial diverges; alternatives do not
+    assert approx['chebyshev']['max_error'] < approx['taylor']['max_error']
+    assert approx['pade']['max_error'] < approx['taylor']['max_error']
+
+
+def test_compute_invalid_approximation(taylor_series_client):
+    resp = taylor_series_client.post('/api/compute', json={
+        'func': 'sin',
+        'approximation': 'fourier',
+    })
+    assert resp.status_code == 400
+    assert resp.get_json()['success'] is False
@@ -0,0 +1,75 @@
+"""
+Porównanie backendów evaluate_function (numpy / numexpr / numba).
+
+Uruchomienie (z katalogu głównego repozytorium):
+    python toys/common/benchmark_backends.py
+    python toys/common/benchmark_backends.py --max-exp 6 --repeat 3
+
+Niezainstalowane backendy są pomijane. Czas numba nie obejmuje
+kompilacji (pierwsze wywołanie jest rozgrzewką).
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+# Dodaj toys/ do path zeby importy common dzialaly
+current_dir = os.path.dirname(os.path.abspath(__file__))
+toys_dir = os.path.dirname(current_dir)
+if toys_dir not in sys.path:
+    sys.path.insert(0, toys_dir)
+
+from common.functions import (
+    BACKENDS, available_backends, evaluate_function, resolve_params
+)
+
+BENCHMARK_FUNCTIONS = {
+    'cubic': {'a': 1.5, 'b': -2, 'c': 0.5, 'd': 1},
+    'ln': {'a': 1, 'b': 1, 'c': 1},
+    'sqrt': {'a': 1, 'b': 1, 'c': 0},
+    'power': {'a': 1, 'n': 2.5},
+}
+
+
+def _best_time(func_id, x_arr, params, backend, repeat):
+    """Najkrótszy czas z repeat wywołań (w sekundach)."""
+    evaluate_function(func_id, x_arr[:10], params, backend=backend)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        evaluate_function(func_id, x_arr, params, backend=backend)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--min-exp', type=int, default=3, help='najmniejsze n = 10^k')
+    parser.add_argument('--max-exp', type=int, default=7, help='największe n = 10^k')
+    parser.add_argument('--repeat', type=int, default=5, help='liczba powtórzeń')
+    args = parser.parse_args()
+
+    backends = available_backends()
+    missing = [b for b in BACKENDS if b not in backends]
+    if missing:
+        print(f"Pominięte (brak pakietu): {', '.join(missing)}")
+
+    header = f"{'funkcja':<10}{'n':>10}" + ''.join(f'{b:>12}' for b in backends)
+    print(header)
+    print('-' * len(header))
+    for func_id, raw_params in BENCHMARK_FUNCTIONS.items():
+        params = resolve_params(func_id, raw_params)
+        for k in range(args.min_exp, args.max_exp + 1):
+            x_arr = np.linspace(-10, 10, 10 ** k)
+            times = [
+                _best_time(func_id, x_arr, params, b, args.repeat) for b in backends
+            ]
+            row = f'{func_id:<10}{10 ** k:>10}'
+            row += ''.join(f'{t * 1e3:>10.3f}ms' for t in times)
+            print(row)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,679 @@
+"""
+Bezpieczny kompilator wyrażeń matematycznych wpisywanych przez użytkownika.
+
+Wyrażenie (np. 'a*sin(b*x) + x^2') jest parsowane modułem ast, sprawdzane
+względem białej listy konstrukcji i funkcji, a następnie zamieniane na
+zagnieżdżone domknięcia operujące na tablicach numpy - bez eval/exec.
+Nazwy inne niż x, stałe i funkcje traktowane są jako parametry.
+
+Skompilowane wyrażenia są cache'owane według znormalizowanego źródła,
+więc kolejne żądania z tą samą formułą nie parsują jej ponownie.
+
+Pochodne dowolnego rzędu liczone są symbolicznie na drzewie AST
+z uproszczeniami, a f, f', f'', ... obliczane są jednym planem, w którym
+wspólne podwyrażenia (np. b*x + c, sin(b*x + c)) liczone są raz.
+
+Użycie:
+    from common.expressions import compile_expression, compile_derivatives
+    expr = compile_expression('a*sin(b*x) + x^2')
+    y = expr['evaluate'](x_arr, {'a': 1, 'b': 2})
+    y, dy = compile_derivatives('a*sin(b*x)', 1)['evaluate'](x_arr, {'a': 1, 'b': 2})
+"""
+
+import ast
+import math
+from functools import lru_cache
+
+import numpy as np
+
+
+MAX_EXPRESSION_LENGTH = 200
+MAX_NODES = 100
+MAX_PARAMS = 8
+EXPRESSION_CACHE_SIZE = 256
+MAX_DERIVATIVE_ORDER = 6
+# Limit węzłów drzewa pojedynczej pochodnej (reguła iloczynu mnoży rozmiar)
+MAX_DERIVATIVE_NODES = 5000
+
+VARIABLE = 'x'
+
+CONSTANTS = {
+    'pi': math.pi,
+    'e': math.e,
+}
+
+# Zamiana zapisu "szkolnego" na składnię Pythona przed parsowaniem
+SOURCE_REPLACEMENTS = (
+    ('^', '**'),
+    ('·', '*'),
+    ('×', '*'),
+    ('−', '-'),
+)
+
+
+def _always(u):
+    return np.ones(np.shape(u), dtype=bool)
+
+
+# Biała lista funkcji: nazwa -> (ufunc, predykat dziedziny argumentu)
+UFUNCS = {
+    'sin': (np.sin, _always),
+    'cos': (np.cos, _always),
+    # Maskowanie asymptot jak w common.functions
+    'tan': (np.tan, lambda u: np.abs(np.cos(u)) >= 0.01),
+    'exp': (np.exp, _always),
+    'ln': (np.log, lambda u: u > 0),
+    'log': (np.log, lambda u: u > 0),
+    'log10': (np.log10, lambda u: u > 0),
+    'sqrt': (np.sqrt, lambda u: u >= 0),
+    'abs': (np.abs, _always),
+    'asin': (np.arcsin, lambda u: np.abs(u) <= 1),
+    'acos': (np.arccos, lambda u: np.abs(u) <= 1),
+    'atan': (np.arctan, _always),
+    'sinh': (np.sinh, _always),
+    'cosh': (np.cosh, _always),
+    'tanh': (np.tanh, _always),
+}
+
+BINARY_OPS = {
+    ast.Add: np.add,
+    ast.Sub: np.subtract,
+    ast.Mult: np.multiply,
+    ast.Div: np.divide,
+    ast.Pow: np.power,
+}
+
+UNARY_OPS = {
+    ast.UAdd: np.positive,
+    ast.USub: np.negative,
+}
+
+
+def normalize_expression(source):
+    """
+    Sprowadza wyrażenie do postaci kanonicznej (klucz cache).
+
+    Returns:
+        tuple (znormalizowane źródło, drzewo ast.Expression)
+
+    Raises:
+        ValueError: pusta, za długa lub niepoprawna składniowo formuła
+    """
+    if not isinstance(source, str) or not source.strip():
+        raise ValueError("Wyrażenie musi być niepustym tekstem")
+    if len(source) > MAX_EXPRESSION_LENGTH:
+        raise ValueError(
+            f"Wyrażenie może mieć co najwyżej {MAX_EXPRESSION_LENGTH} znaków"
+        )
+    text = source.strip()
+    for old, new in SOURCE_REPLACEMENTS:
+        text = text.replace(old, new)
+    try:
+        tree = ast.parse(text, mode='eval')
+    except SyntaxError:
+        raise ValueError(f"Niepoprawna składnia wyrażenia: {source}")
+    return ast.unparse(tree), tree
+
+
+def _validate_tree(tree):
+    """
+    Sprawdza drzewo względem białej listy i zbiera nazwy parametrów.
+
+    Returns:
+        tuple posortowanych nazw parametrów
+
+    Raises:
+        ValueError: niedozwolona konstrukcja, funkcja lub nazwa
+    """
+    nodes = list(ast.walk(tree.body))
+    if len(nodes) > MAX_NODES:
+        raise ValueError(f"Wyrażenie jest zbyt złożone (maks. {MAX_NODES} węzłów)")
+
+    called = {id(node.func) for node in nodes if isinstance(node, ast.Call)}
+    params = set()
+    for node in nodes:
+        if isinstance(node, ast.BinOp):
+            if type(node.op) not in BINARY_OPS:
+                raise ValueError("Niedozwolony operator w wyrażeniu")
+        elif isinstance(node, ast.UnaryOp):
+            if type(node.op) not in UNARY_OPS:
+                raise ValueError("Niedozwolony operator w wyrażeniu")
+        elif isinstance(node, ast.Call):
+            if not isinstance(node.func, ast.Name) or node.func.id not in UFUNCS:
+                raise ValueError(f"Niedozwolona funkcja: {ast.unparse(node.func)}")
+            if len(node.args) != 1 or node.keywords:
+                raise ValueError(f"Funkcja {node.func.id} przyjmuje jeden argument")
+        elif isinstance(node, ast.Name):
+            if id(node) in called:
+                continue
+            if node.id in UFUNCS:
+                raise ValueError(f"Funkcja {node.id} wymaga argumentu")
+            if node.id != VARIABLE and node.id not in CONSTANTS:
+                params.add(node.id)
+        elif isinstance(node, ast.Constant):
+            value = node.value
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise ValueError("Dozwolone są tylko stałe liczbowe")
+        elif not isinstance(node, (ast.operator, ast.unaryop, ast.Load)):
+            raise ValueError(
+                f"Niedozwolona konstrukcja w wyrażeniu: {type(node).__name__}"
+            )
+
+    if len(params) > MAX_PARAMS:
+        raise ValueError(f"Wyrażenie może mieć co najwyżej {MAX_PARAMS} parametrów")
+    return tuple(sorted(params))
+
+
+def _compile_node(node):
+    """Zamienia węzeł AST na domknięcie env -> wartość (tablica lub float)."""
+    if isinstance(node, ast.Constant):
+        # float: potęgowanie dużych int-ów Pythona mogłoby się nie skończyć
+        value = float(node.value)
+        return lambda env: value
+
+    if isinstance(node, ast.Name):
+        if node.id in CONSTANTS:
+            value = CONSTANTS[node.id]
+            return lambda env: value
+        name = node.id
+        return lambda env: env[name]
+
+    if isinstance(node, ast.UnaryOp):
+        op = UNARY_OPS[type(node.op)]
+        operand = _compile_node(node.operand)
+        return lambda env: op(operand(env))
+
+    if isinstance(node, ast.BinOp):
+        op = BINARY_OPS[type(node.op)]
+        left = _compile_node(node.left)
+        right = _compile_node(node.right)
+        return lambda env: op(left(env), right(env))
+
+    # ast.Call - jedyny pozostały węzeł po walidacji
+    func, in_domain = UFUNCS[node.func.id]
+    arg = _compile_node(node.args[0])
+
+    def call(env):
+        u = arg(env)
+        return np.where(in_domain(u), func(u), np.nan)
+    return call
+
+
+def _bind_params(params, param_values, x_arr):
+    """Buduje środowisko obliczeń {x, parametry} z walidacją wartości."""
+    env = {VARIABLE: x_arr}
+    param_values = param_values or {}
+    for name in params:
+        if name not in param_values:
+            raise ValueError(f"Brak wartości parametru {name}")
+        value = float(param_values[name])
+        if not math.isfinite(value):
+            raise ValueError(f"Parametr {name} musi być liczbą skończoną")
+        env[name] = value
+    return env
+
+
+def _finalize(value, shape):
+    """Rozgłasza wynik do kształtu x i zamienia wartości nieskończone na NaN."""
+    result = np.array(np.broadcast_to(value, shape), dtype=float)
+    result[~np.isfinite(result)] = np.nan
+    return result
+
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def _compile_normalized(normalized):
+    """Kompiluje znormalizowane wyrażenie (wynik cache'owany)."""
+    tree = ast.parse(normalized, mode='eval')
+    params = _validate_tree(tree)
+    body = _compile_node(tree.body)
+
+    def evaluate(x_arr, param_values=None):
+        """
+        Oblicza wyrażenie na tablicy x.
+
+        Returns:
+            numpy array tego samego kształtu co x_arr (NaN poza dziedziną)
+
+        Raises:
+            ValueError: brakujący lub nieskończony parametr
+        """
+        x_arr = np.asarray(x_arr, dtype=float)
+        env = _bind_params(params, param_values, x_arr)
+        with np.errstate(all='ignore'):
+            return _finalize(body(env), x_arr.shape)
+
+    return {
+        'source': normalized,
+        'params': params,
+        'tree': tree,
+        'evaluate': evaluate,
+    }
+
+
+def compile_expression(source):
+    """
+    Kompiluje wyrażenie użytkownika do wektorowej funkcji numpy.
+
+    Args:
+        source: formuła w zmiennej x, np. 'a*sin(b*x) + x^2'
+
+    Returns:
+        dict z kluczami:
+            source - postać znormalizowana
+            params - krotka nazw parametrów (posortowana)
+            tree - drzewo ast.Expression
+            evaluate - funkcja (x_arr, params) -> numpy array
+        Zwracany słownik jest współdzielony przez cache - nie modyfikować.
+
+    Raises:
+        ValueError: niepoprawne lub niedozwolone wyrażenie
+    """
+    normalized, _ = normalize_expression(source)
+    return _compile_normalized(normalized)
+
+
+def evaluate_expression(source, x_arr, params=None):
+    """Kompiluje (lub bierze z cache) i oblicza wyrażenie na tablicy x."""
+    return compile_expression(source)['evaluate'](x_arr, params)
+
+
+# --- Różniczkowanie symboliczne ---
+
+def _num(value):
+    return ast.Constant(value=float(value))
+
+
+def _is_num(node, value=None):
+    if not isinstance(node, ast.Constant):
+        return False
+    return value is None or node.value == value
+
+
+def _same(a, b):
+    return ast.dump(a) == ast.dump(b)
+
+
+def _fold(op, a, b):
+    """Zwija działanie na dwóch stałych; None gdy wynik nie jest skończony."""
+    try:
+        value = op(a.value, b.value)
+    except (OverflowError, ZeroDivisionError, ValueError):
+        return None
+    if isinstance(value, complex) or not math.isfinite(value):
+        return None
+    return _num(value)
+
+
+def _neg(a):
+    if _is_num(a):
+        return _num(-a.value)
+    if isinstance(a, ast.UnaryOp) and isinstance(a.op, ast.USub):
+        return a.operand
+    return ast.UnaryOp(op=ast.USub(), operand=a)
+
+
+def _add(a, b):
+    if _is_num(a) and _is_num(b):
+        return _fold(lambda p, q: p + q, a, b) or ast.BinOp(a, ast.Add(), b)
+    if _is_num(a, 0):
+        return b
+    if _is_num(b, 0):
+        return a
+    if isinstance(b, ast.UnaryOp) and isinstance(b.op, ast.USub):
+        return _sub(a, b.operand)
+    if _same(a, b):
+        return _mul(_num(2), a)
+    return ast.BinOp(left=a, op=ast.Add(), right=b)
+
+
+def _sub(a, b):
+    if _is_num(a) and _is_num(b):
+        return _fold(lambda p, q: p - q, a, b) or ast.BinOp(a, ast.Sub(), b)
+    if _is_num(b, 0):
+        return a
+    if _is_num(a, 0):
+        return _neg(b)
+    if _same(a, b):
+        return _num(0)
+    # (u - c1) - c2 -> u - (c1 + c2)
+    if (_is_num(b) and isinstance(a, ast.BinOp) and isinstance(a.op, ast.Sub)
+            and _is_num(a.right)):
+        return _sub(a.left, _num(a.right.value + b.value))
+    return ast.BinOp(left=a, op=ast.Sub(), right=b)
+
+
+def _mul(a, b):
+    if _is_num(a) and _is_num(b):
+        return _fold(lambda p, q: p * q, a, b) or ast.BinOp(a, ast.Mult(), b)
+    # Stała zawsze z lewej strony iloczynu
+    if _is_num(b):
+        a, b = b, a
+    if _is_num(a, 0):
+        return _num(0)
+    if _is_num(a, 1):
+        return b
+    if _is_num(a, -1):
+        return _neg(b)
+    if isinstance(b, ast.UnaryOp) and isinstance(b.op, ast.USub):
+        return _neg(_mul(a, b.operand))
+    if isinstance(a, ast.UnaryOp) and isinstance(a.op, ast.USub):
+        return _neg(_mul(a.operand, b))
+    # c1 * (c2 * u) -> (c1*c2) * u
+    if (_is_num(a) and isinstance(b, ast.BinOp) and isinstance(b.op, ast.Mult)
+            and _is_num(b.left)):
+        return _mul(_mul(a, b.left), b.right)
+    return ast.BinOp(left=a, op=ast.Mult(), right=b)
+
+
+def _div(a, b):
+    if _is_num(a) and _is_num(b) and b.value != 0:
+        return _fold(lambda p, q: p / q, a, b) or ast.BinOp(a, ast.Div(), b)
+    if _is_num(a, 0):
+        return _num(0)
+    if _is_num(b, 1):
+        return a
+    if _same(a, b):
+        # Poza dziedziną u/u i tak maskuje NaN funkcji
+        return _num(1)
+    if isinstance(a, ast.UnaryOp) and isinstance(a.op, ast.USub):
+        return _neg(_div(a.operand, b))
+    return ast.BinOp(left=a, op=ast.Div(), right=b)
+
+
+def _pow(a, b):
+    if _is_num(a) and _is_num(b):
+        folded = _fold(lambda p, q: p ** q, a, b)
+        if folded is not None:
+            return folded
+    if _is_num(b, 0):
+        return _num(1)
+    if _is_num(b, 1):
+        return a
+    # (u^p)^q -> u^(p*q) dla całkowitych stałych p, q
+    if (_is_num(b) and float(b.value).is_integer() and isinstance(a, ast.BinOp)
+            and isinstance(a.op, ast.Pow) and _is_num(a.right)
+            and float(a.right.value).is_integer()):
+        return _pow(a.left, _num(a.right.value * b.value))
+    return ast.BinOp(left=a, op=ast.Pow(), right=b)
+
+
+def _call(name, arg):
+    return ast.Call(func=ast.Name(id=name, ctx=ast.Load()), args=[arg], keywords=[])
+
+
+def _depends_on_x(node):
+    return any(
+        isinstance(n, ast.Name) and n.id == VARIABLE for n in ast.walk(node)
+    )
+
+
+def _derivative_of_call(name, u):
+    """Pochodna zewnętrzna f'(u) dla funkcji z białej listy."""
+    if name == 'sin':
+        return _call('cos', u)
+    if name == 'cos':
+        return _neg(_call('sin', u))
+    if name == 'tan':
+        return _div(_num(1), _pow(_call('cos', u), _num(2)))
+    if name == 'exp':
+        return _call('exp', u)
+    if name in ('ln', 'log'):
+        return _div(_num(1), u)
+    if name == 'log10':
+        return _div(_num(1), _mul(_num(math.log(10)), u))
+    if name == 'sqrt':
+        return _div(_num(1), _mul(_num(2), _call('sqrt', u)))
+    if name == 'abs':
+        # Nieokreślona w u = 0 (0/0 -> NaN)
+        return _div(u, _call('abs', u))
+    if name == 'asin':
+        return _div(_num(1), _call('sqrt', _sub(_num(1), _pow(u, _num(2)))))
+    if name == 'acos':
+        return _neg(_div(_num(1), _call('sqrt', _sub(_num(1), _pow(u, _num(2))))))
+    if name == 'atan':
+        return _div(_num(1), _add(_num(1), _pow(u, _num(2))))
+    if name == 'sinh':
+        return _call('cosh', u)
+    if name == 'cosh':
+        return _call('sinh', u)
+    # tanh
+    return _div(_num(1), _pow(_call('cosh', u), _num(2)))
+
+
+def _tree_size(node, sizes):
+    """
+    Liczba węzłów drzewa jak w ast.walk (wspólne poddrzewa liczone przy
+    każdym wystąpieniu), z pamięcią po id węzła.
+    """
+    entry = sizes.get(id(node))
+    if entry is None:
+        size = 1 + sum(_tree_size(child, sizes) for child in ast.iter_child_nodes(node))
+        # Referencja do węzła chroni id przed ponownym użyciem
+        entry = sizes[id(node)] = (node, size)
+    return entry[1]
+
+
+def _differentiate_node(node, sizes):
+    """
+    Pochodna węzła AST względem x z kontrolą rozmiaru wyniku.
+
+    Raises:
+        ValueError: pochodna przekracza MAX_DERIVATIVE_NODES węzłów
+    """
+    result = _derivative_of_node(node, sizes)
+    if _tree_size(result, sizes) > MAX_DERIVATIVE_NODES:
+        raise ValueError(
+            f"Pochodna jest zbyt złożona (limit {MAX_DERIVATIVE_NODES} węzłów)"
+        )
+    return result
+
+
+def _derivative_of_node(node, sizes):
+    """Pochodna węzła AST względem x (z uproszczeniami)."""
+    if not _depends_on_x(node):
+        return _num(0)
+
+    if isinstance(node, ast.Name):
+        return _num(1)
+
+    if isinstance(node, ast.UnaryOp):
+        du = _differentiate_node(node.operand, sizes)
+        return du if isinstance(node.op, ast.UAdd) else _neg(du)
+
+    if isinstance(node, ast.BinOp):
+        u, v = node.left, node.right
+        du, dv = _differentiate_node(u, sizes), _differentiate_node(v, sizes)
+        if isinstance(node.op, ast.Add):
+            return _add(du, dv)
+        if isinstance(node.op, ast.Sub):
+            return _sub(du, dv)
+        if isinstance(node.op, ast.Mult):
+            return _add(_mul(du, v), _mul(u, dv))
+        if isinstance(node.op, ast.Div):
+            if not _depends_on_x(v):
+                return _div(du, v)
+            return _div(_sub(_mul(du, v), _mul(u, dv)), _pow(v, _num(2)))
+        # ast.Pow
+        if not _depends_on_x(v):
+            # (u^c)' = c * u^(c-1) * u'
+            return _mul(_mul(v, _pow(u, _sub(v, _num(1)))), du)
+        if not _depends_on_x(u):
+            # (c^v)' = c^v * ln(c) * v'
+            return _mul(_mul(node, _call('ln', u)), dv)
+        # (u^v)' = u^v * (v' ln(u) + v u'/u)
+        return _mul(node, _add(_mul(dv, _call('ln', u)), _div(_mul(v, du), u)))
+
+    # ast.Call
+    u = node.args[0]
+    return _mul(_derivative_of_call(node.func.id, u), _differentiate_node(u, sizes))
+
+
+def _derivative_trees(tree, order):
+    """Zwraca listę drzew [f, f', ..., f^(order)]."""
+    if order < 0 or order > MAX_DERIVATIVE_ORDER:
+        raise ValueError(
+            f"Rząd pochodnej musi być z zakresu [0, {MAX_DERIVATIVE_ORDER}]"
+        )
+    trees = [tree.body]
+    sizes = {}
+    for _ in range(order):
+        trees.append(_differentiate_node(trees[-1], sizes))
+    return trees
+
+
+def differentiate(source, order=1):
+    """
+    Zwraca wzór pochodnej rzędu order (postać znormalizowana).
+
+    Raises:
+        ValueError: niepoprawne wyrażenie lub rząd pochodnej
+    """
+    return compile_derivatives(source, order)['derivatives'][-1]
+
+
+# --- Wspólny plan obliczeń (eliminacja wspólnych podwyrażeń) ---
+
+def _build_plan(roots):
+    """
+    Zamienia drzewa na listę instrukcji, w której każde podwyrażenie
+    występuje raz (klucz strukturalny z indeksów argumentów).
+
+    Returns:
+        tuple (instrukcje, indeksy korzeni)
+    """
+    slots = {}
+    instructions = []
+
+    def visit(node):
+        if isinstance(node, ast.Constant):
+            key = ('const', float(node.value))
+        elif isinstance(node, ast.Name):
+            key = ('name', node.id)
+        elif isinstance(node, ast.UnaryOp):
+            key = ('unary', type(node.op), visit(node.operand))
+        elif isinstance(node, ast.BinOp):
+            key = ('binary', type(node.op), visit(node.left), visit(node.right))
+        else:
+            key = ('call', node.func.id, visit(node.args[0]))
+        if key not in slots:
+            slots[key] = len(instructions)
+            instructions.append(key)
+        return slots[key]
+
+    return instructions, [visit(root) for root in roots]
+
+
+def _reachable(instructions, root):
+    """Zbiór slotów potrzebnych do obliczenia korzenia."""
+    seen = set()
+    stack = [root]
+    while stack:
+        slot = stack.pop()
+        if slot in seen:
+            continue
+        seen.add(slot)
+        key = instructions[slot]
+        if key[0] in ('unary', 'call'):
+            stack.append(key[2])
+        elif key[0] == 'binary':
+            stack.extend(key[2:])
+    return seen
+
+
+def _is_zero(value):
+    return np.ndim(value) == 0 and value == 0
+
+
+def _run_plan(instructions, function_slots, env):
+    """
+    Wykonuje plan; każdy slot liczony jest dokładnie raz.
+
+    W iloczynach występujących tylko w pochodnych parametr równy 0
+    zeruje iloczyn (tak jakby był stałą 0 w chwili różniczkowania),
+    np. (x^n)' = n·x^(n-1) dla n = 0 daje 0 również w x = 0.
+    """
+    values = [None] * len(instructions)
+    for slot, key in enumerate(instructions):
+        kind = key[0]
+        if kind == 'const':
+            values[slot] = key[1]
+        elif kind == 'name':
+            values[slot] = CONSTANTS[key[1]] if key[1] in CONSTANTS else env[key[1]]
+        elif kind == 'unary':
+            values[slot] = UNARY_OPS[key[1]](values[key[2]])
+        elif kind == 'binary':
+            left, right = values[key[2]], values[key[3]]
+            if (key[1] is ast.Mult and slot not in function_slots
+                    and (_is_zero(left) or _is_zero(right))):
+                values[slot] = 0.0
+            else:
+                values[slot] = BINARY_OPS[key[1]](left, right)
+        else:
+            func, in_domain = UFUNCS[key[1]]
+            u = values[key[2]]
+            values[slot] = np.where(in_domain(u), func(u), np.nan)
+    return values
+
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def _compile_derivatives_normalized(normalized, order):
+    """Buduje wspólny plan dla f i jej pochodnych (wynik cache'owany)."""
+    compiled = _compile_normalized(normalized)
+    params = compiled['params']
+    trees = _derivative_trees(compiled['tree'], order)
+    instructions, roots = _build_plan(trees)
+    function_slots = frozenset(_reachable(instructions, roots[0]))
+
+    def evaluate(x_arr, param_values=None):
+        """
+        Oblicza f i jej pochodne na tablicy x jednym przebiegiem planu.
+
+        Pochodna jest NaN wszędzie tam, gdzie funkcja (lub pochodna
+        niższego rzędu) nie jest określona.
+
+        Returns:
+            lista numpy array [f, f', ..., f^(order)]
+        """
+        x_arr = np.asarray(x_arr, dtype=float)
+        env = _bind_params(params, param_values, x_arr)
+        with np.errstate(all='ignore'):
+            values = _run_plan(instructions, function_slots, env)
+        results = []
+        for root in roots:
+            result = _finalize(values[root], x_arr.shape)
+            if results:
+                result[np.isnan(results[-1])] = np.nan
+            results.append(result)
+        return results
+
+    return {
+        'source': normalized,
+        'params': params,
+        'derivatives': tuple(ast.unparse(t) for t in trees[1:]),
+        'evaluate': evaluate,
+        'nodes': len(instructions),
+        'tree_nodes': sum(len(list(ast.walk(t))) for t in trees),
+    }
+
+
+def compile_derivatives(source, order=1):
+    """
+    Kompiluje wyrażenie razem z pochodnymi do rzędu order.
+
+    Args:
+        source: formuła w zmiennej x
+        order: najwyższy rząd pochodnej (0..MAX_DERIVATIVE_ORDER)
+
+    Returns:
+        dict z kluczami:
+            source, params - jak w compile_expression
+            derivatives - krotka wzorów f', f'', ... (po uproszczeniu)
+            evaluate - funkcja (x_arr, params) -> [f, f', ..., f^(order)]
+            nodes - liczba węzłów planu po eliminacji wspólnych podwyrażeń
+            tree_nodes - łączna liczba węzłów drzew bez współdzielenia
+
+    Raises:
+        ValueError: niepoprawne wyrażenie lub rząd pochodnej
+    """
+    normalized, _ = normalize_expression(source)
+    return _compile_derivatives_normalized(normalized, int(order))
@@ -3,11 +3,37 @@ Wspólna biblioteka funkcji matematycznych z pochodnymi analitycznymi.
 
 Używana przez function_derivatives i tangent_line.
 Każda funkcja ma konfigurowalne parametry, analityczną pochodną,
-informacje o dziedzinie i zakresie domyślnym.
+informacje o dziedzinie i zakresie domyślnym. Wzory spoza rejestru
+(pole 'expression' w toys) kompiluje compile_custom_function.
+
+Backend obliczeń evaluate_function: 'numpy' (domyślny), 'numexpr' lub
+'numba' - wybierany przez set_backend() albo zmienną środowiskową
+MATH_TOYS_BACKEND. Przyspieszone backendy liczą funkcję jednym
+przebiegiem bez tablic pośrednich; bez zainstalowanego pakietu
+automatycznie używany jest numpy. Pakiety numexpr i numba importowane
+są dopiero przy wyborze backendu.
 """
 
+import importlib
+import importlib.util
+import os
+import warnings
 import numpy as np
 import math
+from functools import lru_cache
+
+from common.expressions import compile_derivatives
+
+
+BACKENDS = ('numpy', 'numexpr', 'numba')
+
+# Największy argument exp() bez przepełnienia float64
+EXP_OVERFLOW_ARG = 709.78
+
+# Wzory użytkownika (compile_custom_function): parametry i zakres domyślny
+CUSTOM_PARAM_DEFAULT = 1.0
+CUSTOM_PARAM_RANGE = (-10, 10)
+CUSTOM_DEFAULT_RANGE = [-10, 10]
 
 
 FUNCTION_REGISTRY = {
@@ -15,6 +41,7 @@ FUNCTION_REGISTRY = {
         'name': 'Liniowa: ax + b',
         'formula': 'f(x) = ax + b',
         'derivative_formula': "f'(x) = a",
+        'expression': 'a*x + b',
         'params': [
             {'id': 'a', 'label': 'a', 'default': 1, 'min': -10, 'max': 10, 'step': 0.1},
             {'id': 'b', 'label': 'b', 'default': 0, 'min': -10, 'max': 10, 'step': 0.1},
@@ -25,6 +52,7 @@ FUNCTION_REGISTRY = {
         'name': 'Kwadratowa: ax\u00b2 + bx + c',
         'formula': 'f(x) = ax\u00b2 + bx + c',
         'derivative_formula': "f'(x) = 2ax + b",
+        'expression': 'a*x^2 + b*x + c',
         'params': [
             {'id': 'a', 'label': 'a', 'default': 1, 'min': -10, 'max': 10, 'step': 0.1},
             {'id': 'b', 'label': 'b', 'default': 0, 'min': -10, 'max': 10, 'step': 0.1},
@@ -36,6 +64,7 @@ FUNCTION_REGISTRY = {
         'name': 'Sześcienne: ax\u00b3 + bx\u00b2 + cx + d',
         'formula': 'f(x) = ax\u00b3 + bx\u00b2 + cx + d',
         'derivative_formula': "f'(x) = 3ax\u00b2 + 2bx + c",
+        'expression': 'a*x^3 + b*x^2 + c*x + d',
         'params': [
             {'id': 'a', 'label': 'a', 'default': 1, 'min': -10, 'max': 10, 'step': 0.1},
             {'id': 'b', 'label': 'b', 'default': 0, 'min': -10, 'max': 10, 'step': 0.1},
@@ -48,6 +77,7 @@ FUNCTION_REGISTRY = {
         'name': 'Sinus: a\u00b7sin(bx + c)',
         'formula': 'f(x) = a\u00b7sin(bx + c)',
         'derivative_formula': "f'(x) = ab\u00b7cos(bx + c)",
+        'expression': 'a*sin(b*x + c)',
         'params': [
             {'id': 'a', 'label': 'a', 'default': 1, 'min': -10, 'max': 10, 'step': 0.1},
             {'id': 'b', 'label': 'b', 'default': 1, 'min': -10, 'max': 10, 'step': 0.1},
@@ -59,6 +89,7 @@ FUNCTION_REGISTRY = {
         'name': 'Cosinus: a\u00b7cos(bx + c)',
         'formula': 'f(x) = a\u00b7cos(bx + c)',
         'derivative_formula': "f'(x) = -ab\u00b7sin(bx + c)",
+        'expression': 'a*cos(b*x + c)',
         'params': [
             {'id': 'a', 'label': 'a', 'default': 1, 'min': -10, 'max': 10, 'step': 0.1},
             {'id': 'b', 'label': 'b', 'default': 1, 'min': -10, 'max': 10, 'step': 0.1},
@@ -70,6 +101,7 @@ FUNCTION_REGISTRY = {
         'name': 'Wykładnicza: a\u00b7e^(bx)',
         'formula': 'f(x) = a\u00b7e^(bx)',
         'derivative_formula': "f'(x) = ab\u00b7e^(bx)",
+        'expression': 'a*exp(b*x)',
         'params': [
             {'id': 'a', 'label': 'a', 'default': 1, 'min': -10, 'max': 10, 'step': 0.1},
             {'id': 'b', 'label': 'b', 'default': 1, 'min': -10, 'max': 10, 'step': 0.1},
@@ -80,6 +112,7 @@ FUNCTION_REGISTRY = {
         'name': 'Logarytm: a\u00b7ln(bx + c)',
         'formula': 'f(x) = a\u00b7ln(bx + c)',
         'derivative_formula': "f'(x) = ab/(bx + c)",
+        'expression': 'a*ln(b*x + c)',
         'params': [
             {'id': 'a', 'label': 'a', 'default': 1, 'min': -10, 'max': 10, 'step': 0.1},
             {'id': 'b', 'label': 'b', 'default': 1, 'min': -10, 'max': 10, 'step': 0.1},
@@ -91,6 +124,7 @@ FUNCTION_REGISTRY = {
         'name': 'Potęgowa: a\u00b7x^n',
         'formula': 'f(x) = a\u00b7x^n',
         'derivative_formula': "f'(x) = a\u00b7n\u00b7x^(n-1)",
+        'expression': 'a*x^n',
         'params': [
             {'id': 'a', 'label': 'a', 'default': 1, 'min': -10, 'max': 10, 'step': 0.1},
             {'id': 'n', 'label': 'n', 'default': 2, 'min': -10, 'max': 10, 'step': 0.5},
@@ -101,6 +135,7 @@ FUNCTION_REGISTRY = {
         'name': 'Pierwiastek: a\u00b7\u221a(bx + c)',
         'formula': 'f(x) = a\u00b7\u221a(bx + c)',
         'derivative_formula': "f'(x) = ab/(2\u221a(bx + c))",
+        'expression': 'a*sqrt(b*x + c)',
         'params': [
             {'id': 'a', 'label': 'a', 'default': 1, 'min': -10, 'max': 10, 'step': 0.1},
             {'id': 'b', 'label': 'b', 'default': 1, 'min': -10, 'max': 10, 'step': 0.1},
@@ -112,6 +147,7 @@ FUNCTION_REGISTRY = {
         'name': 'Tangens: a\u00b7tan(bx + c)',
         'formula': 'f(x) = a\u00b7tan(bx + c)',
         'derivative_formula': "f'(x) = ab/cos\u00b2(bx + c)",
+        'expression': 'a*tan(b*x + c)',
         'params': [
             {'id': 'a', 'label': 'a', 'default': 1, 'min': -10, 'max': 10, 'step': 0.1},
             {'id': 'b', 'label': 'b', 'default': 1, 'min': -10, 'max': 10, 'step': 0.1},
@@ -161,7 +197,215 @@ def resolve_params(func_id, raw_params):
     return result
 
 
-def evaluate_function(func_id, x_arr, params):
+# --- Backendy obliczeń ---
+
+# Wyrażenia numexpr: jeden przebieg bez tablic pośrednich.
+# 'v - v == 0' jest fałszywe dla inf i NaN (maskowanie jak w numpy).
+NUMEXPR_KERNELS = {
+    'linear': 'a*x + b',
+    'quadratic': 'a*x**2 + b*x + c',
+    'cubic': 'a*x**3 + b*x**2 + c*x + d',
+    'sin': 'a*sin(b*x + c)',
+    'cos': 'a*cos(b*x + c)',
+    'exp': 'where(a*exp(b*x) - a*exp(b*x) == 0, a*exp(b*x), nan)',
+    'ln': 'where(b*x + c > 0, a*log(b*x + c), nan)',
+    'sqrt': 'where(b*x + c >= 0, a*sqrt(b*x + c), nan)',
+    'tan': 'where(abs(cos(b*x + c)) < 0.01, nan, a*tan(b*x + c))',
+}
+
+# Potęga: osobne wyrażenie dla wykładnika całkowitego i ułamkowego
+NUMEXPR_POWER_KERNELS = {
+    True: 'a*x**n',
+    False: 'where(x >= 0, a*x**n, nan)',
+}
+
+
+def _linear_kernel(x, out, a, b):
+    for i in range(x.shape[0]):
+        out[i] = a * x[i] + b
+
+
+def _quadratic_kernel(x, out, a, b, c):
+    for i in range(x.shape[0]):
+        xi = x[i]
+        out[i] = (a * xi + b) * xi + c
+
+
+def _cubic_kernel(x, out, a, b, c, d):
+    for i in range(x.shape[0]):
+        xi = x[i]
+        out[i] = ((a * xi + b) * xi + c) * xi + d
+
+
+def _sin_kernel(x, out, a, b, c):
+    for i in range(x.shape[0]):
+        out[i] = a * math.sin(b * x[i] + c)
+
+
+def _cos_kernel(x, out, a, b, c):
+    for i in range(x.shape[0]):
+        out[i] = a * math.cos(b * x[i] + c)
+
+
+def _exp_kernel(x, out, a, b):
+    for i in range(x.shape[0]):
+        arg = b * x[i]
+        # Przepełnienie (inf) jak w numpy zamieniane na NaN
+        value = a * math.exp(arg) if arg < EXP_OVERFLOW_ARG else math.nan
+        out[i] = math.nan if math.isinf(value) else value
+
+
+def _ln_kernel(x, out, a, b, c):
+    for i in range(x.shape[0]):
+        inner = b * x[i] + c
+        out[i] = a * math.log(inner) if inner > 0 else math.nan
+
+
+def _power_kernel(x, out, a, n):
+    n_is_int = n == math.floor(n)
+    for i in range(x.shape[0]):
+        xi = x[i]
+        if n_is_int:
+            if xi == 0 and n < 0:
+                out[i] = a * math.inf
+            else:
+                out[i] = a * xi ** n
+        elif xi >= 0:
+            out[i] = a * xi ** n
+        else:
+            out[i] = math.nan
+
+
+def _sqrt_kernel(x, out, a, b, c):
+    for i in range(x.shape[0]):
+        inner = b * x[i] + c
+        out[i] = a * math.sqrt(inner) if inner >= 0 else math.nan
+
+
+def _tan_kernel(x, out, a, b, c):
+    for i in range(x.shape[0]):
+        arg = b * x[i] + c
+        out[i] = math.nan if abs(math.cos(arg)) < 0.01 else a * math.tan(arg)
+
+
+# Pętle kompilowane przez numba.njit; func_id -> (kernel, kolejność parametrów)
+NUMBA_KERNELS = {
+    'linear': (_linear_kernel, ('a', 'b')),
+    'quadratic': (_quadratic_kernel, ('a', 'b', 'c')),
+    'cubic': (_cubic_kernel, ('a', 'b', 'c', 'd')),
+    'sin': (_sin_kernel, ('a', 'b', 'c')),
+    'cos': (_cos_kernel, ('a', 'b', 'c')),
+    'exp': (_exp_kernel, ('a', 'b')),
+    'ln': (_ln_kernel, ('a', 'b', 'c')),
+    'power': (_power_kernel, ('a', 'n')),
+    'sqrt': (_sqrt_kernel, ('a', 'b', 'c')),
+    'tan': (_tan_kernel, ('a', 'b', 'c')),
+}
+
+
+# Zaimportowane pakiety backendów (None - brak pakietu); numba ma
+# kosztowny start, więc import następuje przy pierwszym wyborze
+_backend_modules = {'numpy': np}
+
+
+def _backend_module(name):
+    """Importuje pakiet backendu przy pierwszym użyciu; None gdy brak."""
+    if name not in _backend_modules:
+        try:
+            _backend_modules[name] = importlib.import_module(name)
+        except ImportError:
+            _backend_modules[name] = None
+    return _backend_modules[name]
+
+
+def _is_installed(name):
+    if name in _backend_modules:
+        return _backend_modules[name] is not None
+    return importlib.util.find_spec(name) is not None
+
+
+def available_backends():
+    """Zwraca krotkę backendów, których pakiety są zainstalowane (bez importu)."""
+    return tuple(name for name in BACKENDS if _is_installed(name))
+
+
+def _resolve_backend(name):
+    """
+    Zwraca backend, który faktycznie zostanie użyty.
+
+    Raises:
+        ValueError: nieznana nazwa backendu
+    """
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Nieznany backend: {name}. Dozwolone: {', '.join(BACKENDS)}"
+        )
+    return name if _backend_module(name) is not None else 'numpy'
+
+
+_backend = 'numpy'
+
+
+def set_backend(name):
+    """
+    Ustawia domyślny backend evaluate_function.
+
+    Returns:
+        str: backend faktycznie używany ('numpy', gdy pakietu brak)
+    """
+    global _backend
+    _backend = _resolve_backend(name)
+    return _backend
+
+
+def get_backend():
+    """Zwraca aktualny domyślny backend."""
+    return _backend
+
+
+def _set_backend_from_env():
+    """
+    Ustawia backend z MATH_TOYS_BACKEND przy imporcie modułu.
+
+    Nieznana nazwa nie może wyłączyć wszystkich toys - zamiast wyjątku
+    ostrzeżenie i numpy.
+    """
+    name = os.environ.get('MATH_TOYS_BACKEND', 'numpy')
+    try:
+        return set_backend(name)
+    except ValueError as e:
+        warnings.warn(f"MATH_TOYS_BACKEND: {e}. Używany jest numpy.", RuntimeWarning)
+        return set_backend('numpy')
+
+
+@lru_cache(maxsize=None)
+def _numba_kernel(func_id):
+    """Kompiluje kernel numba przy pierwszym użyciu."""
+    kernel, _ = NUMBA_KERNELS[func_id]
+    # error_model='numpy': dzielenie przez zero daje inf/NaN, nie wyjątek
+    return _backend_module('numba').njit(error_model='numpy')(kernel)
+
+
+def _evaluate_numexpr(func_id, x_arr, params):
+    if func_id == 'power':
+        n = params['n']
+        expr = NUMEXPR_POWER_KERNELS[n == int(n)]
+    else:
+        expr = NUMEXPR_KERNELS[func_id]
+    local_dict = {key: float(value) for key, value in params.items()}
+    local_dict['x'] = x_arr
+    local_dict['nan'] = np.nan
+    return _backend_module('numexpr').evaluate(expr, local_dict=local_dict)
+
+
+def _evaluate_numba(func_id, x_arr, params):
+    _, param_order = NUMBA_KERNELS[func_id]
+    out = np.empty_like(x_arr)
+    _numba_kernel(func_id)(x_arr, out, *(float(params[p]) for p in param_order))
+    return out
+
+
+def evaluate_function(func_id, x_arr, params, backend=None):
     """
     Oblicza wartości funkcji z zadanymi parametrami.
 
@@ -169,21 +413,36 @@ def evaluate_function(func_id, x_arr, params):
         func_id: klucz z FUNCTION_REGISTRY
         x_arr: numpy array wartości x
         params: dict parametrów (wynik resolve_params)
+        backend: 'numpy', 'numexpr' lub 'numba' (domyślnie get_backend())
 
     Returns:
         numpy array wartości y (NaN poza dziedziną)
     """
+    backend = _backend if backend is None else _resolve_backend(backend)
+    if backend != 'numpy' and func_id in FUNCTION_REGISTRY:
+        x_flat = np.ascontiguousarray(x_arr, dtype=float).ravel()
+        if backend == 'numexpr':
+            result = _evaluate_numexpr(func_id, x_flat, params)
+        else:
+            result = _evaluate_numba(func_id, x_flat, params)
+        return result.reshape(np.shape(x_arr))
+    return _evaluate_numpy(func_id, x_arr, params)
+
+
+def _evaluate_numpy(func_id, x_arr, params):
+    """Oblicza wartości funkcji operacjami numpy (backend domyślny)."""
     with np.errstate(all='ignore'):
         if func_id == 'linear':
             return params['a'] * x_arr + params['b']
 
         elif func_id == 'quadratic':
             a, b, c = params['a'], params['b'], params['c']
-            return a * x_arr**2 + b * x_arr + c
+            # Schemat Hornera: bez potęgowania i z mniejszą liczbą tablic pośrednich
+            return (a * x_arr + b) * x_arr + c
 
         elif func_id == 'cubic':
             a, b, c, d = params['a'], params['b'], params['c'], params['d']
-            return a * x_arr**3 + b * x_arr**2 + c * x_arr + d
+            return ((a * x_arr + b) * x_arr + c) * x_arr + d
 
         elif func_id == 'sin':
             return params['a'] * np.sin(params['b'] * x_arr + params['c'])
@@ -237,6 +496,9 @@ def evaluate_derivative(func_id, x_arr, params):
     """
     Oblicza wartości pochodnej analitycznej z zadanymi parametrami.
 
+    Ręcznie wyprowadzone gałęzie numpy; zgodność z pochodną symboliczną
+    pola 'expression' (common.expressions) sprawdzają testy.
+
     Args:
         func_id: klucz z FUNCTION_REGISTRY
         x_arr: numpy array wartości x
@@ -313,6 +575,69 @@ def evaluate_derivative(func_id, x_arr, params):
     raise ValueError(f"Nieznana funkcja: {func_id}")
 
 
+def _display_expression(source):
+    """Zapis wyrażenia do wyświetlenia: potęga jako '^'."""
+    return source.replace(' ** ', '^')
+
+
+def compile_custom_function(expression, raw_params=None):
+    """
+    Kompiluje wzór wpisany przez użytkownika razem z pierwszą pochodną.
+
+    Wzór przechodzi przez bezpieczny kompilator common.expressions
+    (biała lista nazw, limit węzłów), a f i f' liczone są jednym planem
+    ze wspólnymi podwyrażeniami. Funkcje z FUNCTION_REGISTRY liczone są
+    dalej szybszymi, ręcznie napisanymi wzorami (evaluate_function,
+    evaluate_derivative).
+
+    Args:
+        expression: formuła w zmiennej x, np. 'a*sin(b*x)'
+        raw_params: dict wartości parametrów (brakujące przyjmują
+            CUSTOM_PARAM_DEFAULT)
+
+    Returns:
+        dict z kluczami:
+            formula, derivative_formula - wzory do wyświetlenia
+            params - kompletne wartości parametrów
+            evaluate - funkcja x_arr -> (y, y') (NaN poza dziedziną)
+
+    Raises:
+        ValueError: niepoprawny wzór lub wartość parametru
+    """
+    compiled = compile_derivatives(expression, 1)
+    if raw_params is None:
+        raw_params = {}
+    if not isinstance(raw_params, dict):
+        raise ValueError("Parametry muszą być słownikiem")
+
+    low, high = CUSTOM_PARAM_RANGE
+    params = {}
+    for pid in compiled['params']:
+        if pid in raw_params:
+            try:
+                val = float(raw_params[pid])
+            except (TypeError, ValueError):
+                raise ValueError(f"Parametr {pid} musi być liczbą")
+            if math.isnan(val) or math.isinf(val):
+                raise ValueError(f"Parametr {pid} musi być liczbą skończoną")
+            if val < low or val > high:
+                raise ValueError(f"Parametr {pid} musi być z zakresu [{low}, {high}]")
+            params[pid] = val
+        else:
+            params[pid] = CUSTOM_PARAM_DEFAULT
+
+    def evaluate(x_arr):
+        y, dy = compiled['evaluate'](x_arr, params)
+        return y, dy
+
+    return {
+        'formula': 'f(x) = ' + _display_expression(compiled['source']),
+        'derivative_formula': "f'(x) = " + _display_expression(compiled['derivatives'][0]),
+        'params': params,
+        'evaluate': evaluate,
+    }
+
+
 def get_all_functions():
     """
     Zwraca metadane wszystkich dostępnych funkcji.
@@ -330,3 +655,6 @@ def get_all_functions():
             'default_range': info['default_range'],
         }
     return result
+
+
+_set_backend_from_env()
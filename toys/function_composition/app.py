@@ -11,6 +11,7 @@ import numpy as np
 import math
 import os
 import sys
+from functools import lru_cache, partial
 
 from common.flask_app import register_common_static
 
@@ -35,6 +36,7 @@ register_common_static(app, bundle_dir if getattr(sys, 'frozen', False) else Non
 FUNCTIONS = {
     'shift': {
         'name': 't + a',
+        'derivative_name': '1',
         'description': 'Przesunięcie o a',
         'has_param': True,
         'param_label': 'przesunięcie',
@@ -45,6 +47,7 @@ FUNCTIONS = {
     },
     'scale': {
         'name': 'a \u00b7 t',
+        'derivative_name': 'a',
         'description': 'Skalowanie przez a',
         'has_param': True,
         'param_label': 'wspolczynnik',
@@ -55,6 +58,7 @@ FUNCTIONS = {
     },
     'power': {
         'name': 't^a',
+        'derivative_name': 'a\u00b7t^(a-1)',
         'description': 'Potęga a (t >= 0 dla niecałkowitych)',
         'has_param': True,
         'param_label': 'wykładnik',
@@ -63,6 +67,7 @@ FUNCTIONS = {
     },
     'sin': {
         'name': 'sin(a\u00b7t)',
+        'derivative_name': 'a\u00b7cos(a\u00b7t)',
         'description': 'Sinus z częstotliwością a',
         'has_param': True,
         'param_label': 'częstotliwość',
@@ -73,6 +78,7 @@ FUNCTIONS = {
     },
     'cos': {
         'name': 'cos(a\u00b7t)',
+        'derivative_name': '-a\u00b7sin(a\u00b7t)',
         'description': 'Cosinus z częstotliwością a',
         'has_param': True,
         'param_label': 'częstotliwość',
@@ -83,6 +89,7 @@ FUNCTIONS = {
     },
     'exp': {
         'name': 'e^(a\u00b7t)',
+        'derivative_name': 'a\u00b7e^(a\u00b7t)',
         'description': 'Eksponenta ze współczynnikiem a',
         'has_param': True,
         'param_label': 'współczynnik',
@@ -93,12 +100,14 @@ FUNCTIONS = {
     },
     'abs': {
         'name': '|t|',
+        'derivative_name': 'sgn(t)',
         'description': 'Wartość bezwzględna',
         'has_param': False,
         'param_default': None,
     },
     'ln': {
         'name': 'ln(t)',
+        'derivative_name': '1/t',
         'description': 'Logarytm naturalny (t > 0)',
         'has_param': False,
         'param_default': None,
@@ -106,6 +115,26 @@ FUNCTIONS = {
 }
 
 
+MAX_CHAIN_LENGTH = 8
+MAX_HEATMAP_STEPS = 200
+
+# Iteracja punktu stałego x_{k+1} = f(g(x_k))
+MAX_SEEDS = 100000
+MAX_ITERATIONS = 1000
+MAX_ORBITS = 20
+MAX_ORBIT_LENGTH = 200
+DIVERGENCE_BOUND = 1e6
+
+# Klasyfikacja zbiorów przyciągania (dla punktów niezbieżnych)
+BASIN_DIVERGED = -1
+BASIN_UNDEFINED = -2
+BASIN_UNDECIDED = -3
+NUM_POINTS = 500
+X_RANGE = [-5, 5]
+
+SUBSCRIPT_DIGITS = str.maketrans('0123456789', '\u2080\u2081\u2082\u2083\u2084\u2085\u2086\u2087\u2088\u2089')
+
+
 def _evaluate_func(func_id, param, t_arr):
     """Oblicza wartości funkcji na tablicy numpy."""
     with np.errstate(all='ignore'):
@@ -152,113 +181,597 @@ def _evaluate_func(func_id, param, t_arr):
     raise ValueError(f"Nieznana funkcja: {func_id}")
 
 
-def _evaluate_single(func_id, param, t):
-    """Oblicza wartość funkcji w jednym punkcie."""
-    arr = np.array([float(t)])
-    result = _evaluate_func(func_id, param, arr)
-    val = float(result[0])
+def _evaluate_derivative(func_id, param, t_arr, y_arr):
+    """
+    Oblicza analityczną pochodną funkcji na tablicy numpy.
+
+    Korzysta z już obliczonych wartości y_arr = f(t_arr) (dziedzina,
+    a dla exp i power także sama wartość pochodnej), więc nie wymaga
+    ponownego obliczania f.
+    """
+    with np.errstate(all='ignore'):
+        defined = np.isfinite(y_arr)
+        if func_id == 'shift':
+            result = np.ones_like(t_arr, dtype=float)
+        elif func_id == 'scale':
+            result = np.full_like(t_arr, param, dtype=float)
+        elif func_id == 'power':
+            # (t^a)' = a·t^a / t dla t != 0; w t = 0 pochodna 0 (a > 1), 1 (a = 1)
+            at_zero = 0.0 if param > 1 else (1.0 if param == 1 else np.nan)
+            result = np.where(t_arr != 0, param * y_arr / t_arr, at_zero)
+        elif func_id == 'sin':
+            result = param * np.cos(param * t_arr)
+        elif func_id == 'cos':
+            result = -param * np.sin(param * t_arr)
+        elif func_id == 'exp':
+            result = param * y_arr
+        elif func_id == 'abs':
+            # |t| nie jest różniczkowalna w 0
+            result = np.where(t_arr != 0, np.sign(t_arr), np.nan)
+        elif func_id == 'ln':
+            result = 1.0 / t_arr
+        else:
+            raise ValueError(f"Nieznana funkcja: {func_id}")
+        return np.where(defined & np.isfinite(result), result, np.nan)
+
+
+def _param_grid(func_id, steps=None):
+    """
+    Wartości parametru funkcji do przeglądu (param_values lub siatka min..max).
+
+    steps - opcjonalna liczba punktów siatki zamiast param_step.
+    Funkcje bez parametru zwracają [None].
+    """
+    info = FUNCTIONS[func_id]
+    if not info.get('has_param'):
+        return np.array([None], dtype=object)
+    if 'param_values' in info:
+        return np.array(info['param_values'], dtype=float)
+    lo, hi = info['param_min'], info['param_max']
+    if steps is not None:
+        return np.linspace(lo, hi, steps)
+    count = int(round((hi - lo) / info['param_step'])) + 1
+    return np.round(np.linspace(lo, hi, count), 10)
+
+
+def _evaluate_func_grid(func_id, params, t_arr):
+    """
+    Oblicza funkcję dla wektora parametrów z broadcastingiem.
+
+    Wynik ma kształt (len(params),) + t_arr.shape. Gałęzie potęgi zależą
+    od wartości wykładnika, więc dla 'power' liczone są wiersze per parametr.
+    """
+    if params[0] is None:
+        return _evaluate_func(func_id, None, np.asarray(t_arr, dtype=float))[None, ...]
+    t_arr = np.asarray(t_arr, dtype=float)
+    if func_id == 'power':
+        return np.stack([_evaluate_func(func_id, p, t_arr) for p in params])
+    param_col = params.reshape((-1,) + (1,) * t_arr.ndim)
+    return _evaluate_func(func_id, param_col, np.broadcast_to(t_arr, (len(params),) + t_arr.shape))
+
+
+def _finite_or_none(val):
+    """Zwraca float lub None dla NaN/Inf (wartość niezdefiniowana)."""
+    val = float(val)
     if math.isnan(val) or math.isinf(val):
         return None
     return val
 
 
-def _make_label(func_id, param):
-    """Generuje czytelną etykietę funkcji."""
-    if func_id == 'shift':
-        if param == 0:
-            return 't'
-        sign = '+' if param > 0 else '-'
-        return f't {sign} {abs(param):g}'
-    elif func_id == 'scale':
-        if param == 1:
-            return 't'
-        if param == -1:
-            return '-t'
-        return f'{param:g}\u00b7t'
-    elif func_id == 'power':
-        if param == 0.5:
-            return '\u221at'
-        if param == -1:
-            return '1/t'
-        if param == -2:
-            return '1/t\u00b2'
-        if param == 1:
-            return 't'
-        if param == 2:
-            return 't\u00b2'
-        if param == 3:
-            return 't\u00b3'
-        return f't^{param:g}'
-    elif func_id == 'sin':
-        if param == 1:
-            return 'sin(t)'
-        return f'sin({param:g}\u00b7t)'
-    elif func_id == 'cos':
-        if param == 1:
-            return 'cos(t)'
-        return f'cos({param:g}\u00b7t)'
-    elif func_id == 'exp':
-        if param == 1:
-            return 'e\u1d57'
-        if param == -1:
-            return 'e\u207b\u1d57'
-        return f'e^({param:g}\u00b7t)'
-    elif func_id == 'abs':
-        return '|t|'
-    elif func_id == 'ln':
-        return 'ln(t)'
-    return func_id
+def _evaluate_plan(nodes, t_arr):
+    """
+    Oblicza graf wyrażeń, każdy unikalny węzeł (func, param, wejście) raz.
+
+    Węzły identyczne strukturalnie (np. f(x) i g(x) gdy f = g) dzielą
+    jedną tablicę wyników.
+
+    Args:
+        nodes: dict nazwa -> (func_id, param, nazwa wejścia), w kolejności
+            topologicznej; wejście 'x' oznacza t_arr
+        t_arr: tablica numpy argumentów
+
+    Returns:
+        dict nazwa -> tablica numpy wartości węzła
+    """
+    keys = {'x': ('x',)}
+    memo = {keys['x']: t_arr}
+    values = {}
+    for name, (func_id, param, source) in nodes.items():
+        key = (func_id, param, keys[source])
+        if key not in memo:
+            memo[key] = _evaluate_func(func_id, param, memo[keys[source]])
+        keys[name] = key
+        values[name] = memo[key]
+    return values
+
+
+# --- Arytmetyka przedziałowa: dokładna dziedzina i zbiór wartości złożeń ---
+#
+# Przedział to krotka (lo, hi, lo_closed, hi_closed), zbiór przedziałów to
+# posortowana lista rozłącznych przedziałów. Każda funkcja dzielona jest na
+# kawałki monotoniczności (w granicach swojej dziedziny z _evaluate_func),
+# na których obraz i przeciwobraz liczone są z wartości w końcach kawałka
+# i funkcji odwrotnej.
+
+EXP_MAX_ARG = math.log(sys.float_info.max)
+MAX_MONOTONE_PIECES = 2000
+MIN_POINTS_PER_INTERVAL = 5
+
+
+class _IntervalOverflow(Exception):
+    """Zbyt wiele kawałków monotoniczności (np. sin na przedziale nieograniczonym)."""
+
+
+def _is_odd_int(param):
+    return param == int(param) and int(param) % 2 != 0
+
+
+def _interval_empty(iv):
+    lo, hi, lo_closed, hi_closed = iv
+    return lo > hi or (lo == hi and not (lo_closed and hi_closed))
+
+
+def _normalize_intervals(intervals):
+    """Sortuje przedziały, usuwa puste i scala nachodzące na siebie."""
+    items = sorted(
+        (iv for iv in intervals if not _interval_empty(iv)),
+        key=lambda iv: (iv[0], not iv[2]),
+    )
+    merged = []
+    for lo, hi, lo_closed, hi_closed in items:
+        if merged:
+            m_lo, m_hi, m_lo_closed, m_hi_closed = merged[-1]
+            if lo < m_hi or (lo == m_hi and (m_hi_closed or lo_closed)):
+                if hi > m_hi:
+                    merged[-1] = (m_lo, hi, m_lo_closed, hi_closed)
+                elif hi == m_hi:
+                    merged[-1] = (m_lo, hi, m_lo_closed, m_hi_closed or hi_closed)
+                continue
+        merged.append((lo, hi, lo_closed, hi_closed))
+    return merged
+
+
+def _intersect_intervals(a_set, b_set):
+    """Przecięcie dwóch zbiorów przedziałów."""
+    result = []
+    for a_lo, a_hi, a_lo_closed, a_hi_closed in a_set:
+        for b_lo, b_hi, b_lo_closed, b_hi_closed in b_set:
+            if a_lo != b_lo:
+                lo, lo_closed = max((a_lo, a_lo_closed), (b_lo, b_lo_closed))
+            else:
+                lo, lo_closed = a_lo, a_lo_closed and b_lo_closed
+            if a_hi != b_hi:
+                hi, hi_closed = min((a_hi, a_hi_closed), (b_hi, b_hi_closed))
+            else:
+                hi, hi_closed = a_hi, a_hi_closed and b_hi_closed
+            result.append((lo, hi, lo_closed, hi_closed))
+    return _normalize_intervals(result)
+
+
+def _contains(interval_set, value):
+    for lo, hi, lo_closed, hi_closed in interval_set:
+        if (lo < value or (lo == value and lo_closed)) and \
+                (value < hi or (value == hi and hi_closed)):
+            return True
+    return False
+
+
+def _natural_domain(func_id, param):
+    """Dziedzina funkcji zgodna z _evaluate_func (gdzie wynik jest skończony)."""
+    inf = math.inf
+    if func_id == 'exp' and param != 0:
+        bound = EXP_MAX_ARG / param
+        if param > 0:
+            return [(-inf, bound, False, False)]
+        return [(bound, inf, False, False)]
+    if func_id == 'ln':
+        return [(0.0, inf, False, False)]
+    if func_id == 'power':
+        if _is_odd_int(param) and param > 0:
+            return [(-inf, inf, False, False)]
+        if param < 0:
+            return [(-inf, 0.0, False, False), (0.0, inf, False, False)]
+        return [(0.0, inf, True, False)]
+    return [(-inf, inf, False, False)]
+
+
+def _breakpoints(func_id, param, lo, hi):
+    """Punkty zmiany monotoniczności funkcji wewnątrz (lo, hi)."""
+    if func_id in ('abs', 'power'):
+        return [0.0] if lo < 0 < hi else []
+    if func_id in ('sin', 'cos') and param != 0:
+        if not (math.isfinite(lo) and math.isfinite(hi)):
+            raise _IntervalOverflow()
+        offset = math.pi / 2 if func_id == 'sin' else 0.0
+        u_lo, u_hi = sorted((param * lo, param * hi))
+        k_min = math.ceil((u_lo - offset) / math.pi)
+        k_max = math.floor((u_hi - offset) / math.pi)
+        if k_max - k_min > MAX_MONOTONE_PIECES:
+            raise _IntervalOverflow()
+        cuts = sorted((offset + k * math.pi) / param for k in range(k_min, k_max + 1))
+        return [c for c in cuts if lo < c < hi]
+    return []
+
+
+def _monotone_pieces(func_id, param, interval_set):
+    """
+    Dzieli zbiór przedziałów (przecięty z dziedziną) na kawałki monotoniczności.
+
+    Returns:
+        lista (lo, hi, lo_closed, hi_closed, side), side - znak t wewnątrz kawałka
+    """
+    pieces = []
+    for lo, hi, lo_closed, hi_closed in _intersect_intervals(
+            interval_set, _natural_domain(func_id, param)):
+        bounds = [lo] + _breakpoints(func_id, param, lo, hi) + [hi]
+        last = len(bounds) - 2
+        for i in range(last + 1):
+            p_lo, p_hi = bounds[i], bounds[i + 1]
+            side = -1 if p_hi <= 0 and p_lo < 0 else 1
+            pieces.append((p_lo, p_hi,
+                           lo_closed if i == 0 else True,
+                           hi_closed if i == last else True,
+                           side))
+    return pieces
+
+
+def _end_value(func_id, param, t, side):
+    """Wartość (lub granica) funkcji w końcu kawałka monotoniczności."""
+    with np.errstate(all='ignore'):
+        if func_id == 'shift':
+            return t + param
+        elif func_id == 'scale':
+            return 0.0 if param == 0 else param * t
+        elif func_id == 'power':
+            if param == 0:
+                return 1.0
+            factor = side if _is_odd_int(param) else 1
+            return factor * float(np.power(abs(t), float(param)))
+        elif func_id == 'sin':
+            return math.sin(param * t)
+        elif func_id == 'cos':
+            return math.cos(param * t)
+        elif func_id == 'exp':
+            return 1.0 if param == 0 else float(np.exp(param * t))
+        elif func_id == 'abs':
+            return abs(t)
+        elif func_id == 'ln':
+            return float(np.log(t))
+    raise ValueError(f"Nieznana funkcja: {func_id}")
+
+
+def _inverse_value(func_id, param, y, piece):
+    """Argument t z kawałka monotoniczności, dla którego f(t) = y."""
+    lo, hi, _, _, side = piece
+    with np.errstate(all='ignore'):
+        if func_id == 'shift':
+            t = y - param
+        elif func_id == 'scale':
+            t = y / param
+        elif func_id == 'power':
+            t = side * float(np.power(abs(y), 1.0 / param))
+        elif func_id == 'sin':
+            k = round(param * (lo + hi) / 2 / math.pi)
+            u = k * math.pi + math.asin((-1) ** k * min(max(y, -1.0), 1.0))
+            t = u / param
+        elif func_id == 'cos':
+            k = math.floor(param * (lo + hi) / 2 / math.pi)
+            u = k * math.pi + math.acos((-1) ** k * min(max(y, -1.0), 1.0))
+            t = u / param
+        elif func_id == 'exp':
+            t = float(np.log(y)) / param
+        elif func_id == 'abs':
+            t = side * y
+        elif func_id == 'ln':
+            t = float(np.exp(y))
+        else:
+            raise ValueError(f"Nieznana funkcja: {func_id}")
+    return min(max(t, lo), hi)
+
+
+def _image(func_id, param, interval_set):
+    """Zbiór wartości funkcji na zbiorze przedziałów."""
+    if func_id in ('sin', 'cos') and any(
+            abs(param) * (hi - lo) >= 2 * math.pi for lo, hi, _, _ in interval_set):
+        # Przedział dłuższy niż okres - pełny zbiór wartości
+        return [(-1.0, 1.0, True, True)]
+    result = []
+    for piece in _monotone_pieces(func_id, param, interval_set):
+        lo, hi, lo_closed, hi_closed, side = piece
+        f_lo = _end_value(func_id, param, lo, side)
+        f_hi = _end_value(func_id, param, hi, side)
+        if f_lo == f_hi:
+            # Kawałek stały (np. scale z param = 0) - wartość przyjmowana
+            # wewnątrz przedziału niezależnie od domknięcia końców
+            if math.isfinite(f_lo) and (lo < hi or (lo_closed and hi_closed)):
+                result.append((f_lo, f_lo, True, True))
+        elif f_lo < f_hi:
+            result.append((f_lo, f_hi, lo_closed and math.isfinite(f_lo),
+                           hi_closed and math.isfinite(f_hi)))
+        else:
+            result.append((f_hi, f_lo, hi_closed and math.isfinite(f_hi),
+                           lo_closed and math.isfinite(f_lo)))
+    return _normalize_intervals(result)
+
+
+def _preimage(func_id, param, target_set, interval_set):
+    """Argumenty z interval_set, dla których wartość funkcji należy do target_set."""
+    result = []
+    for piece in _monotone_pieces(func_id, param, interval_set):
+        lo, hi, lo_closed, hi_closed, side = piece
+        f_lo = _end_value(func_id, param, lo, side)
+        f_hi = _end_value(func_id, param, hi, side)
+        if f_lo == f_hi:
+            # Kawałek stały
+            if _contains(target_set, f_lo):
+                result.append((lo, hi, lo_closed, hi_closed))
+            continue
+
+        increasing = f_lo < f_hi
+        if increasing:
+            piece_image = [(f_lo, f_hi, lo_closed, hi_closed)]
+        else:
+            piece_image = [(f_hi, f_lo, hi_closed, lo_closed)]
+
+        def to_arg(y):
+            if y == f_lo:
+                return lo
+            if y == f_hi:
+                return hi
+            return _inverse_value(func_id, param, y, piece)
+
+        for y_lo, y_hi, y_lo_closed, y_hi_closed in _intersect_intervals(target_set, piece_image):
+            t_a, t_b = to_arg(y_lo), to_arg(y_hi)
+            if increasing:
+                result.append((t_a, t_b, y_lo_closed, y_hi_closed))
+            else:
+                result.append((t_b, t_a, y_hi_closed, y_lo_closed))
+    return _normalize_intervals(result)
+
+
+def _composition_domain(stages, x_set):
+    """
+    Dokładna dziedzina i zbiór wartości złożenia stages (kolejność stosowania).
+
+    Dla kolejnych etapów: dopuszczalne wartości etapu k (przecięcie obrazu
+    prefiksu z dziedziną f_k) przenoszone są przeciwobrazami z powrotem
+    na oś x.
+
+    Returns:
+        tuple (dziedzina, zbiór wartości) lub (None, None), gdy analiza
+        przekracza MAX_MONOTONE_PIECES
+    """
+    try:
+        domain = x_set
+        for k, (func_id, param) in enumerate(stages):
+            inputs = [domain]
+            for prev_id, prev_param in stages[:k]:
+                inputs.append(_image(prev_id, prev_param, inputs[-1]))
+            allowed = _intersect_intervals(inputs[-1], _natural_domain(func_id, param))
+            for j in range(k - 1, -1, -1):
+                prev_id, prev_param = stages[j]
+                allowed = _preimage(prev_id, prev_param, allowed, inputs[j])
+            domain = allowed
+
+        value_set = domain
+        for func_id, param in stages:
+            value_set = _image(func_id, param, value_set)
+        return domain, value_set
+    except _IntervalOverflow:
+        return None, None
+
+
+def _format_number(v):
+    if v == math.inf:
+        return '∞'
+    if v == -math.inf:
+        return '-∞'
+    return f'{v + 0.0:.4g}'
+
+
+def _format_interval_set(interval_set):
+    """Formatuje zbiór przedziałów, np. '[-5, -1) ∪ (1, 5]'."""
+    if interval_set is None:
+        return None
+    if not interval_set:
+        return '∅'
+    parts = []
+    for lo, hi, lo_closed, hi_closed in interval_set:
+        if lo == hi:
+            parts.append(f'{{{_format_number(lo)}}}')
+        else:
+            parts.append(
+                f"{'[' if lo_closed else '('}{_format_number(lo)}, "
+                f"{_format_number(hi)}{']' if hi_closed else ')'}"
+            )
+    return ' ∪ '.join(parts)
+
+
+def _interval_mask(arr, iv):
+    """Maska punktów tablicy należących do przedziału."""
+    lo, hi, lo_closed, hi_closed = iv
+    above = arr >= lo if lo_closed else arr > lo
+    below = arr <= hi if hi_closed else arr < hi
+    return above & below
+
+
+def _domain_grid(domain_sets, n):
+    """
+    Siatka x rozłożona tylko na dziedzinach krzywych.
+
+    Punkty przydzielane są przedziałom sumy dziedzin proporcjonalnie do
+    długości; między przedziałami wstawiany jest punkt przerwy (NaN dla
+    wszystkich krzywych). Wąskie przedziały dziedziny dostają co najmniej
+    MIN_POINTS_PER_INTERVAL punktów. Gdy dziedzina nie jest znana
+    (None), zwraca zwykłą siatkę równomierną.
+    """
+    if any(s is None for s in domain_sets):
+        return np.linspace(X_RANGE[0], X_RANGE[1], n)
+
+    full = [(float(X_RANGE[0]), float(X_RANGE[1]), True, True)]
+    union = _normalize_intervals([iv for s in domain_sets for iv in s])
+    total = sum(hi - lo for lo, hi, _, _ in union)
+    step = (X_RANGE[1] - X_RANGE[0]) / n if total == 0 else total / n
+
+    def sample(iv, count):
+        lo, hi, lo_closed, hi_closed = iv
+        if lo == hi:
+            return np.array([lo])
+        nudge = min(step / 2, (hi - lo) / 4)
+        return np.linspace(lo if lo_closed else lo + nudge,
+                           hi if hi_closed else hi - nudge, count)
+
+    if union == full or total == 0:
+        grid = np.linspace(X_RANGE[0], X_RANGE[1], n)
+    else:
+        parts = []
+        for i, iv in enumerate(union):
+            if i > 0:
+                parts.append(np.array([(union[i - 1][1] + iv[0]) / 2]))
+            count = max(MIN_POINTS_PER_INTERVAL, int(round(n * (iv[1] - iv[0]) / total)))
+            parts.append(sample(iv, count))
+        grid = np.concatenate(parts)
+
+    # Zagęszczenie wąskich przedziałów poszczególnych dziedzin
+    extra = [
+        sample(iv, MIN_POINTS_PER_INTERVAL)
+        for domain in domain_sets
+        for iv in domain
+        if np.count_nonzero(_interval_mask(grid, iv)) < MIN_POINTS_PER_INTERVAL
+    ]
+    if extra:
+        grid = np.unique(np.concatenate([grid] + extra))
+    return grid
+
+
+# Szablony etykiet: func_id -> rodzaj -> (szablony specjalne per parametr, domyślny)
+# Pola: {v} - zmienna lub wyrażenie wewnętrzne, {sup} - zmienna w indeksie
+# górnym, {p} / {ap} / {sign} - parametr, |parametr| i jego znak,
+# {iv} / {ov} - wejście i wyjście kroku pipeline.
+LABEL_TEMPLATES = {
+    'shift': {
+        'label': ({0: '{v}'}, '{v} {sign} {ap}'),
+        'compose': ({0: '{v}'}, '({v}) {sign} {ap}'),
+        'detail': ({}, '{iv} + {p} = {ov}'),
+    },
+    'scale': {
+        'label': ({1: '{v}', -1: '-{v}'}, '{p}\u00b7{v}'),
+        'compose': ({1: '{v}', -1: '-({v})'}, '{p}\u00b7({v})'),
+        'detail': ({}, '{p} \u00b7 {iv} = {ov}'),
+    },
+    'power': {
+        'label': ({
+            0.5: '\u221a{v}', -1: '1/{v}', -2: '1/{v}\u00b2',
+            1: '{v}', 2: '{v}\u00b2', 3: '{v}\u00b3',
+        }, '{v}^{p}'),
+        'compose': ({
+            0.5: '\u221a({v})', 1: '{v}', 2: '({v})\u00b2', 3: '({v})\u00b3',
+            -1: '1/({v})', -2: '1/({v})\u00b2',
+        }, '({v})^{p}'),
+        'detail': ({
+            2: '{iv}\u00b2 = {ov}', 3: '{iv}\u00b3 = {ov}',
+            0.5: '\u221a{iv} = {ov}', -1: '1/{iv} = {ov}',
+        }, '{iv}^{p} = {ov}'),
+    },
+    'sin': {
+        'label': ({1: 'sin({v})'}, 'sin({p}\u00b7{v})'),
+        'compose': ({1: 'sin({v})'}, 'sin({p}\u00b7({v}))'),
+        'detail': ({1: 'sin({iv}) = {ov}'}, 'sin({p}\u00b7{iv}) = {ov}'),
+    },
+    'cos': {
+        'label': ({1: 'cos({v})'}, 'cos({p}\u00b7{v})'),
+        'compose': ({1: 'cos({v})'}, 'cos({p}\u00b7({v}))'),
+        'detail': ({1: 'cos({iv}) = {ov}'}, 'cos({p}\u00b7{iv}) = {ov}'),
+    },
+    'exp': {
+        'label': ({1: 'e{sup}', -1: 'e\u207b{sup}'}, 'e^({p}\u00b7{v})'),
+        'compose': ({1: 'e^({v})'}, 'e^({p}\u00b7({v}))'),
+        'detail': ({1: 'e^{iv} = {ov}'}, 'e^({p}\u00b7{iv}) = {ov}'),
+    },
+    'abs': {
+        'label': ({}, '|{v}|'),
+        'compose': ({}, '|{v}|'),
+        'detail': ({}, '|{iv}| = {ov}'),
+    },
+    'ln': {
+        'label': ({}, 'ln({v})'),
+        'compose': ({}, 'ln({v})'),
+        'detail': ({}, 'ln({iv}) = {ov}'),
+    },
+}
+
+# Szablony dla nieznanych funkcji
+FALLBACK_TEMPLATES = {
+    'label': ({}, '{name}'),
+    'compose': ({}, 'f({v})'),
+    'detail': ({}, '{ov}'),
+}
+
+# Zmienne w indeksie górnym (e^t -> eᵗ)
+SUPERSCRIPT_VARS = {'t': '\u1d57', 'x': '\u02e3'}
+
+
+def _compile_templates(templates):
+    """
+    Kompiluje szablony do metod str.format (raz, przy imporcie modułu).
+
+    Returns:
+        dict (func_id, rodzaj) -> (dict parametr -> format, format domyślny)
+    """
+    compiled = {}
+    for func_id, kinds in templates.items():
+        for kind, (special, default) in kinds.items():
+            compiled[(func_id, kind)] = (
+                {param: tpl.format for param, tpl in special.items()},
+                default.format,
+            )
+    return compiled
+
+
+_COMPILED_TEMPLATES = _compile_templates(LABEL_TEMPLATES)
+_COMPILED_FALLBACK = {
+    kind: ({}, default.format) for kind, (_, default) in FALLBACK_TEMPLATES.items()
+}
+
+
+def _formatter(kind, func_id, param):
+    """
+    Zwraca funkcję formatującą z podstawionym parametrem.
+
+    Bez własnej pamięci podręcznej - param pochodzi od klienta, a wyniki
+    i tak zapamiętują ograniczone cache _make_label / _make_composition_label.
+    """
+    special, default = _COMPILED_TEMPLATES.get(
+        (func_id, kind), _COMPILED_FALLBACK[kind]
+    )
+    fmt = special.get(param, default) if param is not None else default
+    if param is None:
+        return partial(fmt, name=func_id)
+    return partial(
+        fmt,
+        name=func_id,
+        p=f'{param:g}',
+        ap=f'{abs(param):g}',
+        sign='+' if param > 0 else '-',
+    )
+
+
+@lru_cache(maxsize=1024)
+def _make_label(func_id, param, var='t'):
+    """Generuje czytelną etykietę funkcji w zmiennej var."""
+    sup = SUPERSCRIPT_VARS.get(var, f'^{var}')
+    return _formatter('label', func_id, param)(v=var, sup=sup)
 
 
+@lru_cache(maxsize=1024)
 def _make_composition_label(f_id, f_param, g_id, g_param):
     """Generuje etykietę złożenia f(g(x))."""
-    g_label = _make_label(g_id, g_param)
-    # Zastap t przez x w etykiecie g
-    g_of_x = g_label.replace('t', 'x')
-
-    # Buduj f(g(x)) - zastap t w f przez wyrazenie g(x)
-    if f_id == 'shift':
-        if f_param == 0:
-            return g_of_x
-        sign = '+' if f_param > 0 else '-'
-        return f'({g_of_x}) {sign} {abs(f_param):g}'
-    elif f_id == 'scale':
-        if f_param == 1:
-            return g_of_x
-        if f_param == -1:
-            return f'-({g_of_x})'
-        return f'{f_param:g}\u00b7({g_of_x})'
-    elif f_id == 'power':
-        if f_param == 0.5:
-            return f'\u221a({g_of_x})'
-        if f_param == 1:
-            return g_of_x
-        if f_param == 2:
-            return f'({g_of_x})\u00b2'
-        if f_param == 3:
-            return f'({g_of_x})\u00b3'
-        if f_param == -1:
-            return f'1/({g_of_x})'
-        if f_param == -2:
-            return f'1/({g_of_x})\u00b2'
-        return f'({g_of_x})^{f_param:g}'
-    elif f_id == 'sin':
-        if f_param == 1:
-            return f'sin({g_of_x})'
-        return f'sin({f_param:g}\u00b7({g_of_x}))'
-    elif f_id == 'cos':
-        if f_param == 1:
-            return f'cos({g_of_x})'
-        return f'cos({f_param:g}\u00b7({g_of_x}))'
-    elif f_id == 'exp':
-        if f_param == 1:
-            return f'e^({g_of_x})'
-        return f'e^({f_param:g}\u00b7({g_of_x}))'
-    elif f_id == 'abs':
-        return f'|{g_of_x}|'
-    elif f_id == 'ln':
-        return f'ln({g_of_x})'
-    return f'f({g_of_x})'
+    return _compose_label(f_id, f_param, _make_label(g_id, g_param, 'x'))
+
+
+def _compose_label(f_id, f_param, g_of_x):
+    """Generuje etykietę f(wyrażenie) - podstawia g_of_x za zmienną f."""
+    return _formatter('compose', f_id, f_param)(v=g_of_x)
 
 
 def _format_detail(func_id, param, input_val, output_val):
@@ -266,83 +779,183 @@ def _format_detail(func_id, param, input_val, output_val):
     if output_val is None:
         return 'niezdefiniowane'
     iv = f'{input_val:g}' if input_val is not None else '?'
-    ov = f'{output_val:g}'
-
-    if func_id == 'shift':
-        return f'{iv} + {param:g} = {ov}'
-    elif func_id == 'scale':
-        return f'{param:g} \u00b7 {iv} = {ov}'
-    elif func_id == 'power':
-        if param == 2:
-            return f'{iv}\u00b2 = {ov}'
-        if param == 3:
-            return f'{iv}\u00b3 = {ov}'
-        if param == 0.5:
-            return f'\u221a{iv} = {ov}'
-        if param == -1:
-            return f'1/{iv} = {ov}'
-        return f'{iv}^{param:g} = {ov}'
-    elif func_id == 'sin':
-        if param == 1:
-            return f'sin({iv}) = {ov}'
-        return f'sin({param:g}\u00b7{iv}) = {ov}'
-    elif func_id == 'cos':
-        if param == 1:
-            return f'cos({iv}) = {ov}'
-        return f'cos({param:g}\u00b7{iv}) = {ov}'
-    elif func_id == 'exp':
-        if param == 1:
-            return f'e^{iv} = {ov}'
-        return f'e^({param:g}\u00b7{iv}) = {ov}'
-    elif func_id == 'abs':
-        return f'|{iv}| = {ov}'
-    elif func_id == 'ln':
-        return f'ln({iv}) = {ov}'
-    return f'{ov}'
-
-
-def _build_pipeline(f_id, f_param, g_id, g_param, x0):
-    """Buduje opisy kroków pipeline dla f(g(x)) i g(f(x))."""
-    g_x0 = _evaluate_single(g_id, g_param, x0)
-    f_x0 = _evaluate_single(f_id, f_param, x0)
-
-    f_g_x0 = _evaluate_single(f_id, f_param, g_x0) if g_x0 is not None else None
-    g_f_x0 = _evaluate_single(g_id, g_param, f_x0) if f_x0 is not None else None
-
-    g_label = _make_label(g_id, g_param)
-    f_label = _make_label(f_id, f_param)
-
-    pipeline_fg = [
-        {'label': 'x\u2080', 'value': safe_float(x0), 'detail': None},
-        {
-            'label': f'g(x\u2080)',
-            'value': safe_float(g_x0),
-            'detail': _format_detail(g_id, g_param, x0, g_x0),
-        },
-        {
-            'label': f'f(g(x\u2080))',
-            'value': safe_float(f_g_x0),
-            'detail': _format_detail(f_id, f_param, g_x0, f_g_x0) if g_x0 is not None else 'niezdefiniowane',
-        },
-    ]
+    return _formatter('detail', func_id, param)(iv=iv, ov=f'{output_val:g}')
+
+
+def _build_chain_pipeline(stages, names, x0, values):
+    """
+    Buduje opisy kroków pipeline dla łańcucha funkcji.
+
+    Args:
+        stages: lista (func_id, param) w kolejności stosowania
+        names: nazwy funkcji do etykiet (np. ['g', 'f'] -> f(g(x₀)))
+        x0: punkt startowy
+        values: wartości kolejnych etapów w x0 (None = niezdefiniowane)
+    """
+    pipeline = [{'label': 'x\u2080', 'value': safe_float(x0), 'detail': None}]
+    label = 'x\u2080'
+    input_val = x0
+    for (func_id, param), name, output_val in zip(stages, names, values):
+        label = f'{name}({label})'
+        if input_val is None:
+            detail = 'niezdefiniowane'
+        else:
+            detail = _format_detail(func_id, param, input_val, output_val)
+        pipeline.append({
+            'label': label,
+            'value': safe_float(output_val),
+            'detail': detail,
+        })
+        input_val = output_val
+    return pipeline
 
-    pipeline_gf = [
-        {'label': 'x\u2080', 'value': safe_float(x0), 'detail': None},
-        {
-            'label': f'f(x\u2080)',
-            'value': safe_float(f_x0),
-            'detail': _format_detail(f_id, f_param, x0, f_x0),
-        },
-        {
-            'label': f'g(f(x\u2080))',
-            'value': safe_float(g_f_x0),
-            'detail': _format_detail(g_id, g_param, f_x0, g_f_x0) if f_x0 is not None else 'niezdefiniowane',
-        },
-    ]
+
+def _build_pipeline(f_id, f_param, g_id, g_param, x0, x0_values):
+    """
+    Buduje opisy kroków pipeline dla f(g(x)) i g(f(x)).
+
+    x0_values to wartości węzłów planu w x0 (klucze 'g', 'f', 'fg', 'gf').
+    """
+    pipeline_fg = _build_chain_pipeline(
+        [(g_id, g_param), (f_id, f_param)], ['g', 'f'], x0,
+        [x0_values['g'], x0_values['fg']],
+    )
+    pipeline_gf = _build_chain_pipeline(
+        [(f_id, f_param), (g_id, g_param)], ['f', 'g'], x0,
+        [x0_values['f'], x0_values['gf']],
+    )
 
     return pipeline_fg, pipeline_gf
 
 
+def _evaluate_chain(stages, x_arr, x0):
+    """
+    Oblicza wszystkie prefiksy złożenia w jednym przebiegu.
+
+    Wyjście etapu k jest wejściem etapu k+1. Punkt x0 dołączony jest
+    na końcu siatki, więc wartości pipeline liczone są tym samym
+    przebiegiem. Wyniki zapisywane są do jednego bufora
+    (len(stages), len(x_arr) + 1).
+
+    Returns:
+        tuple (krzywe prefiksów na siatce, wartości prefiksów w x0)
+    """
+    t_arr = np.append(x_arr, float(x0))
+    stages_out = np.empty((len(stages), len(t_arr)))
+    current = t_arr
+    for k, (func_id, param) in enumerate(stages):
+        stages_out[k] = _evaluate_func(func_id, param, current)
+        current = stages_out[k]
+
+    curves = stages_out[:, :-1]
+    values = [_finite_or_none(v) for v in stages_out[:, -1]]
+    return curves, values
+
+
+def _parse_param(func_id, raw_param, name):
+    """Zwraca parametr funkcji (domyślny, jeśli brak lub funkcja bez parametru)."""
+    info = FUNCTIONS[func_id]
+    param = info['param_default']
+    if info.get('has_param') and raw_param is not None:
+        param = float(raw_param)
+        if math.isnan(param) or math.isinf(param):
+            raise ValueError(f"Parametr {name} musi być liczbą skończoną")
+    return param
+
+
+def _parse_chain(chain_raw):
+    """Waliduje łańcuch [{id, param}, ...] i zwraca listę (func_id, param)."""
+    if not isinstance(chain_raw, list) or len(chain_raw) < 1:
+        raise ValueError("Łańcuch musi być niepustą listą funkcji")
+    if len(chain_raw) > MAX_CHAIN_LENGTH:
+        raise ValueError(f"Łańcuch może mieć najwyżej {MAX_CHAIN_LENGTH} funkcji")
+
+    stages = []
+    for i, entry in enumerate(chain_raw):
+        if not isinstance(entry, dict):
+            raise ValueError(f"Element łańcucha {i+1} musi być obiektem {{id, param}}")
+        func_id = entry.get('id')
+        if func_id not in FUNCTIONS:
+            raise ValueError(f"Nieznana funkcja w łańcuchu: {func_id}")
+        stages.append((func_id, _parse_param(func_id, entry.get('param'), str(i + 1))))
+    return stages
+
+
+def _parse_x0(data):
+    """Waliduje i zwraca punkt x0 z requestu."""
+    x0 = float(data.get('x0', 2.0))
+    if math.isnan(x0) or math.isinf(x0):
+        raise ValueError("x0 musi być liczbą skończoną")
+    if abs(x0) > 100:
+        raise ValueError("x0 musi być z zakresu [-100, 100]")
+    return x0
+
+
+def _y_display_range(arrays):
+    """Dynamiczny zakres Y dla zestawu krzywych, ograniczony do [-50, 50]."""
+    all_y = np.concatenate([np.ravel(a) for a in arrays])
+    finite_y = all_y[np.isfinite(all_y)]
+    if len(finite_y) > 0:
+        y_min = float(np.nanmin(finite_y))
+        y_max = float(np.nanmax(finite_y))
+    else:
+        y_min, y_max = -10, 10
+    y_pad = max((y_max - y_min) * 0.15, 2)
+    # Ograniczenie zakresu żeby nie uciekał w nieskończoność
+    y_display_min = max(y_min - y_pad, -50)
+    y_display_max = min(y_max + y_pad, 50)
+    return [round(y_display_min, 4), round(y_display_max, 4)]
+
+
+def _to_json_list(arr):
+    """Konwersja tablicy numpy do listy JSON-safe (None dla NaN/Inf)."""
+    return [
+        None if (math.isnan(float(v)) or math.isinf(float(v)))
+        else round(float(v), 8)
+        for v in arr
+    ]
+
+
+def _compute_chain(data):
+    """
+    Oblicza łańcuch złożeń f_n(...f_2(f_1(x))...) dla formy 'chain' requestu.
+
+    Zwraca krzywą każdego prefiksu złożenia, etykiety i pipeline w x0.
+    """
+    stages = _parse_chain(data['chain'])
+    x0 = _parse_x0(data)
+
+    x_arr = np.linspace(X_RANGE[0], X_RANGE[1], NUM_POINTS)
+    curves, values = _evaluate_chain(stages, x_arr, x0)
+
+    names = [f'f{i + 1}'.translate(SUBSCRIPT_DIGITS) for i in range(len(stages))]
+    pipeline = _build_chain_pipeline(stages, names, x0, values)
+
+    labels = []
+    expr = None
+    for func_id, param in stages:
+        if expr is None:
+            expr = _make_label(func_id, param, 'x')
+        else:
+            expr = _compose_label(func_id, param, expr)
+        labels.append(expr)
+
+    return {
+        'success': True,
+        'x': x_arr.tolist(),
+        'chain_curves': [
+            {'label': label, 'y': _to_json_list(curve)}
+            for label, curve in zip(labels, curves)
+        ],
+        'chain_labels': labels,
+        'function_labels': [_make_label(func_id, param) for func_id, param in stages],
+        'x0': safe_float(x0),
+        'chain_x0': [safe_float(v) for v in values],
+        'pipeline': pipeline,
+        'y_range': _y_display_range([curves]),
+    }
+
+
 def _validate_request_json():
     """Waliduje że request zawiera poprawny JSON."""
     data = request.json
@@ -382,13 +995,28 @@ def compute():
         g_param: float - parametr g (lub null)
         x0: float - punkt ewaluacji łańcucha
 
+    Alternatywna forma - łańcuch do MAX_CHAIN_LENGTH funkcji:
+        chain: [{id, param}, ...] - funkcje w kolejności stosowania
+            (pierwsza działa na x)
+        x0: float
+
     Response JSON:
         Krzywe g(x), f(x), f(g(x)), g(f(x)), ewaluacja w x0,
         pipeline steps, etykiety.
+        Pochodne złożeń (f∘g)' i (g∘f)' jako krzywe oraz rozbicie
+        reguły łańcuchowej w x0: chain_rule_fg/gf = {outer, inner, value}.
+        Dokładna dziedzina (w zakresie wykresu) i zbiór wartości złożeń:
+        fg_domain, gf_domain, fg_values, gf_values - np. '[-3, 5]'
+        (null, gdy analiza przedziałowa nie jest możliwa).
+        Dla formy 'chain': x, chain_curves (krzywa każdego prefiksu),
+        chain_labels, chain_x0, pipeline, y_range.
     """
     try:
         data = _validate_request_json()
 
+        if 'chain' in data:
+            return jsonify(_compute_chain(data))
+
         f_id = data.get('f_id', 'power')
         g_id = data.get('g_id', 'shift')
         if f_id not in FUNCTIONS:
@@ -396,43 +1024,54 @@ def compute():
         if g_id not in FUNCTIONS:
             raise ValueError(f"Nieznana funkcja g: {g_id}")
 
-        f_info = FUNCTIONS[f_id]
-        g_info = FUNCTIONS[g_id]
-
         # Parametry
-        f_param = f_info['param_default']
-        if f_info.get('has_param') and data.get('f_param') is not None:
-            f_param = float(data['f_param'])
-            if math.isnan(f_param) or math.isinf(f_param):
-                raise ValueError("Parametr f musi być liczbą skończoną")
-
-        g_param = g_info['param_default']
-        if g_info.get('has_param') and data.get('g_param') is not None:
-            g_param = float(data['g_param'])
-            if math.isnan(g_param) or math.isinf(g_param):
-                raise ValueError("Parametr g musi być liczbą skończoną")
-
-        x0 = float(data.get('x0', 2.0))
-        if math.isnan(x0) or math.isinf(x0):
-            raise ValueError("x0 musi być liczbą skończoną")
-        if abs(x0) > 100:
-            raise ValueError("x0 musi być z zakresu [-100, 100]")
-
-        # Zakres wykresu
-        x_range = [-5, 5]
-        x_arr = np.linspace(x_range[0], x_range[1], 500)
+        f_param = _parse_param(f_id, data.get('f_param'), 'f')
+        g_param = _parse_param(g_id, data.get('g_param'), 'g')
+
+        x0 = _parse_x0(data)
+
+        # Dokładne dziedziny i zbiory wartości (arytmetyka przedziałowa)
+        x_set = [(float(X_RANGE[0]), float(X_RANGE[1]), True, True)]
+        g_domain, _ = _composition_domain([(g_id, g_param)], x_set)
+        f_domain, _ = _composition_domain([(f_id, f_param)], x_set)
+        fg_domain, fg_values = _composition_domain([(g_id, g_param), (f_id, f_param)], x_set)
+        gf_domain, gf_values = _composition_domain([(f_id, f_param), (g_id, g_param)], x_set)
+
+        # Siatka wykresu - punkty tylko tam, gdzie któraś krzywa jest określona
+        x_arr = _domain_grid([g_domain, f_domain, fg_domain, gf_domain], NUM_POINTS)
+
+        # Plan obliczeń: krzywe i ewaluacja w x0 w jednym przebiegu
+        # (x0 dołączone na końcu siatki)
+        plan = {
+            'g': (g_id, g_param, 'x'),
+            'f': (f_id, f_param, 'x'),
+            'fg': (f_id, f_param, 'g'),
+            'gf': (g_id, g_param, 'f'),
+        }
+        t_arr = np.append(x_arr, x0)
+        values = _evaluate_plan(plan, t_arr)
 
         # Krzywe
-        g_y = _evaluate_func(g_id, g_param, x_arr)
-        f_y = _evaluate_func(f_id, f_param, x_arr)
-        fg_y = _evaluate_func(f_id, f_param, g_y)
-        gf_y = _evaluate_func(g_id, g_param, f_y)
+        g_y = values['g'][:-1]
+        f_y = values['f'][:-1]
+        fg_y = values['fg'][:-1]
+        gf_y = values['gf'][:-1]
 
         # Ewaluacja w x0
-        g_x0 = _evaluate_single(g_id, g_param, x0)
-        f_x0 = _evaluate_single(f_id, f_param, x0)
-        f_g_x0 = _evaluate_single(f_id, f_param, g_x0) if g_x0 is not None else None
-        g_f_x0 = _evaluate_single(g_id, g_param, f_x0) if f_x0 is not None else None
+        x0_values = {name: _finite_or_none(arr[-1]) for name, arr in values.items()}
+        g_x0 = x0_values['g']
+        f_x0 = x0_values['f']
+        f_g_x0 = x0_values['fg']
+        g_f_x0 = x0_values['gf']
+
+        # Pochodne z reguły łańcuchowej - z tablic planu, bez ponownego
+        # obliczania funkcji: (f∘g)' = f'(g(x))·g'(x), (g∘f)' = g'(f(x))·f'(x)
+        dg = _evaluate_derivative(g_id, g_param, t_arr, values['g'])
+        df = _evaluate_derivative(f_id, f_param, t_arr, values['f'])
+        df_at_g = _evaluate_derivative(f_id, f_param, values['g'], values['fg'])
+        dg_at_f = _evaluate_derivative(g_id, g_param, values['f'], values['gf'])
+        dfg = df_at_g * dg
+        dgf = dg_at_f * df
 
         # Typowe bledy
         f_x0_plus_g_x0 = None
@@ -447,7 +1086,7 @@ def compute():
 
         # Pipeline
         pipeline_fg, pipeline_gf = _build_pipeline(
-            f_id, f_param, g_id, g_param, x0
+            f_id, f_param, g_id, g_param, x0, x0_values
         )
 
         # Etykiety
@@ -457,25 +1096,8 @@ def compute():
         gf_label = _make_composition_label(g_id, g_param, f_id, f_param)
 
         # Zakres Y - dynamiczny
-        all_y = np.concatenate([g_y, f_y, fg_y, gf_y])
-        finite_y = all_y[np.isfinite(all_y)]
-        if len(finite_y) > 0:
-            y_min = float(np.nanmin(finite_y))
-            y_max = float(np.nanmax(finite_y))
-        else:
-            y_min, y_max = -10, 10
-        y_pad = max((y_max - y_min) * 0.15, 2)
-        # Ograniczenie zakresu żeby nie uciekał w nieskończoność
-        y_display_min = max(y_min - y_pad, -50)
-        y_display_max = min(y_max + y_pad, 50)
-
-        # Konwersja do JSON-safe
-        def to_json_list(arr):
-            return [
-                None if (math.isnan(float(v)) or math.isinf(float(v)))
-                else round(float(v), 8)
-                for v in arr
-            ]
+        y_range = _y_display_range([g_y, f_y, fg_y, gf_y])
+        derivative_y_range = _y_display_range([dfg[:-1], dgf[:-1]])
 
         result = {
             'success': True,
@@ -484,10 +1106,10 @@ def compute():
             'fg_label': fg_label,
             'gf_label': gf_label,
 
-            'g_curve': {'x': x_arr.tolist(), 'y': to_json_list(g_y)},
-            'f_curve': {'x': x_arr.tolist(), 'y': to_json_list(f_y)},
-            'fg_curve': {'x': x_arr.tolist(), 'y': to_json_list(fg_y)},
-            'gf_curve': {'x': x_arr.tolist(), 'y': to_json_list(gf_y)},
+            'g_curve': {'x': x_arr.tolist(), 'y': _to_json_list(g_y)},
+            'f_curve': {'x': x_arr.tolist(), 'y': _to_json_list(f_y)},
+            'fg_curve': {'x': x_arr.tolist(), 'y': _to_json_list(fg_y)},
+            'gf_curve': {'x': x_arr.tolist(), 'y': _to_json_list(gf_y)},
 
             'x0': safe_float(x0),
             'g_x0': safe_float(g_x0),
@@ -500,7 +1122,26 @@ def compute():
             'pipeline_fg': pipeline_fg,
             'pipeline_gf': pipeline_gf,
 
-            'y_range': [round(y_display_min, 4), round(y_display_max, 4)],
+            'fg_derivative_curve': {'x': x_arr.tolist(), 'y': _to_json_list(dfg[:-1])},
+            'gf_derivative_curve': {'x': x_arr.tolist(), 'y': _to_json_list(dgf[:-1])},
+            'chain_rule_fg': {
+                'outer': safe_float(df_at_g[-1]),
+                'inner': safe_float(dg[-1]),
+                'value': safe_float(dfg[-1]),
+            },
+            'chain_rule_gf': {
+                'outer': safe_float(dg_at_f[-1]),
+                'inner': safe_float(df[-1]),
+                'value': safe_float(dgf[-1]),
+            },
+            'derivative_y_range': derivative_y_range,
+
+            'y_range': y_range,
+
+            'fg_domain': _format_interval_set(fg_domain),
+            'gf_domain': _format_interval_set(gf_domain),
+            'fg_values': _format_interval_set(fg_values),
+            'gf_values': _format_interval_set(gf_values),
         }
 
         return jsonify(result)
@@ -514,6 +1155,284 @@ def compute():
         }), 500
 
 
+@app.route('/api/param_heatmap', methods=['POST'])
+def param_heatmap():
+    """
+    Oblicza f(g(x0)) na całej płaszczyźnie parametrów (f_param, g_param).
+
+    Request JSON:
+        f_id: string - identyfikator funkcji zewnętrznej
+        g_id: string - identyfikator funkcji wewnętrznej
+        x0: float - ustalony punkt
+        f_steps, g_steps: int (opcjonalne) - gęstość siatki parametru
+            (2-200) zamiast param_step; ignorowane dla param_values
+
+    Response JSON:
+        f_params, g_params: list - wartości parametrów na osiach
+        values: list[list] - f(g(x0)), wiersz na f_param, kolumna na g_param
+        value_range: [min, max] - zakres skończonych wartości
+    """
+    try:
+        data = _validate_request_json()
+
+        f_id = data.get('f_id', 'power')
+        g_id = data.get('g_id', 'shift')
+        if f_id not in FUNCTIONS:
+            raise ValueError(f"Nieznana funkcja f: {f_id}")
+        if g_id not in FUNCTIONS:
+            raise ValueError(f"Nieznana funkcja g: {g_id}")
+
+        x0 = _parse_x0(data)
+
+        steps = {}
+        for name in ('f_steps', 'g_steps'):
+            raw = data.get(name)
+            if raw is not None:
+                raw = int(raw)
+                if raw < 2 or raw > MAX_HEATMAP_STEPS:
+                    raise ValueError(f"{name} musi być z zakresu [2, {MAX_HEATMAP_STEPS}]")
+            steps[name] = raw
+
+        f_params = _param_grid(f_id, steps['f_steps'])
+        g_params = _param_grid(g_id, steps['g_steps'])
+
+        # g(x0) dla wszystkich g_param, potem f na całej siatce naraz
+        g_values = _evaluate_func_grid(g_id, g_params, np.array(x0))
+        values = _evaluate_func_grid(f_id, f_params, g_values)
+
+        finite = values[np.isfinite(values)]
+        if len(finite) > 0:
+            value_range = [round(float(finite.min()), 8), round(float(finite.max()), 8)]
+        else:
+            value_range = None
+
+        def axis_list(params):
+            return [None if p is None else round(float(p), 8) for p in params]
+
+        return jsonify({
+            'success': True,
+            'f_params': axis_list(f_params),
+            'g_params': axis_list(g_params),
+            'values': [_to_json_list(row) for row in values],
+            'value_range': value_range,
+            'x0': safe_float(x0),
+        })
+
+    except (ValueError, TypeError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception:
+        return jsonify({
+            'success': False,
+            'error': 'Nieoczekiwany błąd serwera'
+        }), 500
+
+
+def _parse_seeds(data):
+    """Punkty startowe: lista 'seeds' lub 'seed_range' {min, max, count}."""
+    if data.get('seeds') is not None:
+        raw = data['seeds']
+        if not isinstance(raw, list) or len(raw) < 1:
+            raise ValueError("seeds musi być niepustą listą liczb")
+        if len(raw) > MAX_SEEDS:
+            raise ValueError(f"Maksymalna liczba punktów startowych to {MAX_SEEDS}")
+        seeds = np.array(raw, dtype=float)
+    else:
+        seed_range = data.get('seed_range') or {}
+        lo = float(seed_range.get('min', X_RANGE[0]))
+        hi = float(seed_range.get('max', X_RANGE[1]))
+        count = int(seed_range.get('count', 1000))
+        if count < 1 or count > MAX_SEEDS:
+            raise ValueError(f"Liczba punktów startowych musi być z zakresu [1, {MAX_SEEDS}]")
+        if lo > hi:
+            raise ValueError("seed_range: min musi być nie większe od max")
+        seeds = np.linspace(lo, hi, count)
+    if not np.all(np.isfinite(seeds)):
+        raise ValueError("Punkty startowe muszą być liczbami skończonymi")
+    if np.any(np.abs(seeds) > 100):
+        raise ValueError("Punkty startowe muszą być z zakresu [-100, 100]")
+    return seeds
+
+
+def _iterate_fixed_point(stages, seeds, max_iter, tol, orbit_idx, orbit_length):
+    """
+    Iteruje x_{k+1} = h(x_k) dla wszystkich punktów startowych naraz.
+
+    Obliczenia w każdym kroku obejmują tylko aktywne punkty; punkt
+    odpada po zbieżności (|x_{k+1} - x_k| < tol), rozbieżności
+    (|x| > DIVERGENCE_BOUND) lub wyjściu poza dziedzinę.
+
+    Returns:
+        tuple (wartości końcowe, status, liczba iteracji, orbity)
+        status: 1 zbieżny, 2 rozbieżny, 3 niezdefiniowany, 0 brak decyzji
+    """
+    x = seeds.copy()
+    status = np.zeros(len(seeds), dtype=np.int8)
+    iterations = np.zeros(len(seeds), dtype=np.int32)
+    orbits = np.full((len(orbit_idx), orbit_length + 1), np.nan)
+    orbits[:, 0] = seeds[orbit_idx]
+
+    active = np.arange(len(seeds))
+    for k in range(1, max_iter + 1):
+        if len(active) == 0:
+            break
+        current = x[active]
+        nxt = current
+        for func_id, param in stages:
+            nxt = _evaluate_func(func_id, param, nxt)
+
+        undefined = ~np.isfinite(nxt)
+        with np.errstate(invalid='ignore'):
+            diverged = ~undefined & (np.abs(nxt) > DIVERGENCE_BOUND)
+            converged = ~undefined & ~diverged & (np.abs(nxt - current) < tol)
+
+        x[active] = np.where(undefined, current, nxt)
+        iterations[active] = k
+        status[active[converged]] = 1
+        status[active[diverged]] = 2
+        status[active[undefined]] = 3
+
+        if k <= orbit_length:
+            orbits[:, k] = np.where(
+                np.isin(orbit_idx, active[~undefined]), x[orbit_idx], np.nan
+            )
+        active = active[~(converged | diverged | undefined)]
+
+    return x, status, iterations, orbits
+
+
+def _classify_basins(x, status, tol):
+    """
+    Przypisuje zbieżnym punktom indeks atraktora (punktu stałego).
+
+    Granice odległe o mniej niż 100·tol traktowane są jako ten sam punkt.
+
+    Returns:
+        tuple (tablica indeksów basenów, lista punktów stałych)
+    """
+    basins = np.full(len(x), BASIN_UNDECIDED, dtype=np.int32)
+    basins[status == 2] = BASIN_DIVERGED
+    basins[status == 3] = BASIN_UNDEFINED
+
+    converged = np.flatnonzero(status == 1)
+    attractors = []
+    if len(converged) > 0:
+        limits = x[converged]
+        order = np.argsort(limits)
+        sorted_limits = limits[order]
+        # Nowy atraktor tam, gdzie przerwa między kolejnymi granicami jest duża
+        new_group = np.concatenate([[True], np.diff(sorted_limits) > 100 * tol])
+        group = np.cumsum(new_group) - 1
+        basins[converged[order]] = group
+        attractors = [
+            float(np.mean(sorted_limits[group == g])) for g in range(group[-1] + 1)
+        ]
+    return basins, attractors
+
+
+@app.route('/api/iterate', methods=['POST'])
+def iterate():
+    """
+    Iteracja punktu stałego x_{k+1} = f(g(x_k)) dla wielu punktów startowych.
+
+    Request JSON:
+        f_id, f_param, g_id, g_param - jak w /api/compute
+            (lub chain: [{id, param}, ...] - dowolne złożenie)
+        seeds: list - punkty startowe (do MAX_SEEDS)
+            lub seed_range: {min, max, count}
+        max_iter: int - maksymalna liczba iteracji (domyślnie 100)
+        tol: float - próg zbieżności |x_{k+1} - x_k| (domyślnie 1e-9)
+        orbits: int - liczba orbit do wykresu pajęczynowego (domyślnie 5)
+        orbit_length: int - długość zapisanych orbit (domyślnie 30)
+
+    Response JSON:
+        curve: {x, y} - wykres h(x) do tła wykresu pajęczynowego
+        orbits: list of {seed, values} - kolejne iteraty x_0, x_1, ...
+        basins: list - indeks atraktora lub -1 (rozbieżny),
+            -2 (poza dziedziną), -3 (brak zbieżności w max_iter)
+        attractors: list - znalezione punkty stałe
+        iterations: list - liczba wykonanych iteracji dla punktu
+        summary: dict - liczności klas
+    """
+    try:
+        data = _validate_request_json()
+
+        if 'chain' in data:
+            stages = _parse_chain(data['chain'])
+        else:
+            f_id = data.get('f_id', 'cos')
+            g_id = data.get('g_id', 'scale')
+            if f_id not in FUNCTIONS:
+                raise ValueError(f"Nieznana funkcja f: {f_id}")
+            if g_id not in FUNCTIONS:
+                raise ValueError(f"Nieznana funkcja g: {g_id}")
+            stages = [
+                (g_id, _parse_param(g_id, data.get('g_param'), 'g')),
+                (f_id, _parse_param(f_id, data.get('f_param'), 'f')),
+            ]
+
+        seeds = _parse_seeds(data)
+
+        max_iter = int(data.get('max_iter', 100))
+        if max_iter < 1 or max_iter > MAX_ITERATIONS:
+            raise ValueError(f"max_iter musi być z zakresu [1, {MAX_ITERATIONS}]")
+
+        tol = float(data.get('tol', 1e-9))
+        if not (tol > 0 and math.isfinite(tol)):
+            raise ValueError("tol musi być dodatnią liczbą skończoną")
+
+        n_orbits = int(data.get('orbits', 5))
+        if n_orbits < 0 or n_orbits > MAX_ORBITS:
+            raise ValueError(f"orbits musi być z zakresu [0, {MAX_ORBITS}]")
+        orbit_length = int(data.get('orbit_length', 30))
+        if orbit_length < 1 or orbit_length > MAX_ORBIT_LENGTH:
+            raise ValueError(f"orbit_length musi być z zakresu [1, {MAX_ORBIT_LENGTH}]")
+
+        # Orbity dla równomiernie wybranych punktów startowych
+        orbit_idx = np.unique(
+            np.linspace(0, len(seeds) - 1, min(n_orbits, len(seeds))).round().astype(int)
+        ) if n_orbits > 0 else np.array([], dtype=int)
+
+        x, status, iterations, orbits = _iterate_fixed_point(
+            stages, seeds, max_iter, tol, orbit_idx, orbit_length
+        )
+        basins, attractors = _classify_basins(x, status, tol)
+
+        x_arr = np.linspace(X_RANGE[0], X_RANGE[1], NUM_POINTS)
+        curves, _ = _evaluate_chain(stages, x_arr, 0.0)
+
+        orbit_list = []
+        for idx, row in zip(orbit_idx, orbits):
+            values = row[np.isfinite(row)]
+            orbit_list.append({
+                'seed': safe_float(seeds[idx]),
+                'values': [round(float(v), 8) for v in values],
+            })
+
+        return jsonify({
+            'success': True,
+            'curve': {'x': x_arr.tolist(), 'y': _to_json_list(curves[-1])},
+            'orbits': orbit_list,
+            'seeds_count': len(seeds),
+            'basins': basins.tolist(),
+            'attractors': [round(a, 8) for a in attractors],
+            'iterations': iterations.tolist(),
+            'summary': {
+                'converged': int(np.count_nonzero(status == 1)),
+                'diverged': int(np.count_nonzero(status == 2)),
+                'undefined': int(np.count_nonzero(status == 3)),
+                'undecided': int(np.count_nonzero(status == 0)),
+            },
+        })
+
+    except (ValueError, TypeError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception:
+        return jsonify({
+            'success': False,
+            'error': 'Nieoczekiwany błąd serwera'
+        }), 500
+
+
 @app.route('/api/functions')
 def functions():
     """Zwraca listę dostępnych funkcji z metadanymi."""
@@ -522,6 +1441,7 @@ def functions():
         entry = {
             'name': info['name'],
             'description': info['description'],
+            'derivative_name': info['derivative_name'],
             'has_param': info.get('has_param', False),
             'param_default': info.get('param_default'),
         }
@@ -13,8 +13,8 @@ import sys
 
 from common.flask_app import register_common_static
 from common.functions import (
-    FUNCTION_REGISTRY, evaluate_function, evaluate_derivative,
-    get_all_functions, resolve_params
+    CUSTOM_DEFAULT_RANGE, FUNCTION_REGISTRY, compile_custom_function,
+    evaluate_function, evaluate_derivative, get_all_functions, resolve_params
 )
 
 
@@ -96,12 +96,15 @@ def compute():
 
     Request JSON:
         func: string - identyfikator funkcji
+        expression: string (opcjonalny) - własny wzór w zmiennej x
+            (np. 'a*sin(b*x)'); gdy podany, zastępuje func
         params: dict - parametry funkcji
         view_mode: string - 'separate' lub 'combined'
         x_min: float (opcjonalny) - początek zakresu
         x_max: float (opcjonalny) - koniec zakresu
 
     Response JSON:
+        params: dict - użyte wartości parametrów
         func_data: {x, y} - dane funkcji
         derivative_data: {x, y} - dane pochodnej
         func_formula: string - wzór funkcji
@@ -113,10 +116,6 @@ def compute():
     try:
         data = _validate_request_json()
 
-        func_id = data.get('func', 'sin')
-        if func_id not in FUNCTION_REGISTRY:
-            raise ValueError(f"Nieznana funkcja: {func_id}")
-
         view_mode = data.get('view_mode', 'separate')
         if view_mode not in VALID_VIEW_MODES:
             raise ValueError(
@@ -125,13 +124,27 @@ def compute():
             )
 
         raw_params = data.get('params', {})
-        params = resolve_params(func_id, raw_params)
-
-        func_info = FUNCTION_REGISTRY[func_id]
+        expression = data.get('expression')
+        if expression is not None:
+            # Własny wzór: bezpieczny kompilator, f i f' jednym planem
+            custom = compile_custom_function(expression, raw_params)
+            params = custom['params']
+            default_range = CUSTOM_DEFAULT_RANGE
+            func_formula = custom['formula']
+            derivative_formula = custom['derivative_formula']
+        else:
+            func_id = data.get('func', 'sin')
+            if func_id not in FUNCTION_REGISTRY:
+                raise ValueError(f"Nieznana funkcja: {func_id}")
+            params = resolve_params(func_id, raw_params)
+            func_info = FUNCTION_REGISTRY[func_id]
+            default_range = func_info['default_range']
+            func_formula = func_info['formula']
+            derivative_formula = func_info['derivative_formula']
 
         # Zakres X
-        x_min = data.get('x_min', func_info['default_range'][0])
-        x_max = data.get('x_max', func_info['default_range'][1])
+        x_min = data.get('x_min', default_range[0])
+        x_max = data.get('x_max', default_range[1])
         x_min = float(x_min)
         x_max = float(x_max)
 
@@ -147,8 +160,11 @@ def compute():
         x_arr = np.linspace(x_min, x_max, NUM_POINTS)
 
         # Oblicz funkcję i pochodną
-        y_func = evaluate_function(func_id, x_arr, params)
-        y_deriv = evaluate_derivative(func_id, x_arr, params)
+        if expression is not None:
+            y_func, y_deriv = custom['evaluate'](x_arr)
+        else:
+            y_func = evaluate_function(func_id, x_arr, params)
+            y_deriv = evaluate_derivative(func_id, x_arr, params)
 
         # Zakresy Y
         y_range_func = _compute_y_range(y_func)
@@ -164,6 +180,7 @@ def compute():
         result = {
             'success': True,
             'view_mode': view_mode,
+            'params': params,
             'func_data': {
                 'x': x_arr.tolist(),
                 'y': _safe_y_list(y_func),
@@ -172,8 +189,8 @@ def compute():
                 'x': x_arr.tolist(),
                 'y': _safe_y_list(y_deriv),
             },
-            'func_formula': func_info['formula'],
-            'derivative_formula': func_info['derivative_formula'],
+            'func_formula': func_formula,
+            'derivative_formula': derivative_formula,
             'y_range_func': y_range_func,
             'y_range_deriv': y_range_deriv,
             'y_range_combined': y_range_combined,
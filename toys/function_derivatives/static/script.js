@@ -1,6 +1,7 @@
 // === STAN APLIKACJI ===
 var state = {
     func: 'sin',
+    expression: '',
     params: {},
     viewMode: 'separate',
     xMin: -6.28,
@@ -11,6 +12,10 @@ var state = {
 
 var debounceTimer = null;
 
+// Własny wzór liczony przez bezpieczny kompilator na serwerze
+var CUSTOM_FUNC = 'custom';
+var CUSTOM_RANGE = [-10, 10];
+
 var COLORS = {
     func: '#6366f1',
     derivative: '#ef4444'
@@ -50,6 +55,10 @@ function populateFunctionSelect() {
             select.appendChild(opt);
         }
     }
+    var custom = document.createElement('option');
+    custom.value = CUSTOM_FUNC;
+    custom.textContent = 'Własny wzór';
+    select.appendChild(custom);
 }
 
 // === KONTROLKI ===
@@ -57,16 +66,21 @@ function setupInputs() {
     document.getElementById('func-select').addEventListener('change', function() {
         state.func = this.value;
         var def = state.functionDefs[state.func];
-        if (def) {
-            state.xMin = def.default_range[0];
-            state.xMax = def.default_range[1];
-            document.getElementById('x-min').value = Math.round(state.xMin * 100) / 100;
-            document.getElementById('x-max').value = Math.round(state.xMax * 100) / 100;
-        }
+        var range = def ? def.default_range : CUSTOM_RANGE;
+        state.xMin = range[0];
+        state.xMax = range[1];
+        document.getElementById('x-min').value = Math.round(state.xMin * 100) / 100;
+        document.getElementById('x-max').value = Math.round(state.xMax * 100) / 100;
+        document.getElementById('expression-group').hidden = state.func !== CUSTOM_FUNC;
         buildParamInputs(state.func);
         scheduleUpdate();
     });
 
+    document.getElementById('expression-input').addEventListener('input', function() {
+        state.expression = this.value;
+        scheduleUpdate();
+    });
+
     document.getElementById('x-min').addEventListener('input', function() {
         var val = parseFloat(this.value);
         if (!isNaN(val)) {
@@ -118,16 +132,37 @@ function togglePlotVisibility() {
 
 // === DYNAMICZNE PARAMETRY ===
 function buildParamInputs(funcId) {
-    var container = document.getElementById('params-container');
+    if (funcId === CUSTOM_FUNC) {
+        renderParamInputs([]);
+        return;
+    }
     var def = state.functionDefs[funcId];
     if (!def) return;
+    renderParamInputs(def.params);
+}
 
+// Parametry własnego wzoru znane są dopiero z odpowiedzi serwera
+function syncCustomParams(params) {
+    var names = Object.keys(params);
+    if (names.join(',') === Object.keys(state.params).join(',')) return;
+    renderParamInputs(names.map(function(name) {
+        return { id: name, label: name, default: params[name], min: -10, max: 10, step: 0.1 };
+    }));
+}
+
+function renderParamInputs(paramDefs) {
+    var container = document.getElementById('params-container');
     state.params = {};
+    if (paramDefs.length === 0) {
+        container.innerHTML = '';
+        return;
+    }
+
     var html = '<div class="st-input-group"><label>Parametry</label>';
     html += '<div class="fd-params__grid">';
 
-    for (var i = 0; i < def.params.length; i++) {
-        var p = def.params[i];
+    for (var i = 0; i < paramDefs.length; i++) {
+        var p = paramDefs[i];
         state.params[p.id] = p.default;
         html += '<div class="st-input-group">';
         html += '<label for="param-' + p.id + '">' + p.label + '</label>';
@@ -164,6 +199,9 @@ function scheduleUpdate() {
 // === OBLICZENIA ===
 async function updatePlot() {
     var loadingEl = document.getElementById('loading');
+    var errorEl = document.getElementById('expression-error');
+    var isCustom = state.func === CUSTOM_FUNC;
+    if (isCustom && !state.expression.trim()) return;
 
     try {
         loadingEl.classList.add('st-loading--active');
@@ -175,6 +213,9 @@ async function updatePlot() {
             x_min: state.xMin,
             x_max: state.xMax
         };
+        if (isCustom) {
+            body.expression = state.expression;
+        }
 
         var response = await fetch('/api/compute', {
             method: 'POST',
@@ -190,12 +231,17 @@ async function updatePlot() {
         var data = await response.json();
 
         if (data.success) {
+            errorEl.textContent = '';
+            if (isCustom) {
+                syncCustomParams(data.params);
+            }
             state.results = data;
             updateFormulas();
             drawPlots();
         }
     } catch (error) {
         console.error('Błąd:', error.message);
+        errorEl.textContent = isCustom ? error.message : '';
     } finally {
         loadingEl.classList.remove('st-loading--active');
     }
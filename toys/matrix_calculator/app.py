@@ -3,13 +3,31 @@ Kalkulator macierzy - interaktywne operacje na macierzach.
 
 Backend Flask obliczajacy wyznacznik, rzad, RREF, macierz odwrotna,
 wartosci wlasne oraz eliminacje Gaussa krok po kroku.
+
+Obsluguje macierze do MAX_MATRIX_SIZE x MAX_MATRIX_SIZE (JSON lub plik
+tekstowy/CSV); kroki eliminacji zapisywane sa tylko dla malych macierzy,
+a duze wyniki wysylane sa strumieniowo. Tryb dokladny (mode='exact')
+liczy na ulamkach eliminacja Bareissa bez ulamkow posrednich.
 """
 
-from flask import Flask, render_template, jsonify, request
+from flask import (
+    Flask, Response, render_template, jsonify, request, stream_with_context
+)
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
 import numpy as np
+from scipy import linalg as sla
+from scipy.linalg import LinAlgWarning, lu_factor, lu_solve, solve_triangular
+from collections import OrderedDict
+from fractions import Fraction
+import base64
+import hashlib
+import io
+import json
 import math
 import os
 import sys
+import threading
+import warnings
 
 from common.flask_app import register_common_static
 
@@ -58,6 +76,81 @@ PRESETS = {
 }
 
 
+MAX_MATRIX_SIZE = 2000
+MAX_ELEMENT = 10000
+
+# Najdluzszy zapis elementu z separatorem (np. "-1.2345678901234567e-05, ");
+# limit zadania miesci pelna macierz MAX_MATRIX_SIZE (ok. 128 MB) i wektory
+MAX_ELEMENT_JSON_BYTES = 32
+app.config['MAX_CONTENT_LENGTH'] = (
+    MAX_MATRIX_SIZE ** 2 * MAX_ELEMENT_JSON_BYTES + 1024 * 1024
+)
+
+# Tryby zapisu krokow eliminacji i maksymalny rozmiar (wiersze/kolumny)
+VALID_STEP_MODES = ('auto', 'full', 'summary', 'none')
+STEPS_MAX_SIZE = 10
+SUMMARY_STEPS_MAX_SIZE = 50
+
+# Szerokosc panelu kolumn w eliminacji blokowej (bez zapisu krokow)
+BLOCK_SIZE = 64
+
+# Od tej liczby elementow odpowiedz jest wysylana strumieniowo
+STREAM_MIN_ELEMENTS = 10000
+
+# Progi rozstrzygania rzedu z eliminacji (wzgledem max|a_ij|)
+RANK_PIVOT_RTOL = 1e-8
+RANK_NOISE_FACTOR = 100
+
+# Kolumna jest pomijana, gdy jej max |element| < max(1e-12, tol), gdzie
+# tol = ELIMINATION_TOL_FACTOR * max(n, m) * eps * max|a_ij| - przy duzych
+# macierzach szum zaokraglen przekracza stale 1e-12
+ELIMINATION_TOL_FACTOR = 1000
+
+# Tryb arytmetyki: zmiennoprzecinkowa lub dokladna (ulamki, do EXACT_MAX_SIZE)
+VALID_MODES = ('float', 'exact')
+EXACT_MAX_SIZE = 10
+MAX_FRACTION_LENGTH = 32
+
+# Pamiec podreczna wynikow /api/compute (LRU, gotowy JSON w bajtach);
+# presety sa liczone przy starcie i nigdy nie sa usuwane
+RESULT_CACHE_SIZE = 256
+RESULT_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+# Uklady rownan Ax = b: metody, domyslna tolerancja (wzgledna reszta
+# ||b - Ax|| / ||b||) i limit iteracji; faktoryzacje LU trzymane w LRU
+SOLVE_METHODS = ('lu', 'jacobi', 'gauss_seidel', 'cg')
+DEFAULT_SOLVE_TOL = 1e-10
+MAX_SOLVE_ITERATIONS = 10000
+DIVERGENCE_FACTOR = 1e12
+LU_CACHE_SIZE = 16
+
+# Rozklady macierzy; dziennik operacji (odtwarzanie krok po kroku) domyslnie
+# do STEPS_MAX_SIZE, na zyczenie do SUMMARY_STEPS_MAX_SIZE
+VALID_DECOMPOSITIONS = ('lu', 'qr', 'cholesky', 'svd')
+QR_ALGORITHMS = ('householder', 'givens')
+VALID_FORMATS = ('json', 'binary')
+
+# Rozwiniecie Laplace'a: maksymalny rozmiar i wybor wiersza/kolumny
+# ('row' - zawsze pierwszy wiersz minora, najwiecej wspolnych minorow;
+# 'sparse' - wiersz lub kolumna z najwieksza liczba zer)
+COFACTOR_MAX_SIZE = 10
+COFACTOR_STRATEGIES = ('row', 'sparse')
+LU_CHECK_RTOL = 1e-9
+
+# Iteracje wartosci wlasnych (strumien NDJSON): metody, rozmiar, limity;
+# migawki calej macierzy tylko do STEPS_MAX_SIZE
+EIGEN_METHODS = ('power', 'inverse', 'qr', 'shifted_qr')
+EIGEN_ITER_MAX_SIZE = 200
+MAX_EIGEN_ITERATIONS = 5000
+DEFAULT_EIGEN_TOL = 1e-10
+# Co tyle iteracji QR bez odciecia - przesuniecie wyjatkowe (jak LAPACK)
+QR_EXCEPTIONAL_SHIFT_PERIOD = 10
+
+# Obliczenia wsadowe: liczba macierzy i maksymalny wymiar kazdej z nich
+MAX_BATCH_MATRICES = 1000
+BATCH_MAX_SIZE = 50
+
+
 def safe_float(val):
     """Bezpieczna konwersja na float - zwraca None dla NaN/Inf."""
     try:
@@ -71,19 +164,20 @@ def safe_float(val):
 
 def _validate_request_json():
     """Waliduje ze request zawiera poprawny JSON."""
-    data = request.json
+    # silent: bledny JSON -> 400 z komunikatem API (413 nadal przechodzi)
+    data = request.get_json(silent=True)
     if data is None:
         raise ValueError("Wymagane dane w formacie JSON")
     return data
 
 
-def _validate_matrix(matrix_raw):
-    """Waliduje i zwraca macierz NxM."""
+def _validate_shape(matrix_raw, max_size=MAX_MATRIX_SIZE):
+    """Sprawdza, ze dane to prostokatna lista wierszy do max_size x max_size."""
     if not isinstance(matrix_raw, list) or len(matrix_raw) < 1:
         raise ValueError("Macierz musi byc niepusta lista wierszy")
 
-    if len(matrix_raw) > 6:
-        raise ValueError("Maksymalny rozmiar macierzy to 6 wierszy")
+    if len(matrix_raw) > max_size:
+        raise ValueError(f"Maksymalny rozmiar macierzy to {max_size} wierszy")
 
     n_cols = None
     for i, row in enumerate(matrix_raw):
@@ -93,35 +187,167 @@ def _validate_matrix(matrix_raw):
             n_cols = len(row)
         elif len(row) != n_cols:
             raise ValueError("Wszystkie wiersze musza miec taka sama liczbe kolumn")
-        if len(row) > 6:
-            raise ValueError("Maksymalny rozmiar macierzy to 6 kolumn")
-        for j, val in enumerate(row):
-            f = safe_float(val)
-            if f is None:
-                raise ValueError(f"Element [{i+1},{j+1}] musi byc liczba skonczona")
-            if abs(f) > 10000:
-                raise ValueError(f"Element [{i+1},{j+1}] musi byc z zakresu [-10000, 10000]")
+        if len(row) > max_size:
+            raise ValueError(f"Maksymalny rozmiar macierzy to {max_size} kolumn")
+
+
+def _validate_matrix(matrix_raw):
+    """Waliduje i zwraca macierz NxM."""
+    _validate_shape(matrix_raw)
+    try:
+        matrix = np.array(matrix_raw, dtype=float)
+    except (ValueError, TypeError):
+        # Wolna sciezka tylko po to, by wskazac bledny element
+        for i, row in enumerate(matrix_raw):
+            for j, val in enumerate(row):
+                if safe_float(val) is None:
+                    raise ValueError(f"Element [{i+1},{j+1}] musi byc liczba skonczona")
+        raise
+    return _validate_array(matrix)
+
+
+def _validate_array(matrix):
+    """Sprawdza wymiary i wartosci macierzy numpy."""
+    if matrix.ndim != 2 or matrix.size == 0:
+        raise ValueError("Macierz musi byc niepusta tablica dwuwymiarowa")
+    rows, cols = matrix.shape
+    if rows > MAX_MATRIX_SIZE:
+        raise ValueError(f"Maksymalny rozmiar macierzy to {MAX_MATRIX_SIZE} wierszy")
+    if cols > MAX_MATRIX_SIZE:
+        raise ValueError(f"Maksymalny rozmiar macierzy to {MAX_MATRIX_SIZE} kolumn")
+
+    bad = ~np.isfinite(matrix)
+    if bad.any():
+        i, j = np.argwhere(bad)[0]
+        raise ValueError(f"Element [{i+1},{j+1}] musi byc liczba skonczona")
+    bad = np.abs(matrix) > MAX_ELEMENT
+    if bad.any():
+        i, j = np.argwhere(bad)[0]
+        raise ValueError(
+            f"Element [{i+1},{j+1}] musi byc z zakresu [-{MAX_ELEMENT}, {MAX_ELEMENT}]"
+        )
+    return matrix
+
+
+def _read_matrix_lines(file_storage):
+    """
+    Czyta niepuste linie przeslanego pliku i ustala separator kolumn.
+
+    Wiersze w liniach; kolumny rozdzielone spacjami, tabulatorami,
+    przecinkami lub srednikami (przy srednikach dozwolony przecinek
+    dziesietny, np. eksport z polskiego arkusza).
 
-    return np.array(matrix_raw, dtype=float)
+    Returns:
+        tuple (linie, separator) - separator None oznacza biale znaki
+    """
+    try:
+        text = file_storage.read().decode('utf-8-sig')
+    except UnicodeDecodeError:
+        raise ValueError("Plik musi byc tekstem w kodowaniu UTF-8")
+
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        raise ValueError("Plik nie zawiera macierzy")
+
+    delimiter = None
+    if ';' in lines[0]:
+        delimiter = ';'
+        lines = [line.replace(',', '.') for line in lines]
+    elif ',' in lines[0]:
+        delimiter = ','
+    return lines, delimiter
+
+
+def _parse_matrix_file(file_storage):
+    """Wczytuje macierz float z pliku (format jak w _read_matrix_lines)."""
+    lines, delimiter = _read_matrix_lines(file_storage)
+    try:
+        matrix = np.loadtxt(io.StringIO('\n'.join(lines)), delimiter=delimiter,
+                            dtype=float, ndmin=2)
+    except ValueError:
+        raise ValueError(
+            "Niepoprawny format pliku - oczekiwane liczby w wierszach "
+            "o rownej liczbie kolumn"
+        )
+    return _validate_array(matrix)
 
 
-def _gauss_elimination_steps(matrix):
+def _resolve_steps_mode(mode, rows, cols):
+    """
+    Ustala tryb zapisu krokow eliminacji.
+
+    'auto' - pelne kroki dla macierzy do STEPS_MAX_SIZE, powyzej brak
+    'full' - kazda operacja wierszowa (do STEPS_MAX_SIZE)
+    'summary' - jeden krok na kolumne z elementem glownym
+        (do SUMMARY_STEPS_MAX_SIZE)
+    'none' - bez krokow (eliminacja blokowa)
+    """
+    if mode not in VALID_STEP_MODES:
+        raise ValueError(
+            f"Nieprawidlowy tryb krokow: {mode}. "
+            f"Dozwolone: {', '.join(VALID_STEP_MODES)}"
+        )
+    size = max(rows, cols)
+    if mode == 'auto':
+        return 'full' if size <= STEPS_MAX_SIZE else 'none'
+    if mode == 'full' and size > STEPS_MAX_SIZE:
+        raise ValueError(
+            f"Pelne kroki dostepne dla macierzy do {STEPS_MAX_SIZE}x{STEPS_MAX_SIZE}"
+        )
+    if mode == 'summary' and size > SUMMARY_STEPS_MAX_SIZE:
+        raise ValueError(
+            f"Kroki skrocone dostepne dla macierzy do "
+            f"{SUMMARY_STEPS_MAX_SIZE}x{SUMMARY_STEPS_MAX_SIZE}"
+        )
+    return mode
+
+
+def _gauss_elimination_steps(matrix, augment=None, mode='full'):
     """
     Wykonuje eliminacje Gaussa z czesciowym wyborem elementu
     glownego, zwracajac kazdy krok.
 
+    Eliminacja w kolumnie to jedna aktualizacja rzedu 1 wszystkich
+    wierszy naraz. Kroki nie zawieraja migawek macierzy, tylko liste
+    operacji wierszowych (patrz _apply_row_op) - migawki odtwarza
+    _replay_steps z macierzy wejsciowej.
+
+    Args:
+        matrix: macierz numpy
+        augment: opcjonalne kolumny dolaczone z prawej strony (np. I przy
+            odwracaniu) - przechodza te same operacje, ale nie sa
+            pokazywane w krokach
+        mode: 'full', 'summary' lub 'none' (patrz _resolve_steps_mode)
+
     Returns:
-        list of dicts z krokami
+        tuple (kroki, RREF, info) gdzie kazdy krok to dict
+        {description, operation, ops}, a info to dict:
+            pivots - wartosci elementow glownych przed normalizacja
+            swaps - liczba zamian wierszy
+            skipped_max - najwiekszy |element| w pominietych kolumnach
+            augment - przeksztalcone kolumny augment (lub None)
     """
-    m = matrix.copy().astype(float)
-    rows, cols = m.shape
+    if mode == 'none':
+        rref, info = _gauss_jordan_blocked(matrix, augment)
+        return [], rref, info
+
+    rows, cols = matrix.shape
+    if augment is None:
+        m = matrix.copy().astype(float)
+    else:
+        m = np.hstack([matrix, augment]).astype(float)
+    full = mode == 'full'
+    tol = _pivot_tolerance(matrix)
     steps = []
+    pivots = []
+    swaps = 0
+    skipped_max = 0.0
     pivot_row = 0
 
     steps.append({
         'description': 'Macierz wejsciowa',
-        'matrix': _matrix_to_safe_list(m),
         'operation': None,
+        'ops': [],
     })
 
     for col in range(cols):
@@ -129,193 +355,2167 @@ def _gauss_elimination_steps(matrix):
             break
 
         # Znajdz wiersz z max wartoscia w kolumnie
-        max_idx = pivot_row
-        max_val = abs(m[pivot_row, col])
-        for i in range(pivot_row + 1, rows):
-            if abs(m[i, col]) > max_val:
-                max_val = abs(m[i, col])
-                max_idx = i
-
-        if max_val < 1e-12:
+        max_idx = pivot_row + int(np.argmax(np.abs(m[pivot_row:, col])))
+        max_val = abs(m[max_idx, col])
+
+        if max_val < tol:
+            skipped_max = max(skipped_max, max_val)
             continue
 
+        summary = []
+        column_ops = []
+
         # Zamien wiersze
         if max_idx != pivot_row:
             m[[pivot_row, max_idx]] = m[[max_idx, pivot_row]]
-            steps.append({
-                'description': f'Zamiana w{pivot_row+1} <-> w{max_idx+1}',
-                'matrix': _matrix_to_safe_list(m),
-                'operation': 'swap',
-            })
+            swaps += 1
+            description = f'Zamiana w{pivot_row+1} <-> w{max_idx+1}'
+            op = {'op': 'swap', 'i': pivot_row, 'j': max_idx}
+            summary.append(description)
+            column_ops.append(op)
+            if full:
+                steps.append({
+                    'description': description,
+                    'operation': 'swap',
+                    'ops': [op],
+                })
 
         # Normalizuj wiersz glowny
         pivot_val = m[pivot_row, col]
+        pivots.append(float(pivot_val))
         if abs(pivot_val - 1.0) > 1e-12:
             m[pivot_row] = m[pivot_row] / pivot_val
-            steps.append({
-                'description': f'w{pivot_row+1} := w{pivot_row+1} / {pivot_val:.4g}',
-                'matrix': _matrix_to_safe_list(m),
-                'operation': 'scale',
-            })
+            description = f'w{pivot_row+1} := w{pivot_row+1} / {pivot_val:.4g}'
+            op = {'op': 'scale', 'i': pivot_row, 's': float(1.0 / pivot_val)}
+            summary.append(description)
+            column_ops.append(op)
+            if full:
+                steps.append({
+                    'description': description,
+                    'operation': 'scale',
+                    'ops': [op],
+                })
 
-        # Eliminuj inne wiersze
-        for i in range(rows):
-            if i == pivot_row:
-                continue
-            factor = m[i, col]
-            if abs(factor) < 1e-12:
-                continue
-            m[i] = m[i] - factor * m[pivot_row]
+        # Eliminuj inne wiersze: m -= f * w_glowny (aktualizacja rzedu 1)
+        factors = m[:, col].copy()
+        factors[pivot_row] = 0.0
+        factors[np.abs(factors) < 1e-12] = 0.0
+        eliminated = np.flatnonzero(factors)
+        m -= np.outer(factors, m[pivot_row])
+
+        for i in eliminated:
+            op = {'op': 'add', 'i': int(i), 'j': pivot_row, 's': float(-factors[i])}
+            column_ops.append(op)
+            if full:
+                steps.append({
+                    'description': (
+                        f'w{i+1} := w{i+1} - ({factors[i]:.4g}) * w{pivot_row+1}'
+                    ),
+                    'operation': 'eliminate',
+                    'ops': [op],
+                })
+        if not full:
+            if len(eliminated) > 0:
+                summary.append(f'eliminacja w {len(eliminated)} wierszach')
             steps.append({
-                'description': f'w{i+1} := w{i+1} - ({factor:.4g}) * w{pivot_row+1}',
-                'matrix': _matrix_to_safe_list(m),
-                'operation': 'eliminate',
+                'description': f'Kolumna {col+1}: ' + ', '.join(summary or ['bez zmian']),
+                'operation': 'pivot',
+                'ops': column_ops,
             })
 
         pivot_row += 1
 
-    return steps, m
+    info = {
+        'pivots': pivots,
+        'swaps': swaps,
+        'skipped_max': skipped_max,
+        'augment': m[:, cols:] if augment is not None else None,
+    }
+    return steps, m[:, :cols], info
+
+
+def _apply_row_op(m, op):
+    """
+    Wykonuje w miejscu jedna operacje wierszowa z dziennika krokow.
+
+    swap: w_i <-> w_j
+    scale: w_i := s * w_i
+    add: w_i := w_i + s * w_j
+    householder: wiersze k.. := (I - 2 v v^T) * wiersze k..
+    givens: (w_i, w_j) := (c * w_i + s * w_j, -s * w_i + c * w_j)
+    """
+    if op['op'] == 'householder':
+        k = op['k']
+        v = np.asarray(op['v'])
+        m[k:] -= 2.0 * np.outer(v, v @ m[k:])
+        return
+    i = op['i']
+    if op['op'] == 'givens':
+        j, c, s = op['j'], op['c'], op['s']
+        m[[i, j]] = np.array([[c, s], [-s, c]]) @ m[[i, j]]
+        return
+    if op['op'] == 'swap':
+        j = op['j']
+        m[[i, j]] = m[[j, i]]
+    elif op['op'] == 'scale':
+        m[i] *= op['s']
+    elif op['op'] == 'add':
+        m[i] += op['s'] * m[op['j']]
+    else:
+        raise ValueError(f"Nieznana operacja wierszowa: {op['op']}")
+
+
+def _replay_steps(matrix, steps, start=0, stop=None):
+    """
+    Odtwarza migawki macierzy po krokach start..stop (wlacznie).
+
+    Generator par (indeks kroku, macierz) - kopia macierzy wejsciowej
+    przechodzi kolejno operacje z dziennika, a migawki powstaja tylko
+    dla zadanego zakresu.
+    """
+    if stop is None:
+        stop = len(steps) - 1
+    m = np.array(matrix, dtype=float)
+    for index, step in enumerate(steps[:stop + 1]):
+        for op in step['ops']:
+            _apply_row_op(m, op)
+        if index >= start:
+            yield index, m.copy()
+
+
+def _gauss_jordan_blocked(matrix, augment=None):
+    """
+    Eliminacja Gaussa-Jordana blokami kolumn (bez zapisu krokow).
+
+    Wewnatrz panelu BLOCK_SIZE kolumn wykonywane sa te same operacje co
+    w _gauss_elimination_steps (aktualizacje rzedu 1). Ich zlozenie G
+    rozni sie od I tylko w kolumnach wierszy glownych panelu, wiec
+    pozostale kolumny aktualizowane sa jednym mnozeniem macierzy:
+    B := B + (G - I)[:, P] @ B[P, :].
+
+    Returns:
+        tuple (RREF, info) - jak w _gauss_elimination_steps
+    """
+    rows, cols = matrix.shape
+    if augment is None:
+        m = matrix.copy().astype(float)
+    else:
+        m = np.hstack([matrix, augment]).astype(float)
+    tol = _pivot_tolerance(matrix)
+    pivots = []
+    swaps = 0
+    skipped_max = 0.0
+    skipped_cols = []
+    pivot_row = 0
+
+    c0 = 0
+    while c0 < cols and pivot_row < rows:
+        c1 = min(c0 + BLOCK_SIZE, cols)
+        panel = m[:, c0:c1]
+        first_pivot = pivot_row
+        row_swaps = []
+        # Kolumny G dla wierszy glownych panelu
+        g = np.zeros((rows, c1 - c0))
+        k = 0
+
+        for col in range(c0, c1):
+            if pivot_row >= rows:
+                break
+            j = col - c0
+            max_idx = pivot_row + int(np.argmax(np.abs(panel[pivot_row:, j])))
+            max_val = abs(panel[max_idx, j])
+            if max_val < tol:
+                skipped_max = max(skipped_max, max_val)
+                skipped_cols.append(col)
+                continue
+
+            if max_idx != pivot_row:
+                panel[[pivot_row, max_idx]] = panel[[max_idx, pivot_row]]
+                g[[pivot_row, max_idx], :k] = g[[max_idx, pivot_row], :k]
+                row_swaps.append((pivot_row, max_idx))
+                swaps += 1
+
+            g[pivot_row, k] = 1.0
+            pivot_val = panel[pivot_row, j]
+            pivots.append(float(pivot_val))
+            if abs(pivot_val - 1.0) > 1e-12:
+                panel[pivot_row] /= pivot_val
+                g[pivot_row, :k + 1] /= pivot_val
+
+            factors = panel[:, j].copy()
+            factors[pivot_row] = 0.0
+            factors[np.abs(factors) < 1e-12] = 0.0
+            panel -= np.outer(factors, panel[pivot_row])
+            g[:, :k + 1] -= np.outer(factors, g[pivot_row, :k + 1])
+
+            pivot_row += 1
+            k += 1
+
+        if k > 0 or row_swaps:
+            pivot_rows = np.arange(first_pivot, first_pivot + k)
+            g = g[:, :k]
+            g[pivot_rows, np.arange(k)] -= 1.0
+            # Kolumny poza panelem: prawe oraz pominiete po lewej
+            # (w kolumnach glownych po lewej wiersze P maja zera)
+            left = [c for c in skipped_cols if c < c0]
+            for block_cols in (slice(c1, None), left):
+                block = m[:, block_cols]
+                if block.size == 0:
+                    continue
+                for a, b in row_swaps:
+                    block[[a, b]] = block[[b, a]]
+                block += g @ block[pivot_rows]
+                m[:, block_cols] = block
+
+        c0 = c1
+
+    info = {
+        'pivots': pivots,
+        'swaps': swaps,
+        'skipped_max': skipped_max,
+        'augment': m[:, cols:] if augment is not None else None,
+    }
+    return m[:, :cols], info
+
+
+def _pivot_tolerance(matrix):
+    """Prog pomijania kolumny w eliminacji (skalowany rozmiarem i skala)."""
+    scale = float(np.max(np.abs(matrix))) if matrix.size else 0.0
+    noise = ELIMINATION_TOL_FACTOR * max(matrix.shape) * np.finfo(float).eps * scale
+    return max(1e-12, noise)
+
+
+def _elimination_is_conclusive(matrix, info):
+    """
+    Sprawdza, czy rzad z eliminacji jest wiarygodny.
+
+    Elementy glowne musza byc wyraznie niezerowe, a pominiete kolumny
+    zawierac tylko szum zaokraglen (wzgledem skali macierzy). W innym
+    przypadku rzad rozstrzyga SVD (jak np.linalg.matrix_rank).
+    """
+    scale = float(np.max(np.abs(matrix)))
+    if scale == 0.0:
+        return True
+    noise = RANK_NOISE_FACTOR * max(matrix.shape) * np.finfo(float).eps * scale
+    if info['skipped_max'] > noise:
+        return False
+    return all(abs(p) > RANK_PIVOT_RTOL * scale for p in info['pivots'])
 
 
 def _matrix_to_safe_list(m):
     """Konwertuje macierz numpy na liste z bezpiecznymi floatami."""
-    result = []
-    for row in m:
-        safe_row = []
-        for val in row:
-            s = safe_float(val)
-            if s is not None:
-                # Zaokraglij bliskie zeru wartosci
-                if abs(s) < 1e-12:
-                    s = 0.0
-                safe_row.append(round(s, 8))
-            else:
-                safe_row.append(0.0)
-        result.append(safe_row)
-    return result
+    m = np.asarray(m, dtype=float)
+    # NaN/Inf -> 0, zaokraglij bliskie zeru wartosci; od 1e8 wzwyz
+    # zaokraglenie do 8 miejsc i tak nie zmienia liczby zmiennoprzecinkowej
+    safe = np.where(np.isfinite(m), m, 0.0)
+    magnitude = np.abs(safe)
+    with np.errstate(over='ignore', invalid='ignore'):
+        rounded = np.where(magnitude < 1e8, np.round(safe, 8), safe)
+    return np.where(magnitude < 1e-12, 0.0, rounded).tolist()
+
+
+def _compute_eigenvalues(matrix):
+    """
+    Wartosci wlasne macierzy kwadratowej.
+
+    Returns:
+        tuple (wartosci, czy_zespolone) - (None, None) dla macierzy
+        niekwadratowej lub gdy LAPACK nie zbiegnie
+    """
+    if matrix.shape[0] != matrix.shape[1]:
+        return None, None
+    try:
+        eigvals = np.linalg.eigvals(matrix)
+    except np.linalg.LinAlgError:
+        return None, None
+    return _format_eigenvalues(eigvals)
+
+
+def _format_eigenvalues(eigvals):
+    """Formatuje wartosci wlasne: rzeczywiste malejaco lub pary {re, im}."""
+    all_real = np.all(np.isreal(eigvals))
+    if all_real:
+        eigvals_list = sorted(eigvals.real.tolist(), reverse=True)
+        return [round(safe_float(v), 6) if safe_float(v) is not None else 0 for v in eigvals_list], False
+    return [
+        {'re': round(safe_float(v.real), 6) if safe_float(v.real) is not None else 0,
+         'im': round(safe_float(v.imag), 6) if safe_float(v.imag) is not None else 0}
+        for v in eigvals
+    ], True
+
 
+def _format_determinant(sign, logabs):
+    """
+    Wyznacznik z postaci (znak, ln|det|) jak w np.linalg.slogdet.
+
+    Iloczyn elementow glownych przepelnia sie lub zanika do 0 juz dla
+    umiarkowanych macierzy pelnego rzedu, wiec wartosc skladana jest
+    z logarytmu i zaokraglana do 15 cyfr znaczacych (nie miejsc po
+    przecinku - male niezerowe wyznaczniki nie staja sie zerem).
+
+    Returns:
+        tuple (det, det_log): det to float lub None, gdy |det| wychodzi
+        poza zakres float; det_log to {'sign', 'log10_abs'} (None dla 0)
+    """
+    if sign == 0 or not math.isfinite(logabs):
+        return 0.0, None
+    det_log = {'sign': int(sign), 'log10_abs': round(logabs / math.log(10), 8)}
+    try:
+        magnitude = math.exp(logabs)
+    except OverflowError:
+        return None, det_log
+    if magnitude < np.finfo(float).tiny:
+        return None, det_log
+    return int(sign) * float(f'{magnitude:.15g}'), det_log
 
-def _compute_matrix(matrix):
+
+def _compute_matrix(matrix, steps_mode='auto'):
     """
     Oblicza wszystkie wlasciwosci macierzy.
 
+    Args:
+        matrix: macierz numpy
+        steps_mode: tryb zapisu krokow (patrz _resolve_steps_mode)
+
     Returns:
         dict z wynikami gotowymi do jsonify
     """
+    steps_mode = _resolve_steps_mode(steps_mode, *matrix.shape)
+    return dict(_iter_matrix_properties(matrix, steps_mode))
+
+
+def _iter_matrix_properties(matrix, steps_mode):
+    """
+    Wlasciwosci macierzy jako pary (klucz, wartosc) w kolejnosci obliczania.
+
+    Najpierw tanie pola (wymiary, slad, transpozycja), potem wszystko
+    z jednej eliminacji (rzad, wyznacznik, odwrotna, RREF, kroki), na
+    koncu wartosci wlasne - odpowiedz strumieniowa wysyla kazda pare,
+    gdy tylko jest gotowa.
+
+    steps_mode musi byc juz ustalony przez _resolve_steps_mode: blad
+    walidacji po wyslaniu pierwszych par dalby odpowiedz 200 z urwanym
+    wynikiem.
+    """
     rows, cols = matrix.shape
     is_square = rows == cols
 
+    yield 'rows', rows
+    yield 'cols', cols
+    yield 'is_square', is_square
+    yield 'mode', 'float'
+
+    # Slad (tylko kwadratowe)
+    if is_square:
+        trace = float(np.trace(matrix))
+        yield 'trace', round(safe_float(trace), 8) if safe_float(trace) is not None else 0
+    else:
+        yield 'trace', None
+
+    # Macierz transponowana
+    yield 'transpose', _matrix_to_safe_list(matrix.T)
+
+    # Jedna eliminacja Gaussa-Jordana na [A | I]: kroki, RREF, rzad,
+    # wyznacznik i macierz odwrotna z tych samych elementow glownych
+    augment = np.eye(rows) if is_square else None
+    steps, rref, info = _gauss_elimination_steps(matrix, augment, steps_mode)
+    pivots = info['pivots']
+
+    # Rzad (SVD tylko gdy eliminacja nie rozstrzyga)
+    svd = None
+    if _elimination_is_conclusive(matrix, info):
+        rank = len(pivots)
+    else:
+        svd = np.linalg.svd(matrix)
+        s_vals = svd[1]
+        tol = s_vals.max() * max(rows, cols) * np.finfo(float).eps if s_vals.size else 0
+        rank = int(np.count_nonzero(s_vals > tol))
+    yield 'rank', rank
+    yield 'rref', _matrix_to_safe_list(rref)
+
+    # Wyznacznik (tylko kwadratowe): suma logarytmow elementow glownych
+    # i znak permutacji; gdy rzad z SVD jest pelny mimo pominietej
+    # kolumny w eliminacji - slogdet (LAPACK)
+    if is_square:
+        if len(pivots) == rows:
+            pivot_arr = np.asarray(pivots, dtype=float)
+            sign = (-1) ** info['swaps'] * float(np.prod(np.sign(pivot_arr)))
+            logabs = float(np.sum(np.log(np.abs(pivot_arr))))
+        elif rank == rows:
+            sign, logabs = np.linalg.slogdet(matrix)
+        else:
+            sign, logabs = 0.0, -math.inf
+        det, det_log = _format_determinant(sign, logabs)
+    else:
+        det, det_log = None, None
+    yield 'det', det
+    yield 'det_log', det_log
+
+    # Macierz odwrotna (kwadratowa + pelny rzad): prawa polowa [I | A^-1]
+    if is_square and rank == rows:
+        if len(pivots) == rows:
+            inv = info['augment']
+        else:
+            u, s_vals, vt = svd
+            inv = (vt.T / s_vals) @ u.T
+        yield 'inverse', _matrix_to_safe_list(inv)
+    else:
+        yield 'inverse', None
+
+    # Kroki jako dziennik operacji - klient odtwarza migawki od gauss_initial
+    yield 'steps_mode', steps_mode
+    yield 'gauss_initial', _matrix_to_safe_list(matrix) if steps else None
+    yield 'gauss_steps', steps
+
+    # Wartosci wlasne (tylko kwadratowe)
+    eigenvalues, eigenvalues_complex = _compute_eigenvalues(matrix)
+    yield 'eigenvalues', eigenvalues
+    yield 'eigenvalues_complex', eigenvalues_complex
+
+
+def _parse_fraction(value, i, j):
+    """Zamienia element (liczba lub napis typu '1/3', '0.25') na Fraction."""
+    label = f"Element [{i+1},{j+1}]"
+    if isinstance(value, bool):
+        raise ValueError(f"{label} musi byc liczba")
+    if isinstance(value, int):
+        f = Fraction(value)
+    elif isinstance(value, float):
+        if math.isnan(value) or math.isinf(value):
+            raise ValueError(f"{label} musi byc liczba skonczona")
+        # repr daje najkrotszy zapis dziesietny: 0.1 -> 1/10, nie 3602879701896397/2^55
+        f = Fraction(repr(value))
+    elif isinstance(value, str):
+        if len(value) > MAX_FRACTION_LENGTH:
+            raise ValueError(f"{label} jest za dlugi")
+        try:
+            f = Fraction(value.strip())
+        except (ValueError, ZeroDivisionError):
+            raise ValueError(f"{label} musi byc liczba lub ulamkiem p/q")
+    else:
+        raise ValueError(f"{label} musi byc liczba lub ulamkiem p/q")
+    if abs(f) > MAX_ELEMENT:
+        raise ValueError(f"{label} musi byc z zakresu [-{MAX_ELEMENT}, {MAX_ELEMENT}]")
+    return f
+
+
+def _validate_exact_matrix(matrix_raw):
+    """Waliduje macierz dla trybu dokladnego i zwraca liste wierszy Fraction."""
+    _validate_shape(matrix_raw, EXACT_MAX_SIZE)
+    return [
+        [_parse_fraction(val, i, j) for j, val in enumerate(row)]
+        for i, row in enumerate(matrix_raw)
+    ]
+
+
+def _parse_matrix_file_exact(file_storage):
+    """
+    Wczytuje macierz z pliku dla trybu dokladnego.
+
+    Elementy trafiaja do _parse_fraction jako napisy, wiec '1/3' czy
+    '0.1' sa dokladne (np.loadtxt odrzuca ulamki i przechodzi przez float).
+    """
+    lines, delimiter = _read_matrix_lines(file_storage)
+    return _validate_exact_matrix([line.split(delimiter) for line in lines])
+
+
+def _fractions_to_list(rows):
+    """Macierz ulamkow jako lista napisow ('1/3', '-2')."""
+    return [[str(f) for f in row] for row in rows]
+
+
+def _bareiss_gauss_jordan(m, cols, record_steps=True):
+    """
+    Eliminacja Gaussa-Jordana bez ulamkow (wariant Bareissa) w miejscu.
+
+    Dla elementu glownego p i poprzedniego elementu glownego d kazdy inny
+    wiersz przechodzi w_i := (p * w_i - a_i * w_r) / d. Dzielenie jest
+    zawsze dokladne (elementy sa minorami macierzy wejsciowej), wiec
+    wszystko zostaje w liczbach calkowitych, a ich wielkosc ogranicza
+    wyznacznik. Na koncu elementy glowne wszystkich wierszy sa rowne
+    ostatniemu d: RREF = m / d.
+
+    Wyjatek od dziennika operacji (_apply_row_op): kroki zawieraja
+    migawki 'matrix' (liczby calkowite jako napisy) zamiast 'ops'.
+    Krok Bareissa nie jest operacja scale/add z jednym wspolczynnikiem,
+    a odtwarzanie w float (klient, _replay_steps) zgubiloby dokladnosc.
+    Kroki sa tylko na kolumne (do SUMMARY_STEPS_MAX_SIZE), wiec migawki
+    pozostaja male.
+
+    Args:
+        m: lista wierszy int (moze zawierac kolumny augment z prawej)
+        cols: liczba kolumn eliminowanych (i pokazywanych w krokach)
+        record_steps: czy zapisywac migawki po kazdej kolumnie
+
+    Returns:
+        tuple (kroki, info) gdzie kazdy krok to dict
+        {description, operation, matrix}, a info to dict:
+            rank - liczba elementow glownych
+            divisor - ostatni element glowny d (1 gdy rzad 0)
+            swaps - liczba zamian wierszy
+    """
+    rows = len(m)
+    steps = []
+    prev = 1
+    pivot_row = 0
+    swaps = 0
+
+    if record_steps:
+        steps.append({
+            'description': 'Macierz wejsciowa',
+            'operation': None,
+            'matrix': [[str(x) for x in row[:cols]] for row in m],
+        })
+
+    for col in range(cols):
+        if pivot_row >= rows:
+            break
+
+        # Dokladnie: wystarczy pierwszy niezerowy element
+        found = next((i for i in range(pivot_row, rows) if m[i][col] != 0), None)
+        if found is None:
+            continue
+
+        summary = []
+        if found != pivot_row:
+            m[pivot_row], m[found] = m[found], m[pivot_row]
+            swaps += 1
+            summary.append(f'Zamiana w{pivot_row+1} <-> w{found+1}')
+
+        pivot = m[pivot_row][col]
+        pivot_values = m[pivot_row]
+        for i in range(rows):
+            if i != pivot_row:
+                a = m[i][col]
+                m[i] = [(pivot * x - a * y) // prev for x, y in zip(m[i], pivot_values)]
+        summary.append(f'w_i := ({pivot} * w_i - a_i * w{pivot_row+1}) / {prev}')
+
+        if record_steps:
+            steps.append({
+                'description': f'Kolumna {col+1}: ' + ', '.join(summary),
+                'operation': 'pivot',
+                'matrix': [[str(x) for x in row[:cols]] for row in m],
+            })
+
+        prev = pivot
+        pivot_row += 1
+
+    info = {
+        'rank': pivot_row,
+        'divisor': prev,
+        'swaps': swaps,
+    }
+    return steps, info
+
+
+def _compute_matrix_exact(fractions, steps_mode='auto'):
+    """
+    Oblicza wlasciwosci macierzy dokladnie (ulamki).
+
+    Macierz jest mnozona przez wspolny mianownik D, a eliminacja Bareissa
+    na [D*A | I] daje rzad, wyznacznik, RREF i macierz odwrotna w
+    liczbach calkowitych - jedyne dzielenia to koncowe Fraction(x, d).
+    Wartosci wlasne pozostaja przyblizone (np.linalg.eigvals).
+
+    Args:
+        fractions: lista wierszy Fraction (patrz _validate_exact_matrix)
+        steps_mode: 'none' wylacza kroki, pozostale tryby daja jeden
+            krok na kolumne z elementem glownym (migawki, nie dziennik
+            operacji - patrz _bareiss_gauss_jordan)
+
+    Returns:
+        dict z wynikami gotowymi do jsonify (liczby jako napisy 'p/q')
+    """
+    rows, cols = len(fractions), len(fractions[0])
+    is_square = rows == cols
+    steps_mode = _resolve_steps_mode(steps_mode, rows, cols)
+
+    denominator = math.lcm(*(f.denominator for row in fractions for f in row))
+    m = [
+        [f.numerator * (denominator // f.denominator) for f in row]
+        + ([int(i == k) for k in range(rows)] if is_square else [])
+        for i, row in enumerate(fractions)
+    ]
+    steps, info = _bareiss_gauss_jordan(m, cols, steps_mode != 'none')
+    if steps and denominator != 1:
+        steps[0]['description'] = f'Macierz wejsciowa * {denominator} (wspolny mianownik)'
+    rank = info['rank']
+    d = info['divisor']
+
     result = {
         'rows': rows,
         'cols': cols,
         'is_square': is_square,
+        'mode': 'exact',
+        'rank': rank,
     }
 
-    # Rzad
-    rank = int(np.linalg.matrix_rank(matrix))
-    result['rank'] = rank
-
-    # Wyznacznik (tylko kwadratowe)
     if is_square:
-        det = float(np.linalg.det(matrix))
-        result['det'] = round(safe_float(det), 8) if safe_float(det) is not None else 0
+        # det(D*A) = (-1)^zamiany * d, det(A) = det(D*A) / D^n
+        det = Fraction((-1) ** info['swaps'] * d, denominator ** rows) if rank == rows else 0
+        result['det'] = str(det)
+        result['trace'] = str(sum(fractions[i][i] for i in range(rows)))
     else:
         result['det'] = None
-
-    # Slad (tylko kwadratowe)
-    if is_square:
-        trace = float(np.trace(matrix))
-        result['trace'] = round(safe_float(trace), 8) if safe_float(trace) is not None else 0
-    else:
         result['trace'] = None
 
-    # Macierz odwrotna (kwadratowa + pelny rzad)
+    # [D*A | I] -> [d*I | d*(D*A)^-1], wiec A^-1 = D * prawa polowa / d
     if is_square and rank == rows:
-        try:
-            inv = np.linalg.inv(matrix)
-            result['inverse'] = _matrix_to_safe_list(inv)
-        except np.linalg.LinAlgError:
-            result['inverse'] = None
+        result['inverse'] = _fractions_to_list(
+            [[Fraction(denominator * x, d) for x in row[cols:]] for row in m]
+        )
     else:
         result['inverse'] = None
 
-    # Macierz transponowana
-    result['transpose'] = _matrix_to_safe_list(matrix.T)
+    result['transpose'] = _fractions_to_list(list(zip(*fractions)))
 
-    # Wartosci wlasne (tylko kwadratowe)
-    if is_square:
-        try:
-            eigvals = np.linalg.eigvals(matrix)
-            all_real = np.all(np.isreal(eigvals))
-            if all_real:
-                eigvals_list = sorted(eigvals.real.tolist(), reverse=True)
-                result['eigenvalues'] = [round(safe_float(v), 6) if safe_float(v) is not None else 0 for v in eigvals_list]
-                result['eigenvalues_complex'] = False
-            else:
-                result['eigenvalues'] = [
-                    {'re': round(safe_float(v.real), 6) if safe_float(v.real) is not None else 0,
-                     'im': round(safe_float(v.imag), 6) if safe_float(v.imag) is not None else 0}
-                    for v in eigvals
-                ]
-                result['eigenvalues_complex'] = True
-        except np.linalg.LinAlgError:
-            result['eigenvalues'] = None
-            result['eigenvalues_complex'] = None
-    else:
-        result['eigenvalues'] = None
-        result['eigenvalues_complex'] = None
+    float_matrix = np.array(fractions, dtype=float)
+    result['eigenvalues'], result['eigenvalues_complex'] = _compute_eigenvalues(float_matrix)
 
-    # Eliminacja Gaussa krok po kroku
-    steps, rref = _gauss_elimination_steps(matrix)
+    result['steps_mode'] = 'none' if steps_mode == 'none' else 'bareiss'
+    result['gauss_initial'] = None
     result['gauss_steps'] = steps
-    result['rref'] = _matrix_to_safe_list(rref)
+    result['rref'] = _fractions_to_list(
+        [[Fraction(x, d) for x in row[:cols]] for row in m]
+    )
 
     return result
 
 
-@app.route('/')
-def index():
-    """Strona glowna"""
-    return render_template('index.html')
+def _validate_batch(matrices_raw):
+    """
+    Waliduje liste macierzy i grupuje je wedlug wymiarow.
+
+    Returns:
+        dict {(wiersze, kolumny): (indeksy, stos numpy k x wiersze x kolumny)}
+    """
+    if not isinstance(matrices_raw, list) or len(matrices_raw) < 1:
+        raise ValueError("Pole 'matrices' musi byc niepusta lista macierzy")
+    if len(matrices_raw) > MAX_BATCH_MATRICES:
+        raise ValueError(f"Maksymalna liczba macierzy to {MAX_BATCH_MATRICES}")
 
+    groups = {}
+    for k, matrix_raw in enumerate(matrices_raw):
+        try:
+            _validate_shape(matrix_raw, BATCH_MAX_SIZE)
+        except ValueError as e:
+            raise ValueError(f"Macierz {k+1}: {e}")
+        groups.setdefault((len(matrix_raw), len(matrix_raw[0])), []).append(k)
 
-@app.route('/api/compute', methods=['POST'])
-def compute():
+    stacks = {}
+    for shape, indices in groups.items():
+        try:
+            stack = np.array([matrices_raw[k] for k in indices], dtype=float)
+            valid = np.isfinite(stack).all() and not (np.abs(stack) > MAX_ELEMENT).any()
+        except (ValueError, TypeError):
+            valid = False
+        if not valid:
+            # Wolna sciezka tylko po to, by wskazac bledna macierz i element
+            for k in indices:
+                try:
+                    _validate_matrix(matrices_raw[k])
+                except (ValueError, TypeError) as e:
+                    raise ValueError(f"Macierz {k+1}: {e}")
+        stacks[shape] = (indices, stack)
+    return stacks
+
+
+def _compute_batch_group(stack):
     """
-    Oblicza wlasciwosci macierzy.
+    Oblicza wlasciwosci stosu macierzy tego samego ksztaltu.
 
-    Request JSON:
-        matrix: 2D tablica
+    Kazda wlasnosc to jedno wywolanie numpy na calym stosie (k, n, m):
+    matrix_rank, slogdet, trace, inv (tylko macierze pelnego rzedu)
+    i eigvals.
 
-    Response JSON:
-        rows, cols, is_square, rank, det, trace,
-        inverse, transpose, eigenvalues, eigenvalues_complex,
-        gauss_steps, rref
+    Returns:
+        lista dict (w kolejnosci stosu) z polami rows, cols, is_square,
+        rank, det, det_log, trace, inverse, eigenvalues, eigenvalues_complex
     """
-    try:
-        data = _validate_request_json()
+    k, rows, cols = stack.shape
+    is_square = rows == cols
+    ranks = np.linalg.matrix_rank(stack)
+    results = [
+        {'rows': rows, 'cols': cols, 'is_square': is_square, 'rank': int(rank)}
+        for rank in ranks
+    ]
 
-        if 'matrix' not in data:
-            raise ValueError("Brak wymaganego pola 'matrix'")
+    if not is_square:
+        for result in results:
+            result.update({
+                'det': None, 'det_log': None, 'trace': None, 'inverse': None,
+                'eigenvalues': None, 'eigenvalues_complex': None,
+            })
+        return results
 
-        matrix = _validate_matrix(data['matrix'])
-        result = _compute_matrix(matrix)
-        result['success'] = True
-        return jsonify(result)
+    full_rank = ranks == rows
+    signs, logabs = np.linalg.slogdet(stack)
+    signs = np.where(full_rank, signs, 0.0)
+    traces = np.trace(stack, axis1=1, axis2=2)
 
-    except (ValueError, TypeError) as e:
-        return jsonify({'success': False, 'error': str(e)}), 400
-    except Exception:
-        return jsonify({
-            'success': False,
-            'error': 'Nieoczekiwany blad serwera'
-        }), 500
+    inverses = [None] * k
+    invertible = np.flatnonzero(full_rank)
+    if invertible.size:
+        try:
+            inverse_list = _matrix_to_safe_list(np.linalg.inv(stack[invertible]))
+        except np.linalg.LinAlgError:
+            # Pojedyncza macierz osobliwa numerycznie - reszta osobno
+            inverse_list = []
+            for g in invertible:
+                try:
+                    inverse_list.append(_matrix_to_safe_list(np.linalg.inv(stack[g])))
+                except np.linalg.LinAlgError:
+                    inverse_list.append(None)
+        for g, inverse in zip(invertible, inverse_list):
+            inverses[g] = inverse
 
+    try:
+        eigvals = np.linalg.eigvals(stack)
+    except np.linalg.LinAlgError:
+        eigvals = None
 
-@app.route('/api/presets')
-def presets():
-    """Zwraca liste dostepnych presetow."""
-    return jsonify({'success': True, 'presets': PRESETS})
+    for g, result in enumerate(results):
+        trace = safe_float(traces[g])
+        result['det'], result['det_log'] = _format_determinant(signs[g], logabs[g])
+        result['trace'] = round(trace, 8) if trace is not None else 0
+        result['inverse'] = inverses[g]
+        if eigvals is not None:
+            result['eigenvalues'], result['eigenvalues_complex'] = _format_eigenvalues(eigvals[g])
+        else:
+            result['eigenvalues'], result['eigenvalues_complex'] = _compute_eigenvalues(stack[g])
+    return results
+
+
+def _lu_doolittle(matrix, record_steps):
+    """
+    Rozklad PA = LU (Doolittle, czesciowy wybor elementu glownego).
+
+    Jedno przejscie eliminacji: mnozniki trafiaja do L, przeksztalcona
+    macierz to U, a zamiany wierszy do P. Dziennik (jeden krok na kolumne)
+    to operacje swap/add, ktore odtworzone na A daja U. Dla m > n, jak
+    w LAPACK, L ma n kolumn, a U n wierszy.
+    """
+    rows, cols = matrix.shape
+    m = matrix.astype(float)
+    lower = np.eye(rows)
+    perm = np.arange(rows)
+    tol = _pivot_tolerance(matrix)
+    steps = []
+
+    for k in range(min(rows - 1, cols)):
+        ops = []
+        p = k + int(np.argmax(np.abs(m[k:, k])))
+        if p != k:
+            m[[k, p]] = m[[p, k]]
+            perm[[k, p]] = perm[[p, k]]
+            lower[[k, p], :k] = lower[[p, k], :k]
+            ops.append({'op': 'swap', 'i': k, 'j': p})
+        if abs(m[k, k]) >= tol:
+            factors = m[k + 1:, k] / m[k, k]
+            factors[np.abs(factors) < 1e-12] = 0.0
+            lower[k + 1:, k] = factors
+            m[k + 1:] -= np.outer(factors, m[k])
+            m[k + 1:, k] = 0.0
+            ops.extend(
+                {'op': 'add', 'i': k + 1 + int(i), 'j': k, 's': float(-factors[i])}
+                for i in np.flatnonzero(factors)
+            )
+        if record_steps:
+            steps.append({
+                'description': f'Kolumna {k+1}: l_ik = a_ik / a_kk, w_i := w_i - l_ik * w{k+1}',
+                'operation': 'pivot',
+                'ops': ops,
+            })
+
+    k = min(rows, cols)
+    return {'P': np.eye(rows)[perm], 'L': lower[:, :k], 'U': m[:k]}, steps
+
+
+def _qr_reflect(matrix, algorithm, record_steps):
+    """
+    Rozklad A = QR odbiciami Householdera lub obrotami Givensa.
+
+    Przeksztalcenia dzialaja na [A | I], wiec w jednym przejsciu powstaja
+    R (lewa czesc) i Q^T (prawa). Ostatni krok zmienia znaki wierszy tak,
+    by przekatna R byla nieujemna - rozklad jest wtedy jednoznaczny
+    i zgodny z wynikiem LAPACK.
+    """
+    rows, cols = matrix.shape
+    m = np.hstack([matrix.astype(float), np.eye(rows)])
+    steps = []
+
+    for k in range(min(rows - 1, cols)):
+        ops = []
+        if algorithm == 'householder':
+            x = m[k:, k]
+            norm = np.linalg.norm(x)
+            if norm > 0 and np.any(x[1:] != 0):
+                v = x.copy()
+                v[0] += math.copysign(norm, x[0])
+                v /= np.linalg.norm(v)
+                op = {'op': 'householder', 'k': k, 'v': v.tolist()}
+                _apply_row_op(m, op)
+                m[k + 1:, k] = 0.0
+                ops.append(op)
+            description = f'Kolumna {k+1}: odbicie H = I - 2vv^T zeruje a_ik dla i > {k+1}'
+        else:
+            for i in range(k + 1, rows):
+                if m[i, k] == 0:
+                    continue
+                r = math.hypot(m[k, k], m[i, k])
+                op = {'op': 'givens', 'i': k, 'j': i,
+                      'c': float(m[k, k] / r), 's': float(m[i, k] / r)}
+                _apply_row_op(m, op)
+                m[i, k] = 0.0
+                ops.append(op)
+            description = f'Kolumna {k+1}: {len(ops)} obrotow Givensa w plaszczyznach (w{k+1}, w_i)'
+        if record_steps:
+            steps.append({'description': description, 'operation': algorithm, 'ops': ops})
+
+    ops = [
+        {'op': 'scale', 'i': i, 's': -1.0}
+        for i in range(min(rows, cols)) if m[i, i] < 0
+    ]
+    for op in ops:
+        _apply_row_op(m, op)
+    if record_steps and ops:
+        steps.append({'description': 'Znaki: r_kk >= 0', 'operation': 'scale', 'ops': ops})
+
+    return {'Q': m[:, cols:].T, 'R': m[:, :cols]}, steps
+
+
+def _cholesky_elimination(matrix, record_steps):
+    """
+    Rozklad A = L L^T jako eliminacja Gaussa bez zamian wierszy.
+
+    Po wyzerowaniu kolumny k ponizej przekatnej wiersz k jest dzielony
+    przez sqrt(a_kk); macierz koncowa to L^T, wiec dziennik add/scale
+    odtworzony na A daje L^T.
+    """
+    if not np.allclose(matrix, matrix.T, rtol=1e-10, atol=1e-12):
+        raise ValueError("Rozklad Cholesky'ego wymaga macierzy symetrycznej")
+    n = matrix.shape[0]
+    m = matrix.astype(float)
+    tol = _pivot_tolerance(matrix)
+    steps = []
+
+    for k in range(n):
+        pivot = m[k, k]
+        if pivot <= tol:
+            raise ValueError("Rozklad Cholesky'ego wymaga macierzy dodatnio okreslonej")
+        factors = m[k + 1:, k] / pivot
+        m[k + 1:] -= np.outer(factors, m[k])
+        m[k + 1:, k] = 0.0
+        ops = [
+            {'op': 'add', 'i': k + 1 + int(i), 'j': k, 's': float(-factors[i])}
+            for i in np.flatnonzero(factors)
+        ]
+        scale = {'op': 'scale', 'i': k, 's': float(1.0 / math.sqrt(pivot))}
+        _apply_row_op(m, scale)
+        ops.append(scale)
+        if record_steps:
+            steps.append({
+                'description': f'Kolumna {k+1}: eliminacja ponizej, w{k+1} := w{k+1} / sqrt({pivot:.4g})',
+                'operation': 'pivot',
+                'ops': ops,
+            })
+
+    return {'L': m.T.copy()}, steps
+
+
+def _decompose_lapack(matrix, kind):
+    """Te same rozklady bez dziennika - bezposrednio z LAPACK (scipy/numpy)."""
+    if kind == 'lu':
+        p, lower, upper = sla.lu(matrix)
+        return {'P': p.T, 'L': lower, 'U': upper}
+    if kind == 'qr':
+        q, r = sla.qr(matrix)
+        signs = np.where(np.diag(r) < 0, -1.0, 1.0)
+        signs = np.concatenate([signs, np.ones(r.shape[0] - signs.size)])
+        return {'Q': q * signs, 'R': r * signs[:, None]}
+    if kind == 'cholesky':
+        if not np.allclose(matrix, matrix.T, rtol=1e-10, atol=1e-12):
+            raise ValueError("Rozklad Cholesky'ego wymaga macierzy symetrycznej")
+        try:
+            return {'L': sla.cholesky(matrix, lower=True)}
+        except np.linalg.LinAlgError:
+            raise ValueError("Rozklad Cholesky'ego wymaga macierzy dodatnio okreslonej")
+    u, sigma, vt = np.linalg.svd(matrix)
+    return {'U': u, 'S': sigma, 'Vt': vt}
+
+
+def _reconstruct(kind, factors):
+    """Iloczyn czynnikow - do kontroli bledu rozkladu."""
+    if kind == 'lu':
+        return factors['P'].T @ factors['L'] @ factors['U']
+    if kind == 'qr':
+        return factors['Q'] @ factors['R']
+    if kind == 'cholesky':
+        return factors['L'] @ factors['L'].T
+    u, sigma, vt = factors['U'], factors['S'], factors['Vt']
+    k = sigma.size
+    return (u[:, :k] * sigma) @ vt[:k]
+
+
+def _encode_binary(array):
+    """Tablica jako {dtype, shape, data} - surowe bajty float64 LE w base64."""
+    array = np.ascontiguousarray(array, dtype='<f8')
+    return {
+        'dtype': '<f8',
+        'shape': list(array.shape),
+        'data': base64.b64encode(array.tobytes()).decode('ascii'),
+    }
+
+
+def _cofactor_expansion(entries, strategy='row'):
+    """
+    Wyznacznik z rozwiniecia Laplace'a z zapamietywaniem minorow.
+
+    Minor jest jednoznacznie wyznaczony przez zbior pozostalych wierszy
+    i kolumn, wiec kluczem jest para masek bitowych (wiersze, kolumny).
+    Kazdy minor liczony jest raz; ponowne odwolania tylko zwiekszaja
+    licznik uzyc. Skladniki z zerowym elementem sa pomijane.
+
+    Args:
+        entries: lista wierszy (Fraction lub int) macierzy kwadratowej
+        strategy: wybor linii rozwiniecia (patrz COFACTOR_STRATEGIES)
+
+    Returns:
+        tuple (wyznacznik, wezly, statystyki) gdzie wezly to lista
+        roznych minorow (dzieci przed rodzicami, korzen ostatni), kazdy
+        z polami id, rows, cols, line, terms, uses, a statystyki to
+        dict z polami reused (trafienia w pamiec) i terms (iloczyny a * C)
+    """
+    n = len(entries)
+    memo = {}
+    nodes = []
+    values = []
+    stats = {'reused': 0, 'terms': 0}
+
+    def expand(row_mask, col_mask):
+        key = (row_mask, col_mask)
+        if key in memo:
+            stats['reused'] += 1
+            nodes[memo[key]]['uses'] += 1
+            return memo[key]
+
+        rows = [i for i in range(n) if row_mask >> i & 1]
+        cols = [j for j in range(n) if col_mask >> j & 1]
+        node = {'rows': rows, 'cols': cols, 'line': None, 'terms': [], 'uses': 1}
+
+        if len(rows) == 1:
+            det = entries[rows[0]][cols[0]]
+        else:
+            axis, pos = 'row', 0
+            if strategy == 'sparse':
+                zeros = [(sum(entries[i][j] == 0 for j in cols), 'row', p)
+                         for p, i in enumerate(rows)]
+                zeros += [(sum(entries[i][j] == 0 for i in rows), 'col', p)
+                          for p, j in enumerate(cols)]
+                _, axis, pos = max(zeros, key=lambda z: z[0])
+
+            det = 0
+            others = cols if axis == 'row' else rows
+            for q, other in enumerate(others):
+                i, j = (rows[pos], other) if axis == 'row' else (other, cols[pos])
+                entry = entries[i][j]
+                if entry == 0:
+                    continue
+                sign = -1 if (pos + q) % 2 else 1
+                child = expand(row_mask & ~(1 << i), col_mask & ~(1 << j))
+                det += sign * entry * values[child]
+                stats['terms'] += 1
+                node['terms'].append({
+                    'row': i, 'col': j, 'entry': str(entry), 'sign': sign, 'minor': child,
+                })
+            node['line'] = {'axis': axis, 'index': rows[pos] if axis == 'row' else cols[pos]}
+
+        node['id'] = len(nodes)
+        node['det'] = str(det)
+        nodes.append(node)
+        values.append(det)
+        memo[key] = node['id']
+        return node['id']
+
+    full = (1 << n) - 1
+    root = expand(full, full)
+    return values[root], nodes, stats
+
+
+def _naive_expansion_size(nodes):
+    """Liczba wywolan rekurencji bez pamieci - suma po drzewie rozwiniecia."""
+    size = [0] * len(nodes)
+    for node in nodes:
+        size[node['id']] = 1 + sum(size[term['minor']] for term in node['terms'])
+    return size[-1]
+
+
+def _lu_determinant(matrix):
+    """Wyznacznik z rozkladu LU (LAPACK) do kontroli rozwiniecia."""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', LinAlgWarning)
+        lu, piv = lu_factor(matrix, check_finite=False)
+    swaps = int(np.count_nonzero(piv != np.arange(piv.size)))
+    return (-1) ** swaps * float(np.prod(np.diag(lu)))
+
+
+def _power_iterates(matrix, x, tol, max_iter, solve=None):
+    """
+    Iteracja potegowa (solve=None) lub odwrotna (solve - rozwiazanie
+    ukladu z A - sigma*I).
+
+    Generator krotek (k, x, lambda, reszta): x znormalizowany, lambda to
+    iloraz Rayleigha x^T A x, reszta = ||Ax - lambda*x|| / ||A||.
+    Konczy sie po osiagnieciu tol lub max_iter iteracji.
+    """
+    scale = np.linalg.norm(matrix) or 1.0
+    x = x / (np.linalg.norm(x) or 1.0)
+    for k in range(1, max_iter + 1):
+        y = matrix @ x if solve is None else solve(x)
+        norm = np.linalg.norm(y)
+        if norm == 0 or not np.isfinite(norm):
+            # Ax = 0: x jest wektorem wlasnym dla lambda = 0
+            yield k, x, 0.0, 0.0
+            return
+        x = y / norm
+        ax = matrix @ x
+        eigenvalue = float(x @ ax)
+        residual = float(np.linalg.norm(ax - eigenvalue * x)) / scale
+        yield k, x, eigenvalue, residual
+        if residual <= tol:
+            return
+
+
+def _is_complex_block(block):
+    """Czy blok 2x2 ma pare zespolonych wartosci wlasnych."""
+    (a, b), (c, d) = block
+    return (a - d) ** 2 / 4 + b * c < 0
+
+
+def _qr_converged(h, atol):
+    """
+    Czy macierz Hessenberga jest juz (quasi)trojkatna: kazdy element
+    poddiagonali <= atol albo nalezy do odizolowanego bloku 2x2 z para
+    zespolona (takie bloki nie znikaja w arytmetyce rzeczywistej).
+    """
+    n = h.shape[0]
+    i = 0
+    while i < n - 1:
+        if abs(h[i + 1, i]) <= atol:
+            i += 1
+        elif ((i + 2 >= n or abs(h[i + 2, i + 1]) <= atol)
+              and _is_complex_block(h[i:i + 2, i:i + 2])):
+            i += 2
+        else:
+            return False
+    return True
+
+
+def _deflate(h, active, atol):
+    """Odcina zbiezne wartosci (1x1 lub blok 2x2) z dolu aktywnego bloku."""
+    while active > 1:
+        if abs(h[active - 1, active - 2]) <= atol:
+            h[active - 1, active - 2] = 0.0
+            active -= 1
+        elif ((active == 2 or abs(h[active - 2, active - 3]) <= atol)
+              and _is_complex_block(h[active - 2:active, active - 2:active])):
+            if active > 2:
+                h[active - 2, active - 3] = 0.0
+            active -= 2
+        else:
+            break
+    return active
+
+
+def _wilkinson_shift(block):
+    """Wartosc wlasna bloku 2x2 blizsza d (dla pary zespolonej - czesc rzeczywista)."""
+    (a, b), (c, d) = block
+    half = (a - d) / 2
+    disc = half ** 2 + b * c
+    if disc < 0:
+        return (a + d) / 2
+    denominator = abs(half) + math.sqrt(disc)
+    if denominator == 0:
+        return d
+    return d - math.copysign(1.0, half) * b * c / denominator
+
+
+def _qr_iterates(matrix, tol, max_iter, shifted):
+    """
+    Algorytm QR: H_(k+1) = R Q (+ mu I) dla H_k - mu I = Q R.
+
+    Macierz jest najpierw sprowadzana do postaci Hessenberga (podobnej),
+    wiec zbieznosc widac na poddiagonali. Wersja z przesunieciem uzywa
+    przesuniecia Wilkinsona i odcina zbiezne wartosci z dolu; gdy dolny
+    blok 2x2 ma pare zespolona, robi krok z podwojnym przesunieciem
+    (Francis, jawnie: Q z rozkladu H^2 - sH + tI, H := Q^T H Q), ktory
+    obejmuje obie sprzezone wartosci bez arytmetyki zespolonej.
+
+    Po QR_EXCEPTIONAL_SHIFT_PERIOD iteracjach bez odciecia (np. macierz
+    permutacji cyklicznej, dla ktorej przesuniecia sa symetryczne wzgledem
+    widma i nic sie nie zmienia) wykonywany jest krok z przesunieciem
+    wyjatkowym jak w LAPACK (dlahqr): mu = h_nn + 0.75 * (|h_n,n-1| +
+    |h_n-1,n-2|).
+
+    Generator krotek (k, H, mu, rozmiar aktywnego bloku, podwojne);
+    H jest modyfikowana w miejscu.
+    """
+    h = sla.hessenberg(matrix)
+    n = h.shape[0]
+    atol = tol * (np.linalg.norm(matrix) or 1.0)
+    active = n
+    stalled = 0
+    yield 0, h, 0.0, active, False
+
+    for k in range(1, max_iter + 1):
+        shift = 0.0
+        double = False
+        if shifted:
+            deflated = _deflate(h, active, atol)
+            stalled = 0 if deflated < active else stalled + 1
+            active = deflated
+            if active <= 1:
+                return
+            block = h[active - 2:active, active - 2:active]
+            if stalled and stalled % QR_EXCEPTIONAL_SHIFT_PERIOD == 0:
+                spread = abs(h[active - 1, active - 2])
+                if active > 2:
+                    spread += abs(h[active - 2, active - 3])
+                shift = h[active - 1, active - 1] + 0.75 * spread
+            else:
+                double = active > 2 and _is_complex_block(block)
+                shift = np.trace(block) / 2 if double else _wilkinson_shift(block)
+        elif _qr_converged(h, atol):
+            return
+
+        eye = np.eye(active)
+        leading = h[:active, :active]
+        if double:
+            product = leading @ leading - 2 * shift * leading + np.linalg.det(block) * eye
+            q, _ = np.linalg.qr(product)
+            h[:active, :active] = np.triu(q.T @ leading @ q, -1)
+        else:
+            q, r = np.linalg.qr(leading - shift * eye)
+            h[:active, :active] = np.triu(r @ q, -1) + shift * eye
+        h[:active, active:] = q.T @ h[:active, active:]
+        yield k, h, shift, active, double
+
+
+def _quasi_triangular_eigenvalues(h, atol):
+    """Wartosci wlasne z przekatnej (1x1) i blokow 2x2 z para zespolona."""
+    n = h.shape[0]
+    eigenvalues = []
+    i = 0
+    while i < n:
+        if (i + 1 < n and abs(h[i + 1, i]) > atol
+                and _is_complex_block(h[i:i + 2, i:i + 2])):
+            eigenvalues.extend(np.linalg.eigvals(h[i:i + 2, i:i + 2]))
+            i += 2
+        else:
+            eigenvalues.append(h[i, i])
+            i += 1
+    return np.array(eigenvalues)
+
+
+def _iter_eigen_ndjson(matrix, method, tol, max_iter, every, x0=None, solve=None):
+    """
+    Strumien NDJSON iteracji wartosci wlasnych.
+
+    Linie: {type: 'start'}, {type: 'iterate', k, ...} co every iteracji
+    (i zawsze ostatnia), na koniec {type: 'result'} lub {type: 'error'}.
+    """
+    n = matrix.shape[0]
+    with_matrix = n <= STEPS_MAX_SIZE
+    yield json.dumps({'type': 'start', 'method': method, 'n': n,
+                      'tol': tol, 'max_iter': max_iter}) + '\n'
+    try:
+        last = None
+        if method in ('power', 'inverse'):
+            pending = None
+            for k, x, eigenvalue, residual in _power_iterates(matrix, x0, tol, max_iter, solve):
+                # Znak ustalony przez najwieksza skladowa - bez migotania dla lambda < 0
+                vector = x * (1.0 if x[np.argmax(np.abs(x))] >= 0 else -1.0)
+                last = (k, vector, eigenvalue, residual)
+                pending = json.dumps({
+                    'type': 'iterate',
+                    'k': k,
+                    'eigenvalue': safe_float(eigenvalue),
+                    'residual': safe_float(residual),
+                    'vector': _matrix_to_safe_list(vector),
+                }) + '\n'
+                if k % every == 0:
+                    yield pending
+                    pending = None
+            if pending is not None:
+                yield pending
+            k, vector, eigenvalue, residual = last
+            yield json.dumps({
+                'type': 'result',
+                'method': method,
+                'converged': bool(residual <= tol),
+                'iterations': k,
+                'eigenvalue': safe_float(eigenvalue),
+                'eigenvector': _matrix_to_safe_list(vector),
+                'residual': safe_float(residual),
+            }) + '\n'
+            return
+
+        shifted = method == 'shifted_qr'
+        atol = tol * (np.linalg.norm(matrix) or 1.0)
+        pending = None
+        for k, h, shift, active, double in _qr_iterates(matrix, tol, max_iter, shifted):
+            subdiagonal = np.abs(np.diag(h, -1))
+            line = {
+                'type': 'iterate',
+                'k': k,
+                'diagonal': _matrix_to_safe_list(np.diag(h)),
+                'subdiagonal': _matrix_to_safe_list(subdiagonal),
+                'off_norm': safe_float(np.linalg.norm(subdiagonal)),
+            }
+            if shifted:
+                line['shift'] = safe_float(shift)
+                line['double_shift'] = bool(double)
+                line['active'] = active
+            if with_matrix:
+                line['matrix'] = _matrix_to_safe_list(h)
+            last = (k, h)
+            pending = json.dumps(line) + '\n'
+            if k % every == 0:
+                yield pending
+                pending = None
+        if pending is not None:
+            yield pending
+        k, h = last
+        eigenvalues, is_complex = _format_eigenvalues(_quasi_triangular_eigenvalues(h, atol))
+        yield json.dumps({
+            'type': 'result',
+            'method': method,
+            'converged': bool(_qr_converged(h, atol)),
+            'iterations': k,
+            'eigenvalues': eigenvalues,
+            'eigenvalues_complex': is_complex,
+        }) + '\n'
+
+    except (np.linalg.LinAlgError, ValueError) as e:
+        yield json.dumps({'type': 'error', 'error': str(e)}) + '\n'
+    except Exception:
+        yield json.dumps({'type': 'error', 'error': 'Nieoczekiwany blad serwera'}) + '\n'
+
+
+_lu_cache = OrderedDict()
+_lu_cache_lock = threading.Lock()
+
+
+def _validate_vector(vector_raw, n, name):
+    """Waliduje wektor dlugosci n i zwraca tablice numpy."""
+    if not isinstance(vector_raw, list) or len(vector_raw) != n:
+        raise ValueError(f"{name} musi byc lista {n} liczb")
+    try:
+        vector = np.array(vector_raw, dtype=float)
+    except (ValueError, TypeError):
+        raise ValueError(f"{name} musi zawierac tylko liczby")
+    if vector.ndim != 1:
+        raise ValueError(f"{name} musi byc lista {n} liczb")
+    bad = ~np.isfinite(vector)
+    if bad.any():
+        raise ValueError(f"{name}[{int(np.argmax(bad)) + 1}] musi byc liczba skonczona")
+    return vector
+
+
+def _lu_factorization(matrix):
+    """
+    Faktoryzacja LU (scipy lu_factor) z pamiecia podreczna po zawartosci.
+
+    Returns:
+        tuple ((lu, piv), czy_z_pamieci)
+    """
+    key = _cache_key(matrix, 'lu', None)
+    with _lu_cache_lock:
+        factors = _lu_cache.get(key)
+        if factors is not None:
+            _lu_cache.move_to_end(key)
+            return factors, True
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', LinAlgWarning)
+        lu, piv = lu_factor(matrix, check_finite=False)
+    diag = np.abs(np.diag(lu))
+    if diag.min() <= _pivot_tolerance(matrix):
+        raise ValueError("Macierz osobliwa - uklad nie ma jednoznacznego rozwiazania")
+
+    with _lu_cache_lock:
+        _lu_cache[key] = (lu, piv)
+        while len(_lu_cache) > LU_CACHE_SIZE:
+            _lu_cache.popitem(last=False)
+    return (lu, piv), False
+
+
+def _iterate_linear(step, matrix, b, x, tol, max_iter):
+    """
+    Wspolna petla metod iteracyjnych z zapisem reszt.
+
+    step(x, r) zwraca nastepne przyblizenie na podstawie biezacego x
+    i reszty r = b - Ax (jedno mnozenie macierz-wektor na iteracje).
+
+    Returns:
+        tuple (x, slad wzglednych reszt, status) gdzie status to
+        'converged', 'max_iter' lub 'diverged'
+    """
+    norm_b = np.linalg.norm(b) or 1.0
+    r = b - matrix @ x
+    trace = [float(np.linalg.norm(r) / norm_b)]
+    for _ in range(max_iter):
+        if trace[-1] <= tol:
+            return x, trace, 'converged'
+        x = step(x, r)
+        r = b - matrix @ x
+        residual = float(np.linalg.norm(r) / norm_b)
+        if not math.isfinite(residual) or residual > DIVERGENCE_FACTOR * max(trace[0], 1.0):
+            trace.append(residual if math.isfinite(residual) else None)
+            return x, trace, 'diverged'
+        trace.append(residual)
+    return x, trace, 'converged' if trace[-1] <= tol else 'max_iter'
+
+
+def _solve_jacobi(matrix, b, x, tol, max_iter):
+    """Jacobi: x := x + D^-1 (b - Ax)."""
+    diag = np.diag(matrix)
+    if np.any(diag == 0):
+        raise ValueError("Metoda Jacobiego wymaga niezerowej przekatnej")
+    return _iterate_linear(lambda x, r: x + r / diag, matrix, b, x, tol, max_iter)
+
+
+def _solve_gauss_seidel(matrix, b, x, tol, max_iter):
+    """
+    Gauss-Seidel: x := x + (D + L)^-1 (b - Ax).
+
+    Podstawienie w przod po dolnym trojkacie (solve_triangular) zamiast
+    petli po wierszach - ten sam wynik co klasyczny zapis element po elemencie.
+    """
+    if np.any(np.diag(matrix) == 0):
+        raise ValueError("Metoda Gaussa-Seidla wymaga niezerowej przekatnej")
+    lower = np.tril(matrix)
+    return _iterate_linear(
+        lambda x, r: x + solve_triangular(lower, r, lower=True, check_finite=False),
+        matrix, b, x, tol, max_iter,
+    )
+
+
+def _solve_cg(matrix, b, x, tol, max_iter):
+    """Gradienty sprzezone (tylko macierze symetryczne dodatnio okreslone)."""
+    if not np.allclose(matrix, matrix.T, rtol=1e-10, atol=1e-12):
+        raise ValueError("Metoda gradientow sprzezonych wymaga macierzy symetrycznej")
+    norm_b = np.linalg.norm(b) or 1.0
+    r = b - matrix @ x
+    p = r.copy()
+    rr = float(r @ r)
+    trace = [math.sqrt(rr) / norm_b]
+    for _ in range(max_iter):
+        if trace[-1] <= tol:
+            return x, trace, 'converged'
+        ap = matrix @ p
+        pap = float(p @ ap)
+        if pap <= 0:
+            raise ValueError(
+                "Metoda gradientow sprzezonych wymaga macierzy dodatnio okreslonej"
+            )
+        alpha = rr / pap
+        x = x + alpha * p
+        r = r - alpha * ap
+        rr_next = float(r @ r)
+        trace.append(math.sqrt(rr_next) / norm_b)
+        p = r + (rr_next / rr) * p
+        rr = rr_next
+    return x, trace, 'converged' if trace[-1] <= tol else 'max_iter'
+
+
+ITERATIVE_SOLVERS = {
+    'jacobi': _solve_jacobi,
+    'gauss_seidel': _solve_gauss_seidel,
+    'cg': _solve_cg,
+}
+
+
+@app.errorhandler(RequestEntityTooLarge)
+def request_too_large(error):
+    """Zbyt duze zadanie (MAX_CONTENT_LENGTH) - blad JSON jak w API."""
+    return jsonify({
+        'success': False,
+        'error': (
+            f"Zadanie przekracza limit {app.config['MAX_CONTENT_LENGTH'] // (1024 * 1024)} MB"
+        ),
+    }), 413
+
+
+@app.route('/')
+def index():
+    """Strona glowna"""
+    return render_template('index.html')
+
+
+def _iter_json(items):
+    """
+    Serializuje pary (klucz, wartosc) do obiektu JSON fragmentami.
+
+    items moze byc generatorem liczacym kolejne wlasnosci - kazda para
+    jest wysylana, gdy tylko powstanie (listy element po elemencie).
+    Blad w trakcie (naglowki sa juz wyslane) zamyka obiekt polami
+    success: false i error.
+    """
+    yield '{'
+    n = 0
+    try:
+        for key, value in items:
+            prefix = (', ' if n else '') + json.dumps(key) + ': '
+            n += 1
+            if isinstance(value, list) and value:
+                yield prefix + '['
+                for i, item in enumerate(value):
+                    yield (', ' if i else '') + json.dumps(item)
+                yield ']'
+            else:
+                yield prefix + json.dumps(value)
+    except (ValueError, TypeError, np.linalg.LinAlgError) as e:
+        error = str(e)
+    except Exception:
+        error = 'Nieoczekiwany blad serwera'
+    else:
+        yield '}'
+        return
+    yield (', ' if n else '') + json.dumps('success') + ': false, ' + \
+        json.dumps('error') + ': ' + json.dumps(error) + '}'
+
+
+def _json_response(result, stream):
+    """
+    Zwraca wynik jako jsonify lub strumien (dla duzych macierzy).
+
+    Przy stream=True result moze byc dict albo iterowalnym zrodlem par
+    (klucz, wartosc), np. generatorem liczacym wynik w trakcie wysylania.
+    """
+    if not stream:
+        return jsonify(result)
+    items = result.items() if isinstance(result, dict) else result
+    return Response(stream_with_context(_iter_json(items)),
+                    mimetype='application/json')
+
+
+_result_cache = OrderedDict()
+_result_cache_bytes = 0
+_preset_results = {}
+_result_cache_lock = threading.Lock()
+
+
+def _cache_key(matrix, mode, steps_mode):
+    """
+    Kanoniczny skrot zawartosci macierzy i opcji obliczen.
+
+    Tryb float: bajty float64 (1 i 1.0 daja ten sam klucz, -0.0 -> 0.0);
+    tryb exact: zapis ulamkow w postaci skroconej ('0.5' i '1/2' to to samo).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if mode == 'exact':
+        shape = (len(matrix), len(matrix[0]))
+        data = ';'.join(','.join(str(f) for f in row) for row in matrix).encode()
+    else:
+        canonical = np.ascontiguousarray(matrix, dtype=np.float64) + 0.0
+        shape = canonical.shape
+        data = canonical.tobytes()
+    digest.update(repr((shape, mode, steps_mode)).encode())
+    digest.update(data)
+    return digest.hexdigest()
+
+
+def _cache_lookup(key):
+    """Zwraca zapisany JSON (bajty) lub None; trafienie odswieza pozycje LRU."""
+    with _result_cache_lock:
+        payload = _preset_results.get(key)
+        if payload is None:
+            payload = _result_cache.get(key)
+            if payload is not None:
+                _result_cache.move_to_end(key)
+    return payload
+
+
+def _cache_store(key, payload):
+    """Zapisuje wynik, usuwajac najdawniej uzywane ponad limity."""
+    global _result_cache_bytes
+    if len(payload) > RESULT_CACHE_MAX_BYTES:
+        return
+    with _result_cache_lock:
+        if key in _result_cache:
+            return
+        _result_cache[key] = payload
+        _result_cache_bytes += len(payload)
+        while (len(_result_cache) > RESULT_CACHE_SIZE
+               or _result_cache_bytes > RESULT_CACHE_MAX_BYTES):
+            _, evicted = _result_cache.popitem(last=False)
+            _result_cache_bytes -= len(evicted)
+
+
+def _clear_result_cache():
+    """Czysci wyniki i faktoryzacje LU uzytkownikow (presety zostaja)."""
+    global _result_cache_bytes
+    with _result_cache_lock:
+        _result_cache.clear()
+        _result_cache_bytes = 0
+    with _lu_cache_lock:
+        _lu_cache.clear()
+
+
+def _matrix_shape(matrix, mode):
+    """(wiersze, kolumny) macierzy numpy lub listy ulamkow (tryb exact)."""
+    if mode == 'exact':
+        return len(matrix), len(matrix[0])
+    return matrix.shape
+
+
+def _compute_result(matrix, mode, steps_mode):
+    """Wynik /api/compute dla juz zwalidowanej macierzy i trybu."""
+    if mode == 'exact':
+        result = _compute_matrix_exact(matrix, steps_mode)
+    else:
+        result = _compute_matrix(matrix, steps_mode)
+    result['success'] = True
+    return result
+
+
+def _iter_compute_result(matrix, mode, steps_mode):
+    """
+    Pary wyniku /api/compute w kolejnosci obliczania (dla strumienia).
+
+    steps_mode - wynik _resolve_steps_mode (walidacja przed strumieniem).
+    """
+    if mode == 'exact':
+        yield from _compute_matrix_exact(matrix, steps_mode).items()
+    else:
+        yield from _iter_matrix_properties(matrix, steps_mode)
+    yield 'success', True
+
+
+def _warm_preset_cache():
+    """Liczy z gory wyniki PRESETS w obu trybach (kroki 'auto', jak w UI)."""
+    for preset in PRESETS.values():
+        for mode in VALID_MODES:
+            if mode == 'exact':
+                matrix = _validate_exact_matrix(preset['matrix'])
+            else:
+                matrix = _validate_matrix(preset['matrix'])
+            steps_mode = _resolve_steps_mode('auto', *_matrix_shape(matrix, mode))
+            key = _cache_key(matrix, mode, steps_mode)
+            result = _compute_result(matrix, mode, steps_mode)
+            _preset_results[key] = app.json.dumps(result).encode()
+
+
+@app.route('/api/compute', methods=['POST'])
+def compute():
+    """
+    Oblicza wlasciwosci macierzy.
+
+    Request JSON:
+        matrix: 2D tablica (do MAX_MATRIX_SIZE x MAX_MATRIX_SIZE)
+        mode: 'float' | 'exact' (opcjonalny) - 'exact' przyjmuje tez
+            napisy '1/3' i zwraca liczby jako ulamki (do EXACT_MAX_SIZE)
+        steps: 'auto' | 'full' | 'summary' | 'none' (opcjonalny)
+        stream: bool - wymus odpowiedz strumieniowa (opcjonalny)
+
+    Request multipart/form-data (alternatywnie):
+        file: plik tekstowy/CSV z macierza
+        mode, steps, stream: jak wyzej (pola formularza)
+
+    Response JSON:
+        rows, cols, is_square, mode, rank, det, trace,
+        inverse, transpose, eigenvalues, eigenvalues_complex,
+        steps_mode, gauss_initial, gauss_steps, rref
+        (gauss_steps: dziennik operacji 'ops' od gauss_initial; w trybie
+        exact migawki 'matrix' po kazdej kolumnie)
+        (strumieniowo, gdy macierz ma co najmniej STREAM_MIN_ELEMENTS
+        elementow: pola wysylane sa w miare obliczania - wymiary, slad
+        i transpozycja przed eliminacja, wartosci wlasne na koncu; blad
+        w trakcie konczy obiekt polami success: false, error)
+    """
+    try:
+        upload = request.files.get('file')
+        if upload is not None:
+            options = request.form
+        else:
+            options = _validate_request_json()
+            if 'matrix' not in options:
+                raise ValueError("Brak wymaganego pola 'matrix'")
+
+        mode = options.get('mode', 'float')
+        if mode not in VALID_MODES:
+            raise ValueError(
+                f"Nieprawidlowy tryb: {mode}. Dozwolone: {', '.join(VALID_MODES)}"
+            )
+        stream = str(options.get('stream', '')).lower() in ('1', 'true')
+
+        if mode == 'exact':
+            if upload is not None:
+                matrix = _parse_matrix_file_exact(upload)
+            else:
+                matrix = _validate_exact_matrix(options['matrix'])
+            large = False
+        else:
+            if upload is not None:
+                matrix = _parse_matrix_file(upload)
+            else:
+                matrix = _validate_matrix(options['matrix'])
+            large = matrix.size >= STREAM_MIN_ELEMENTS
+
+        # Tryb krokow ustalony przed wyborem strumienia - blad walidacji
+        # w trakcie strumienia dalby 200 z urwanym wynikiem
+        steps_mode = _resolve_steps_mode(
+            options.get('steps', 'auto'), *_matrix_shape(matrix, mode)
+        )
+
+        # Duze wyniki ida strumieniem w trakcie obliczen (pierwsze pola
+        # przed eliminacja) i nie trafiaja do pamieci podrecznej
+        if stream or large:
+            return _json_response(_iter_compute_result(matrix, mode, steps_mode), True)
+
+        key = _cache_key(matrix, mode, steps_mode)
+        payload = _cache_lookup(key)
+        if payload is None:
+            payload = app.json.dumps(_compute_result(matrix, mode, steps_mode)).encode()
+            _cache_store(key, payload)
+        return Response(payload, mimetype='application/json')
+
+    except (ValueError, TypeError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except HTTPException:
+        raise
+    except Exception:
+        return jsonify({
+            'success': False,
+            'error': 'Nieoczekiwany blad serwera'
+        }), 500
+
+
+@app.route('/api/compute_batch', methods=['POST'])
+def compute_batch():
+    """
+    Oblicza wlasciwosci wielu macierzy w jednym zadaniu.
+
+    Macierze o tym samym ksztalcie sa laczone w stos i liczone wspolnie
+    (jedno wywolanie LAPACK na wlasnosc), bez krokow eliminacji.
+
+    Request JSON:
+        matrices: lista macierzy 2D (do MAX_BATCH_MATRICES, kazda do
+            BATCH_MAX_SIZE x BATCH_MAX_SIZE)
+        stream: bool - wymus odpowiedz strumieniowa (opcjonalny)
+
+    Response JSON:
+        count: int - liczba macierzy
+        groups: [{rows, cols, count}] - grupy wedlug ksztaltu
+        results: [{rows, cols, is_square, rank, det, trace, inverse,
+                   eigenvalues, eigenvalues_complex}] - w kolejnosci wejscia
+    """
+    try:
+        data = _validate_request_json()
+        if 'matrices' not in data:
+            raise ValueError("Brak wymaganego pola 'matrices'")
+        stacks = _validate_batch(data['matrices'])
+
+        results = [None] * len(data['matrices'])
+        groups = []
+        for (rows, cols), (indices, stack) in stacks.items():
+            for k, result in zip(indices, _compute_batch_group(stack)):
+                results[k] = result
+            groups.append({'rows': rows, 'cols': cols, 'count': len(indices)})
+
+        stream = str(data.get('stream', '')).lower() in ('1', 'true')
+        elements = sum(stack.size for _, stack in stacks.values())
+        return _json_response({
+            'success': True,
+            'count': len(results),
+            'groups': groups,
+            'results': results,
+        }, stream or elements >= STREAM_MIN_ELEMENTS)
+
+    except (ValueError, TypeError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except HTTPException:
+        raise
+    except Exception:
+        return jsonify({
+            'success': False,
+            'error': 'Nieoczekiwany blad serwera'
+        }), 500
+
+
+@app.route('/api/solve', methods=['POST'])
+def solve():
+    """
+    Rozwiazuje uklad Ax = b metoda bezposrednia lub iteracyjna.
+
+    Request JSON:
+        matrix: 2D tablica kwadratowa A (do MAX_MATRIX_SIZE x MAX_MATRIX_SIZE)
+        b: lista n liczb
+        method: 'lu' | 'jacobi' | 'gauss_seidel' | 'cg' (domyslnie 'lu')
+        tol: float - wzgledna reszta zatrzymania (domyslnie DEFAULT_SOLVE_TOL)
+        max_iter: int - limit iteracji (domyslnie 1000)
+        x0: lista n liczb - przyblizenie poczatkowe (domyslnie zera)
+
+    Response JSON:
+        method, n, x,
+        residual: float - ||b - Ax|| / ||b|| dla zwroconego x
+        iterations: int (0 dla 'lu')
+        status: 'solved' (lu) | 'converged' | 'max_iter' | 'diverged'
+        trace: [float] - wzgledna reszta po kazdej iteracji (od x0)
+        factorization_reused: bool (tylko 'lu')
+    """
+    try:
+        data = _validate_request_json()
+        if 'matrix' not in data:
+            raise ValueError("Brak wymaganego pola 'matrix'")
+        matrix = _validate_matrix(data['matrix'])
+        n, cols = matrix.shape
+        if n != cols:
+            raise ValueError("Uklad rownan wymaga macierzy kwadratowej")
+        b = _validate_vector(data.get('b'), n, 'b')
+
+        method = data.get('method', 'lu')
+        if method not in SOLVE_METHODS:
+            raise ValueError(
+                f"Nieznana metoda: {method}. Dozwolone: {', '.join(SOLVE_METHODS)}"
+            )
+
+        result = {'success': True, 'method': method, 'n': n}
+        if method == 'lu':
+            factors, reused = _lu_factorization(matrix)
+            x = lu_solve(factors, b, check_finite=False)
+            result.update({
+                'iterations': 0,
+                'status': 'solved',
+                'trace': [],
+                'factorization_reused': reused,
+            })
+        else:
+            tol = _parse_option_float(data, 'tol', DEFAULT_SOLVE_TOL)
+            if tol <= 0:
+                raise ValueError("tol musi byc dodatnia liczba skonczona")
+            max_iter = _parse_option_int(data, 'max_iter', 1000)
+            if max_iter < 1 or max_iter > MAX_SOLVE_ITERATIONS:
+                raise ValueError(f"max_iter musi byc z zakresu [1, {MAX_SOLVE_ITERATIONS}]")
+            x0 = data.get('x0')
+            x = np.zeros(n) if x0 is None else _validate_vector(x0, n, 'x0')
+
+            with np.errstate(over='ignore', invalid='ignore'):
+                x, trace, status = ITERATIVE_SOLVERS[method](matrix, b, x, tol, max_iter)
+            result.update({
+                'iterations': len(trace) - 1,
+                'status': status,
+                'trace': trace,
+            })
+
+        with np.errstate(over='ignore', invalid='ignore'):
+            residual = np.linalg.norm(b - matrix @ x) / (np.linalg.norm(b) or 1.0)
+        result['residual'] = safe_float(residual)
+        result['x'] = [safe_float(v) for v in x]
+        return jsonify(result)
+
+    except (ValueError, TypeError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except HTTPException:
+        raise
+    except Exception:
+        return jsonify({
+            'success': False,
+            'error': 'Nieoczekiwany blad serwera'
+        }), 500
+
+
+@app.route('/api/decompose', methods=['POST'])
+def decompose():
+    """
+    Rozklad macierzy z opcjonalnym dziennikiem operacji do odtworzenia.
+
+    Request JSON:
+        matrix: 2D tablica (do MAX_MATRIX_SIZE x MAX_MATRIX_SIZE)
+        kind: 'lu' | 'qr' | 'cholesky' | 'svd' (domyslnie 'lu')
+        algorithm: 'householder' | 'givens' (tylko qr, domyslnie householder)
+        log: bool - dziennik operacji (domyslnie do STEPS_MAX_SIZE,
+            maksymalnie SUMMARY_STEPS_MAX_SIZE; brak dla svd)
+        format: 'json' | 'binary' - czynniki jako listy lub bajty base64
+        stream: bool - wymus odpowiedz strumieniowa (opcjonalny)
+
+    Response JSON:
+        kind, algorithm, rows, cols, format,
+        factors: nazwy czynnikow, np. ['P', 'L', 'U'] (PA = LU),
+            ['Q', 'R'], ['L'] (A = LL^T), ['U', 'S', 'Vt'];
+        <nazwa>: kazdy czynnik (lista 2D / wektor lub {dtype, shape, data})
+        reconstruction_error: ||A - iloczyn|| / ||A||
+        initial, steps: dziennik [{description, operation, ops}]
+            odtwarzany od initial (patrz _apply_row_op) lub None
+    """
+    try:
+        data = _validate_request_json()
+        if 'matrix' not in data:
+            raise ValueError("Brak wymaganego pola 'matrix'")
+        matrix = _validate_matrix(data['matrix'])
+        rows, cols = matrix.shape
+
+        kind = data.get('kind', 'lu')
+        if kind not in VALID_DECOMPOSITIONS:
+            raise ValueError(
+                f"Nieznany rozklad: {kind}. Dozwolone: {', '.join(VALID_DECOMPOSITIONS)}"
+            )
+        algorithm = {'lu': 'doolittle', 'cholesky': 'cholesky', 'svd': 'lapack'}.get(kind)
+        if kind == 'qr':
+            algorithm = data.get('algorithm', 'householder')
+            if algorithm not in QR_ALGORITHMS:
+                raise ValueError(
+                    f"Nieznany algorytm QR: {algorithm}. Dozwolone: {', '.join(QR_ALGORITHMS)}"
+                )
+        if kind == 'cholesky' and rows != cols:
+            raise ValueError("Rozklad Cholesky'ego wymaga macierzy kwadratowej")
+
+        output_format = data.get('format', 'json')
+        if output_format not in VALID_FORMATS:
+            raise ValueError(
+                f"Nieznany format: {output_format}. Dozwolone: {', '.join(VALID_FORMATS)}"
+            )
+
+        size = max(rows, cols)
+        log = data.get('log')
+        if log is None:
+            log = kind != 'svd' and size <= STEPS_MAX_SIZE
+        elif log and kind == 'svd':
+            raise ValueError("Dziennik operacji niedostepny dla SVD")
+        elif log and size > SUMMARY_STEPS_MAX_SIZE:
+            raise ValueError(
+                f"Dziennik operacji dostepny dla macierzy do "
+                f"{SUMMARY_STEPS_MAX_SIZE}x{SUMMARY_STEPS_MAX_SIZE}"
+            )
+
+        steps = None
+        if log:
+            if kind == 'lu':
+                factors, steps = _lu_doolittle(matrix, True)
+            elif kind == 'qr':
+                factors, steps = _qr_reflect(matrix, algorithm, True)
+            else:
+                factors, steps = _cholesky_elimination(matrix, True)
+        else:
+            factors = _decompose_lapack(matrix, kind)
+
+        norm = np.linalg.norm(matrix) or 1.0
+        error = np.linalg.norm(matrix - _reconstruct(kind, factors)) / norm
+
+        result = {
+            'success': True,
+            'kind': kind,
+            'algorithm': algorithm,
+            'rows': rows,
+            'cols': cols,
+            'format': output_format,
+            'factors': list(factors),
+            'reconstruction_error': safe_float(error),
+            'initial': _matrix_to_safe_list(matrix) if steps is not None else None,
+            'steps': steps,
+        }
+        for name, factor in factors.items():
+            if output_format == 'binary':
+                result[name] = _encode_binary(factor)
+            else:
+                result[name] = _matrix_to_safe_list(factor)
+
+        stream = str(data.get('stream', '')).lower() in ('1', 'true')
+        large = output_format == 'json' and matrix.size >= STREAM_MIN_ELEMENTS
+        return _json_response(result, stream or large)
+
+    except (ValueError, TypeError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except HTTPException:
+        raise
+    except Exception:
+        return jsonify({
+            'success': False,
+            'error': 'Nieoczekiwany blad serwera'
+        }), 500
+
+
+@app.route('/api/cofactor', methods=['POST'])
+def cofactor():
+    """
+    Wyznacznik z rozwiniecia Laplace'a (minory zapamietywane po maskach).
+
+    Request JSON:
+        matrix: 2D tablica kwadratowa do COFACTOR_MAX_SIZE (liczby lub
+            napisy '1/3' - liczone dokladnie)
+        strategy: 'row' | 'sparse' (domyslnie 'row')
+
+    Response JSON:
+        n, strategy,
+        det: string - wyznacznik dokladny ('p/q')
+        det_value: float, det_lu: float - wyznacznik z rozkladu LU
+        lu_agrees: bool - zgodnosc z LU (wzgledem ograniczenia Hadamarda)
+        minors: int - liczba roznych minorow (wezlow)
+        reused: int - odwolania obsluzone z pamieci
+        terms: int - liczba iloczynow a_ij * C_ij
+        naive_calls: int - liczba minorow liczonych bez pamieci
+        root: int - id wezla calej macierzy
+        nodes: [{id, rows, cols, det, line, terms, uses}] - drzewo
+            rozwiniecia jako graf (wspolne minory wystepuja raz)
+    """
+    try:
+        data = _validate_request_json()
+        if 'matrix' not in data:
+            raise ValueError("Brak wymaganego pola 'matrix'")
+        entries = _validate_exact_matrix(data['matrix'])
+        n = len(entries)
+        if n != len(entries[0]):
+            raise ValueError("Rozwiniecie Laplace'a wymaga macierzy kwadratowej")
+        if n > COFACTOR_MAX_SIZE:
+            raise ValueError(
+                f"Rozwiniecie Laplace'a dostepne dla macierzy do "
+                f"{COFACTOR_MAX_SIZE}x{COFACTOR_MAX_SIZE}"
+            )
+        strategy = data.get('strategy', 'row')
+        if strategy not in COFACTOR_STRATEGIES:
+            raise ValueError(
+                f"Nieznana strategia: {strategy}. "
+                f"Dozwolone: {', '.join(COFACTOR_STRATEGIES)}"
+            )
+
+        det, nodes, stats = _cofactor_expansion(entries, strategy)
+
+        matrix = np.array(entries, dtype=float)
+        det_lu = _lu_determinant(matrix)
+        hadamard = float(np.prod(np.linalg.norm(matrix, axis=1)))
+        agrees = abs(float(det) - det_lu) <= LU_CHECK_RTOL * max(hadamard, 1e-300)
+
+        return jsonify({
+            'success': True,
+            'n': n,
+            'strategy': strategy,
+            'det': str(det),
+            'det_value': safe_float(det),
+            'det_lu': safe_float(det_lu),
+            'lu_agrees': bool(agrees),
+            'minors': len(nodes),
+            'reused': stats['reused'],
+            'terms': stats['terms'],
+            'naive_calls': _naive_expansion_size(nodes),
+            'root': nodes[-1]['id'],
+            'nodes': nodes,
+        })
+
+    except (ValueError, TypeError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except HTTPException:
+        raise
+    except Exception:
+        return jsonify({
+            'success': False,
+            'error': 'Nieoczekiwany blad serwera'
+        }), 500
+
+
+@app.route('/api/eigen_iterate', methods=['POST'])
+def eigen_iterate():
+    """
+    Iteracyjne wyznaczanie wartosci wlasnych ze strumieniem iteracji.
+
+    Request JSON:
+        matrix: 2D tablica kwadratowa do EIGEN_ITER_MAX_SIZE
+        method: 'power' | 'inverse' | 'qr' | 'shifted_qr' (domyslnie 'power')
+        shift: float - przesuniecie sigma dla 'inverse' (domyslnie 0)
+        x0: lista n liczb - wektor poczatkowy ('power', 'inverse')
+        tol: float - zatrzymanie (wzgledem ||A||, domyslnie DEFAULT_EIGEN_TOL)
+        max_iter: int - limit iteracji (domyslnie 500)
+        every: int - wysylaj co every-ta iteracje (domyslnie 1)
+
+    Response (application/x-ndjson), jedna linia JSON na zdarzenie:
+        start: {method, n, tol, max_iter}
+        iterate: power/inverse - {k, eigenvalue, residual, vector};
+            qr - {k, diagonal, subdiagonal, off_norm, [shift, double_shift,
+            active], [matrix do STEPS_MAX_SIZE]}
+        result: {converged, iterations, eigenvalue + eigenvector + residual
+            lub eigenvalues + eigenvalues_complex}
+        error: {error} - blad numeryczny w trakcie iteracji
+    """
+    try:
+        data = _validate_request_json()
+        if 'matrix' not in data:
+            raise ValueError("Brak wymaganego pola 'matrix'")
+        matrix = _validate_matrix(data['matrix'])
+        n, cols = matrix.shape
+        if n != cols:
+            raise ValueError("Wartosci wlasne wymagaja macierzy kwadratowej")
+        if n > EIGEN_ITER_MAX_SIZE:
+            raise ValueError(
+                f"Iteracje dostepne dla macierzy do "
+                f"{EIGEN_ITER_MAX_SIZE}x{EIGEN_ITER_MAX_SIZE}"
+            )
+
+        method = data.get('method', 'power')
+        if method not in EIGEN_METHODS:
+            raise ValueError(
+                f"Nieznana metoda: {method}. Dozwolone: {', '.join(EIGEN_METHODS)}"
+            )
+        tol = _parse_option_float(data, 'tol', DEFAULT_EIGEN_TOL)
+        if tol <= 0:
+            raise ValueError("tol musi byc dodatnia liczba skonczona")
+        max_iter = _parse_option_int(data, 'max_iter', 500)
+        if max_iter < 1 or max_iter > MAX_EIGEN_ITERATIONS:
+            raise ValueError(f"max_iter musi byc z zakresu [1, {MAX_EIGEN_ITERATIONS}]")
+        every = _parse_option_int(data, 'every', 1)
+        if every < 1:
+            raise ValueError("every musi byc dodatnia liczba calkowita")
+
+        x0 = None
+        solve = None
+        if method in ('power', 'inverse'):
+            if data.get('x0') is None:
+                # Staly, "ogolny" wektor startowy - powtarzalne animacje
+                x0 = np.random.default_rng(0).standard_normal(n)
+            else:
+                x0 = _validate_vector(data['x0'], n, 'x0')
+                if not x0.any():
+                    raise ValueError("x0 musi byc niezerowy")
+        if method == 'inverse':
+            shift = _parse_option_float(data, 'shift', 0.0)
+            shifted_matrix = matrix - shift * np.eye(n)
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', LinAlgWarning)
+                factors = lu_factor(shifted_matrix, check_finite=False)
+            if np.abs(np.diag(factors[0])).min() <= _pivot_tolerance(shifted_matrix):
+                raise ValueError(
+                    "A - shift*I jest osobliwa (shift to wartosc wlasna) - "
+                    "wybierz inne przesuniecie"
+                )
+            solve = lambda x: lu_solve(factors, x, check_finite=False)  # noqa: E731
+
+        return Response(
+            stream_with_context(
+                _iter_eigen_ndjson(matrix, method, tol, max_iter, every, x0, solve)
+            ),
+            mimetype='application/x-ndjson',
+        )
+
+    except (ValueError, TypeError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except HTTPException:
+        raise
+    except Exception:
+        return jsonify({
+            'success': False,
+            'error': 'Nieoczekiwany blad serwera'
+        }), 500
+
+
+def _parse_query_int(name, default):
+    """Liczba calkowita z query string (komunikat API zamiast bledu int())."""
+    raw = request.args.get(name)
+    if raw is None:
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        raise ValueError(f"Parametr {name} musi byc liczba calkowita")
+
+
+def _parse_option_float(data, name, default):
+    """Liczba skonczona z pola JSON (komunikat API zamiast bledu float())."""
+    raw = data.get(name, default)
+    if isinstance(raw, bool) or not isinstance(raw, (int, float, str)):
+        raise ValueError(f"Parametr {name} musi byc liczba")
+    try:
+        value = float(raw)
+    except ValueError:
+        raise ValueError(f"Parametr {name} musi byc liczba")
+    if not math.isfinite(value):
+        raise ValueError(f"Parametr {name} musi byc liczba skonczona")
+    return value
+
+
+def _parse_option_int(data, name, default):
+    """Liczba calkowita z pola JSON - 2.7 to blad, nie obciecie do 2."""
+    raw = data.get(name, default)
+    if isinstance(raw, int) and not isinstance(raw, bool):
+        return raw
+    if isinstance(raw, float) and raw.is_integer():
+        return int(raw)
+    if isinstance(raw, str):
+        try:
+            return int(raw.strip())
+        except ValueError:
+            pass
+    raise ValueError(f"Parametr {name} musi byc liczba calkowita")
+
+
+@app.route('/api/steps', methods=['POST'])
+def steps():
+    """
+    Odtwarza migawki macierzy dla zakresu krokow eliminacji.
+
+    Query string:
+        from: int - indeks pierwszego kroku (domyslnie 0)
+        to: int - indeks ostatniego kroku, wlacznie (domyslnie ostatni)
+
+    Request JSON:
+        matrix: 2D tablica
+        steps: 'auto' | 'full' | 'summary' (opcjonalny)
+
+    Response JSON:
+        steps_mode, total,
+        snapshots: [{index, description, operation, ops, matrix}]
+    """
+    try:
+        data = _validate_request_json()
+        if 'matrix' not in data:
+            raise ValueError("Brak wymaganego pola 'matrix'")
+        matrix = _validate_matrix(data['matrix'])
+        rows, cols = matrix.shape
+
+        start = _parse_query_int('from', 0)
+        stop = _parse_query_int('to', None)
+        if start < 0 or (stop is not None and stop < start):
+            raise ValueError("Wymagane 0 <= from <= to")
+
+        steps_mode = _resolve_steps_mode(data.get('steps', 'auto'), rows, cols)
+        if steps_mode == 'none':
+            raise ValueError("Migawki wymagaja trybu krokow 'full' lub 'summary'")
+        gauss_steps, _, _ = _gauss_elimination_steps(matrix, mode=steps_mode)
+        total = len(gauss_steps)
+        stop = total - 1 if stop is None else min(stop, total - 1)
+
+        snapshots = [
+            {
+                **gauss_steps[index],
+                'index': index,
+                'matrix': _matrix_to_safe_list(snapshot),
+            }
+            for index, snapshot in _replay_steps(matrix, gauss_steps, start, stop)
+        ]
+
+        return jsonify({
+            'success': True,
+            'steps_mode': steps_mode,
+            'total': total,
+            'snapshots': snapshots,
+        })
+
+    except (ValueError, TypeError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except HTTPException:
+        raise
+    except Exception:
+        return jsonify({
+            'success': False,
+            'error': 'Nieoczekiwany blad serwera'
+        }), 500
+
+
+@app.route('/api/presets')
+def presets():
+    """Zwraca liste dostepnych presetow."""
+    return jsonify({'success': True, 'presets': PRESETS})
+
+
+_warm_preset_cache()
 
 
 if __name__ == '__main__':
@@ -73,6 +73,10 @@ function setupControls() {
     document.getElementById('btn-compute').addEventListener('click', function() {
         triggerComputation();
     });
+
+    document.getElementById('exact-mode').addEventListener('change', function() {
+        triggerComputation();
+    });
 }
 
 function setupPresets() {
@@ -109,7 +113,10 @@ async function triggerComputation() {
         const response = await fetch('/api/compute', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
-            body: JSON.stringify({ matrix: matrix })
+            body: JSON.stringify({
+                matrix: matrix,
+                mode: document.getElementById('exact-mode').checked ? 'exact' : 'float'
+            })
         });
 
         if (!response.ok) {
@@ -144,9 +151,9 @@ function displayResults() {
     // Wyznacznik
     const detItem = document.getElementById('det-item');
     const detEl = document.getElementById('stat-det');
-    if (res.det !== null) {
+    if (res.det !== null || res.det_log) {
         detItem.style.display = '';
-        detEl.textContent = formatNumber(res.det);
+        detEl.textContent = formatDeterminant(res);
     } else {
         detItem.style.display = 'none';
     }
@@ -194,15 +201,33 @@ function displayResults() {
     document.getElementById('transpose-display').innerHTML = renderMatrix(res.transpose);
 
     // Eliminacja Gaussa
-    displayGaussSteps(res.gauss_steps);
+    displayGaussSteps(res.gauss_initial, res.gauss_steps);
 }
 
-function displayGaussSteps(steps) {
+// Operacja wierszowa z dziennika krokow (swap / scale / add)
+function applyRowOp(m, op) {
+    var k;
+    if (op.op === 'swap') {
+        var tmp = m[op.i];
+        m[op.i] = m[op.j];
+        m[op.j] = tmp;
+    } else if (op.op === 'scale') {
+        for (k = 0; k < m[op.i].length; k++) m[op.i][k] *= op.s;
+    } else if (op.op === 'add') {
+        for (k = 0; k < m[op.i].length; k++) m[op.i][k] += op.s * m[op.j][k];
+    }
+}
+
+function displayGaussSteps(initial, steps) {
     const container = document.getElementById('gauss-steps');
     var html = '';
+    var m = initial ? initial.map(function(row) { return row.slice(); }) : [];
 
     for (var i = 0; i < steps.length; i++) {
         var step = steps[i];
+        // Tryb dokladny wysyla migawki (liczby calkowite jako napisy)
+        if (step.matrix) m = step.matrix;
+        else step.ops.forEach(function(op) { applyRowOp(m, op); });
         var stepClass = 'mc-gauss-step';
         if (step.operation === 'swap') stepClass += ' mc-gauss-step--swap';
         else if (step.operation === 'scale') stepClass += ' mc-gauss-step--scale';
@@ -213,7 +238,7 @@ function displayGaussSteps(steps) {
         html += '<span class="mc-gauss-step__num">Krok ' + i + '</span>';
         html += '<span class="mc-gauss-step__desc">' + step.description + '</span>';
         html += '</div>';
-        html += renderMatrix(step.matrix);
+        html += renderMatrix(m);
         html += '</div>';
     }
 
@@ -241,7 +266,21 @@ function renderMatrix(matrix) {
     return html;
 }
 
+function formatDeterminant(res) {
+    // Bardzo male/duze wyznaczniki (lub poza zakresem float) w zapisie
+    // naukowym z det_log - formatNumber pokazalby 0
+    const log = res.det_log;
+    if (!log || (res.det !== null && Math.abs(log.log10_abs) < 6)) {
+        return formatNumber(res.det);
+    }
+    const exponent = Math.floor(log.log10_abs);
+    const mantissa = Math.pow(10, log.log10_abs - exponent);
+    return (log.sign < 0 ? '-' : '') + mantissa.toFixed(4) + 'e' + exponent;
+}
+
 function formatNumber(val) {
+    // Tryb dokladny: ulamki jako napisy 'p/q'
+    if (typeof val === 'string') return val;
     if (Math.abs(val) < 1e-10) return '0';
     if (Number.isInteger(val) || Math.abs(val - Math.round(val)) < 1e-8) {
         return Math.round(val).toString();
@@ -13,8 +13,8 @@ import sys
 
 from common.flask_app import register_common_static
 from common.functions import (
-    FUNCTION_REGISTRY, evaluate_function, evaluate_derivative,
-    get_all_functions, resolve_params
+    CUSTOM_DEFAULT_RANGE, FUNCTION_REGISTRY, compile_custom_function,
+    evaluate_function, evaluate_derivative, get_all_functions, resolve_params
 )
 
 
@@ -117,12 +117,16 @@ def compute():
 
     Request JSON:
         func: string - identyfikator funkcji
+        expression: string (opcjonalny) - własny wzór w zmiennej x
+            (np. 'a*x^3 - x'); gdy podany, zastępuje func
         params: dict - parametry funkcji
         x0: float - punkt styczności
         x_min: float (opcjonalny) - początek zakresu
         x_max: float (opcjonalny) - koniec zakresu
 
     Response JSON:
+        params: dict - użyte wartości parametrów
+        func_formula: string - wzór funkcji
         func_data: {x, y} - dane funkcji
         tangent_data: {x, y} - dane stycznej
         tangent_point: {x, y} - punkt styczności
@@ -135,12 +139,22 @@ def compute():
     try:
         data = _validate_request_json()
 
-        func_id = data.get('func', 'quadratic')
-        if func_id not in FUNCTION_REGISTRY:
-            raise ValueError(f"Nieznana funkcja: {func_id}")
-
         raw_params = data.get('params', {})
-        params = resolve_params(func_id, raw_params)
+        expression = data.get('expression')
+        if expression is not None:
+            # Własny wzór: bezpieczny kompilator, f i f' jednym planem
+            custom = compile_custom_function(expression, raw_params)
+            params = custom['params']
+            default_range = CUSTOM_DEFAULT_RANGE
+            func_formula = custom['formula']
+        else:
+            func_id = data.get('func', 'quadratic')
+            if func_id not in FUNCTION_REGISTRY:
+                raise ValueError(f"Nieznana funkcja: {func_id}")
+            params = resolve_params(func_id, raw_params)
+            func_info = FUNCTION_REGISTRY[func_id]
+            default_range = func_info['default_range']
+            func_formula = func_info['formula']
 
         x0 = data.get('x0', 0)
         if x0 is None:
@@ -149,11 +163,9 @@ def compute():
         if math.isnan(x0) or math.isinf(x0):
             raise ValueError("x0 musi być liczbą skończoną")
 
-        func_info = FUNCTION_REGISTRY[func_id]
-
         # Zakres X
-        x_min = data.get('x_min', func_info['default_range'][0])
-        x_max = data.get('x_max', func_info['default_range'][1])
+        x_min = data.get('x_min', default_range[0])
+        x_max = data.get('x_max', default_range[1])
         x_min = float(x_min)
         x_max = float(x_max)
 
@@ -168,8 +180,13 @@ def compute():
 
         # Oblicz f(x0) i f'(x0)
         x0_arr = np.array([x0], dtype=float)
-        y0 = float(evaluate_function(func_id, x0_arr, params)[0])
-        slope = float(evaluate_derivative(func_id, x0_arr, params)[0])
+        if expression is not None:
+            y0_arr, slope_arr = custom['evaluate'](x0_arr)
+        else:
+            y0_arr = evaluate_function(func_id, x0_arr, params)
+            slope_arr = evaluate_derivative(func_id, x0_arr, params)
+        y0 = float(y0_arr[0])
+        slope = float(slope_arr[0])
 
         if math.isnan(y0) or math.isinf(y0):
             raise ValueError(
@@ -182,7 +199,10 @@ def compute():
 
         # Dane wykresu
         x_arr = np.linspace(x_min, x_max, NUM_POINTS)
-        y_func = evaluate_function(func_id, x_arr, params)
+        if expression is not None:
+            y_func, _ = custom['evaluate'](x_arr)
+        else:
+            y_func = evaluate_function(func_id, x_arr, params)
 
         # Styczna: y = slope * (x - x0) + y0
         y_tangent = slope * (x_arr - x0) + y0
@@ -201,6 +221,8 @@ def compute():
 
         result = {
             'success': True,
+            'params': params,
+            'func_formula': func_formula,
             'func_data': {
                 'x': x_arr.tolist(),
                 'y': _safe_y_list(y_func),
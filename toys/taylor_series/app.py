@@ -10,6 +10,9 @@ import numpy as np
 import math
 import os
 import sys
+import base64
+from fractions import Fraction
+from functools import lru_cache
 
 from common.flask_app import register_common_static
 
@@ -30,6 +33,16 @@ app = Flask(__name__,
 register_common_static(app, bundle_dir if getattr(sys, 'frozen', False) else None)
 
 
+VALID_PRECISIONS = ('standard', 'high')
+VALID_APPROXIMATIONS = ('taylor', 'pade', 'chebyshev', 'all')
+ERROR_SURFACE_FLOOR = -16
+
+# Obraz bledu na plaszczyznie zespolonej - skala log10 i kwantyzacja do uint8
+COMPLEX_LOG_RANGE = (-16.0, 4.0)
+COMPLEX_NODATA = 255
+COMPLEX_CACHE_SIZE = 64
+
+
 # Dostepne funkcje z ich pochodnymi wyznaczonymi analitycznie
 FUNCTIONS = {
     'sin': {
@@ -37,48 +50,56 @@ FUNCTIONS = {
         'description': 'Sinus - klasyczny przyklad szeregu Taylora. Promien zbieznosci: nieskonczonosc.',
         'default_range': [-2 * math.pi, 2 * math.pi],
         'convergence_radius': None,  # None = nieskonczonosc
+        'singularities': [],  # punkty osobliwe w C wyznaczajace promien
     },
     'cos': {
         'name': 'cos(x)',
         'description': 'Cosinus - podobny do sinusa, ale z parzystymi potegami. Promien zbieznosci: nieskonczonosc.',
         'default_range': [-2 * math.pi, 2 * math.pi],
         'convergence_radius': None,
+        'singularities': [],
     },
     'exp': {
         'name': 'e^x',
         'description': 'Eksponenta - jedyna funkcja rowna swojej pochodnej. Promien zbieznosci: nieskonczonosc.',
         'default_range': [-4, 4],
         'convergence_radius': None,
+        'singularities': [],
     },
     'ln1px': {
         'name': 'ln(1+x)',
         'description': 'Logarytm naturalny - zbiezny tylko dla |x| <= 1 (z wylaczeniem x = -1).',
         'default_range': [-1.5, 3],
         'convergence_radius': 1,
+        'singularities': [-1],
     },
     'atan': {
         'name': 'arctan(x)',
         'description': 'Arcus tangens - zbiezny dla |x| <= 1. Wzor Leibniza: arctan(1) = pi/4.',
         'default_range': [-3, 3],
         'convergence_radius': 1,
+        'singularities': [1j, -1j],
     },
     'one_over_1mx': {
         'name': '1/(1-x)',
         'description': 'Szereg geometryczny - najprostszy szereg potegowy. Zbiezny dla |x| < 1.',
         'default_range': [-2, 2],
         'convergence_radius': 1,
+        'singularities': [1],
     },
     'sinh': {
         'name': 'sinh(x)',
         'description': 'Sinus hiperboliczny. Promien zbieznosci: nieskonczonosc.',
         'default_range': [-4, 4],
         'convergence_radius': None,
+        'singularities': [],
     },
     'sqrt1px': {
         'name': '\u221a(1+x)',
         'description': 'Pierwiastek - przyklad rozszerzenia dwumianowego. Zbiezny dla |x| <= 1.',
         'default_range': [-1.5, 3],
         'convergence_radius': 1,
+        'singularities': [-1],
     },
 }
 
@@ -114,73 +135,166 @@ def _evaluate_function(func_id, x_arr):
     raise ValueError(f"Nieznana funkcja: {func_id}")
 
 
-def _taylor_coefficients(func_id, a, degree):
+def _evaluate_function_complex(func_id, z_arr):
+    """Oblicza wartosci funkcji na tablicy zespolonej (galaz glowna)."""
+    with np.errstate(all='ignore'):
+        if func_id == 'sin':
+            return np.sin(z_arr)
+        elif func_id == 'cos':
+            return np.cos(z_arr)
+        elif func_id == 'exp':
+            return np.exp(z_arr)
+        elif func_id == 'ln1px':
+            return np.log(1 + z_arr)
+        elif func_id == 'atan':
+            return np.arctan(z_arr)
+        elif func_id == 'one_over_1mx':
+            return 1.0 / (1.0 - z_arr)
+        elif func_id == 'sinh':
+            return np.sinh(z_arr)
+        elif func_id == 'sqrt1px':
+            return np.sqrt(1 + z_arr)
+    raise ValueError(f"Nieznana funkcja: {func_id}")
+
+
+def _nth_derivative(func_id, n, x_arr):
+    """
+    Oblicza analitycznie n-ta pochodna (n >= 1) na tablicy numpy.
+
+    Returns:
+        numpy array wartosci f^(n)(x) (NaN poza dziedzina)
+    """
+    with np.errstate(all='ignore'):
+        if func_id == 'sin':
+            return np.sin(x_arr + n * math.pi / 2)
+        elif func_id == 'cos':
+            return np.cos(x_arr + n * math.pi / 2)
+        elif func_id == 'exp':
+            return np.exp(x_arr)
+        elif func_id == 'ln1px':
+            # (-1)^(n-1) (n-1)! / (1+x)^n
+            result = np.full_like(x_arr, np.nan)
+            mask = x_arr > -1
+            sign = 1 if n % 2 == 1 else -1
+            result[mask] = sign * math.factorial(n - 1) / (1 + x_arr[mask]) ** n
+            return result
+        elif func_id == 'atan':
+            # (n-1)! cos^n(t) sin(n(t + pi/2)), t = arctan(x)
+            theta = np.arctan(x_arr)
+            return math.factorial(n - 1) * np.cos(theta) ** n * np.sin(n * (theta + math.pi / 2))
+        elif func_id == 'one_over_1mx':
+            # n! / (1-x)^(n+1)
+            result = np.full_like(x_arr, np.nan)
+            mask = np.abs(x_arr - 1) > 1e-10
+            result[mask] = math.factorial(n) / (1.0 - x_arr[mask]) ** (n + 1)
+            return result
+        elif func_id == 'sinh':
+            return np.sinh(x_arr) if n % 2 == 0 else np.cosh(x_arr)
+        elif func_id == 'sqrt1px':
+            # (1/2)(1/2-1)...(1/2-n+1) (1+x)^(1/2-n)
+            falling = 1.0
+            for k in range(n):
+                falling *= (0.5 - k)
+            result = np.full_like(x_arr, np.nan)
+            mask = x_arr > -1
+            result[mask] = falling * (1 + x_arr[mask]) ** (0.5 - n)
+            return result
+    raise ValueError(f"Nieznana funkcja: {func_id}")
+
+
+def _remainder_bound(func_id, degree, center, x_arr):
+    """
+    Oszacowanie Lagrange'a reszty: M(x) * |x - a|^(n+1) / (n+1)!.
+
+    M(x) to maksimum |f^(n+1)| na odcinku miedzy a i x, liczone
+    jednym wektorowym obliczeniem pochodnej na calej (rosnacej) siatce
+    i skumulowanym maksimum od centrum na zewnatrz. Odcinek
+    przechodzacy przez punkt poza dziedzina daje nieskonczonosc.
+    """
+    k = degree + 1
+    deriv = np.abs(_nth_derivative(func_id, k, x_arr))
+    deriv = np.where(np.isfinite(deriv), deriv, np.inf)
+    deriv_center = abs(float(_nth_derivative(func_id, k, np.array([float(center)]))[0]))
+    if not math.isfinite(deriv_center):
+        deriv_center = math.inf
+
+    split = int(np.searchsorted(x_arr, center))
+    right = np.maximum.accumulate(np.maximum(deriv[split:], deriv_center))
+    left = np.maximum.accumulate(np.maximum(deriv[:split][::-1], deriv_center))[::-1]
+    max_deriv = np.concatenate([left, right])
+
+    with np.errstate(all='ignore'):
+        return max_deriv * np.abs(x_arr - center) ** k / math.factorial(k)
+
+
+def _taylor_coefficients(func_id, a, degree, exact=False):
     """
     Oblicza wspolczynniki szeregu Taylora wokol punktu a.
 
     Uzywa numerycznego rozniczkowania (finite differences)
-    lub wzory analityczne dla a=0.
+    lub wzory analityczne dla a=0. Dla exact=True i a=0 zwraca
+    dokladne wspolczynniki wymierne (Fraction).
     """
     coeffs = []
     if a == 0:
         # Wzory analityczne dla rozwiniecia w 0 (Maclaurin)
-        coeffs = _maclaurin_coefficients(func_id, degree)
+        coeffs = _maclaurin_coefficients(func_id, degree, exact)
     else:
         # Numeryczne rozniczkowanie
         coeffs = _numerical_taylor_coeffs(func_id, a, degree)
     return coeffs
 
 
-def _maclaurin_coefficients(func_id, degree):
-    """Wzory analityczne wspolczynnikow Maclaurina (a=0)."""
-    coeffs = [0.0] * (degree + 1)
+def _maclaurin_coefficients(func_id, degree, exact=False):
+    """
+    Wzory analityczne wspolczynnikow Maclaurina (a=0).
 
-    if func_id == 'sin':
-        for n in range(degree + 1):
-            if n % 2 == 1:
-                k = (n - 1) // 2
-                coeffs[n] = ((-1) ** k) / math.factorial(n)
+    Wspolczynniki liczone sa rekurencyjnie (c_{n+1} = c_n * iloraz),
+    bez silni i iloczynow budowanych od nowa dla kazdego n.
+    Dla exact=True wynik to lista ulamkow Fraction.
+    """
+    one = Fraction(1) if exact else 1.0
+    zero = one * 0
+    coeffs = [zero] * (degree + 1)
+
+    if func_id in ('sin', 'sinh'):
+        # c_1 = 1, c_{n+2} = -+c_n / ((n+1)(n+2))
+        sign = -1 if func_id == 'sin' else 1
+        c = one
+        for n in range(1, degree + 1, 2):
+            coeffs[n] = c
+            c = c * sign / ((n + 1) * (n + 2))
 
     elif func_id == 'cos':
-        for n in range(degree + 1):
-            if n % 2 == 0:
-                k = n // 2
-                coeffs[n] = ((-1) ** k) / math.factorial(n)
+        c = one
+        for n in range(0, degree + 1, 2):
+            coeffs[n] = c
+            c = -c / ((n + 1) * (n + 2))
 
     elif func_id == 'exp':
+        c = one
         for n in range(degree + 1):
-            coeffs[n] = 1.0 / math.factorial(n)
+            coeffs[n] = c
+            c = c / (n + 1)
 
     elif func_id == 'ln1px':
-        coeffs[0] = 0.0
         for n in range(1, degree + 1):
-            coeffs[n] = ((-1) ** (n + 1)) / n
+            coeffs[n] = (one if n % 2 == 1 else -one) / n
 
     elif func_id == 'atan':
-        for n in range(degree + 1):
-            if n % 2 == 1:
-                k = (n - 1) // 2
-                coeffs[n] = ((-1) ** k) / n
+        for n in range(1, degree + 1, 2):
+            coeffs[n] = (one if n % 4 == 1 else -one) / n
 
     elif func_id == 'one_over_1mx':
-        for n in range(degree + 1):
-            coeffs[n] = 1.0
-
-    elif func_id == 'sinh':
-        for n in range(degree + 1):
-            if n % 2 == 1:
-                k = (n - 1) // 2
-                coeffs[n] = 1.0 / math.factorial(n)
+        coeffs = [one] * (degree + 1)
 
     elif func_id == 'sqrt1px':
-        coeffs[0] = 1.0
-        for n in range(1, degree + 1):
-            # Wzor dwumianowy: C(1/2, n) = (1/2)(1/2-1)...(1/2-n+1) / n!
-            c = 1.0
-            for k in range(n):
-                c *= (0.5 - k)
-            c /= math.factorial(n)
+        # Wzor dwumianowy: C(1/2, n+1) = C(1/2, n) * (1/2 - n) / (n + 1)
+        half = one / 2
+        c = one
+        for n in range(degree + 1):
             coeffs[n] = c
+            c = c * (half - n) / (n + 1)
 
     return coeffs
 
@@ -219,12 +333,124 @@ def _nth_derivative_numerical(func_id, a, n, h):
     return result / (h ** n)
 
 
-def _evaluate_taylor(coeffs, a, x_arr):
-    """Oblicza wartosc wielomianu Taylora."""
-    result = np.zeros_like(x_arr)
-    for n, c in enumerate(coeffs):
-        result += c * ((x_arr - a) ** n)
-    return result
+def _evaluate_taylor(coeffs, a, x_arr, compensated=False):
+    """
+    Oblicza wartosc wielomianu Taylora.
+
+    Dla compensated=True wyrazy sumowane sa algorytmem Neumaiera
+    (sumowanie z kompensacja bledu), co zachowuje ogon szeregu
+    przy silnej redukcji wyrazow w poblizu promienia zbieznosci.
+    """
+    if not compensated:
+        result = np.zeros_like(x_arr)
+        for n, c in enumerate(coeffs):
+            result += float(c) * ((x_arr - a) ** n)
+        return result
+
+    with np.errstate(all='ignore'):
+        dx = x_arr - a
+        power = np.ones_like(x_arr)
+        total = np.zeros_like(x_arr)
+        compensation = np.zeros_like(x_arr)
+        for c in coeffs:
+            term = float(c) * power
+            new_total = total + term
+            compensation += np.where(
+                np.abs(total) >= np.abs(term),
+                (total - new_total) + term,
+                (term - new_total) + total,
+            )
+            total = new_total
+            power = power * dx
+        return total + compensation
+
+
+def _pade_coefficients(coeffs, m):
+    """
+    Buduje aproksymante Padego [L/M] z wektora wspolczynnikow Taylora.
+
+    L = len(coeffs) - 1 - M. Mianownik q (q_0 = 1) wyznaczany jest
+    z ukladu Toeplitza sum_j q_j c_{L+i-j} = 0, i = 1..M, a licznik
+    jako p_k = sum_j q_j c_{k-j}.
+
+    Returns:
+        tuple (p, q) - wspolczynniki licznika i mianownika w potegach (x - a)
+    """
+    c = np.array([float(v) for v in coeffs])
+    l = len(c) - 1 - m
+
+    q = np.ones(m + 1)
+    if m > 0:
+        # T[i, j] = c_{L+i-j}, i, j = 1..M (c_k = 0 dla k < 0)
+        idx = l + np.arange(1, m + 1)[:, None] - np.arange(1, m + 1)[None, :]
+        toeplitz = np.where(idx >= 0, c[np.clip(idx, 0, None)], 0.0)
+        rhs = -c[l + 1:l + m + 1]
+        try:
+            q[1:] = np.linalg.solve(toeplitz, rhs)
+        except np.linalg.LinAlgError:
+            # Uklad osobliwy (np. szereg parzysty) - rozwiazanie najmniejszych kwadratow
+            q[1:] = np.linalg.lstsq(toeplitz, rhs, rcond=None)[0]
+
+    p = np.array([
+        sum(q[j] * c[k - j] for j in range(min(k, m) + 1))
+        for k in range(l + 1)
+    ])
+    return p, q
+
+
+def _evaluate_pade(p, q, a, x_arr):
+    """Oblicza wartosc aproksymanty Padego P(x - a) / Q(x - a)."""
+    with np.errstate(all='ignore'):
+        dx = x_arr - a
+        numerator = np.polynomial.polynomial.polyval(dx, p)
+        denominator = np.polynomial.polynomial.polyval(dx, q)
+        return numerator / denominator
+
+
+def _chebyshev_coefficients(func_id, degree, x_range):
+    """
+    Wspolczynniki interpolacji Czebyszewa stopnia degree na przedziale x_range.
+
+    Probki w wezlach Czebyszewa (pierwszego rodzaju) zamieniane sa na
+    wspolczynniki dyskretna transformata kosinusowa (DCT-II). Przy
+    N <= 21 wezlach DCT liczona jest bezposrednio jako iloczyn macierzy.
+    """
+    n = degree + 1
+    j = np.arange(n)
+    theta = np.pi * (j + 0.5) / n
+    lo, hi = x_range
+    nodes = 0.5 * (lo + hi) + 0.5 * (hi - lo) * np.cos(theta)
+    samples = _evaluate_function(func_id, nodes)
+
+    dct = np.cos(np.outer(j, theta)) @ samples
+    cheb = 2.0 * dct / n
+    cheb[0] /= 2
+    return cheb
+
+
+def _evaluate_chebyshev(cheb, x_range, x_arr):
+    """Oblicza szereg Czebyszewa po przeskalowaniu x_range na [-1, 1]."""
+    lo, hi = x_range
+    t = (2 * x_arr - (lo + hi)) / (hi - lo)
+    return np.polynomial.chebyshev.chebval(t, cheb)
+
+
+def _defined_interval(x_arr, y_arr, center):
+    """Najwiekszy przedzial siatki wokol centrum, na ktorym f jest skonczona."""
+    finite = np.isfinite(y_arr)
+    idx = int(np.clip(np.searchsorted(x_arr, center), 0, len(x_arr) - 1))
+    if not finite[idx]:
+        if not np.any(finite):
+            return None
+        idx = int(np.flatnonzero(finite)[0])
+    invalid = np.flatnonzero(~finite)
+    left = invalid[invalid < idx]
+    right = invalid[invalid > idx]
+    lo = left[-1] + 1 if len(left) else 0
+    hi = right[0] - 1 if len(right) else len(x_arr) - 1
+    if hi == lo:
+        return None
+    return [float(x_arr[lo]), float(x_arr[hi])]
 
 
 def _format_polynomial(coeffs, a):
@@ -251,6 +477,87 @@ def _format_polynomial(coeffs, a):
     return " + ".join(terms).replace("+ -", "- ")
 
 
+def _taylor_partial_sums(coeffs, a, x_arr):
+    """
+    Oblicza wszystkie sumy czesciowe T_0..T_n w jednym przebiegu.
+
+    Returns:
+        numpy array (len(coeffs), len(x_arr)) - wiersz k to T_k(x)
+    """
+    with np.errstate(all='ignore'):
+        dx = x_arr - a
+        powers = dx[None, :] ** np.arange(len(coeffs))[:, None]
+        terms = np.array([float(c) for c in coeffs])[:, None] * powers
+        return np.cumsum(terms, axis=0)
+
+
+def _singularity_radius(func_id, center):
+    """Odleglosc od centrum do najblizszej osobliwosci (None = brak)."""
+    singularities = FUNCTIONS[func_id]['singularities']
+    if not singularities:
+        return None
+    return min(abs(complex(s) - center) for s in singularities)
+
+
+@lru_cache(maxsize=COMPLEX_CACHE_SIZE)
+def _complex_error_image(func_id, degree, center, size):
+    """
+    Oblicza skwantyzowany obraz log10|f(z) - T_n(z)| na siatce size x size.
+
+    Siatka to kwadrat wokol centrum o polowie boku rownej 2R
+    (lub polowie domyslnego zakresu dla R = nieskonczonosc).
+    Wynik jest cache'owany per (func_id, degree, center, size).
+
+    Returns:
+        tuple (obraz uint8 zakodowany base64, polowa boku kwadratu)
+    """
+    radius = _singularity_radius(func_id, center)
+    if radius is not None:
+        half_width = 2 * radius
+    else:
+        x_range = FUNCTIONS[func_id]['default_range']
+        half_width = (x_range[1] - x_range[0]) / 2
+
+    axis = np.linspace(-half_width, half_width, size)
+    # Wiersz 0 = najwieksza czesc urojona (gora obrazu)
+    z_arr = (center + axis)[None, :] + 1j * axis[::-1, None]
+
+    coeffs = _taylor_coefficients(func_id, center, degree)
+    with np.errstate(all='ignore'):
+        dz = z_arr - center
+        # Schemat Hornera na calej siatce naraz
+        taylor = np.zeros_like(z_arr)
+        for c in reversed(coeffs):
+            taylor = taylor * dz + float(c)
+        log_error = np.log10(np.abs(_evaluate_function_complex(func_id, z_arr) - taylor))
+
+    lo, hi = COMPLEX_LOG_RANGE
+    valid = np.isfinite(log_error)
+    scaled = (np.clip(np.where(valid, log_error, lo), lo, hi) - lo) / (hi - lo)
+    image = np.round(scaled * (COMPLEX_NODATA - 1)).astype(np.uint8)
+    image[~valid] = COMPLEX_NODATA
+    return base64.b64encode(image.tobytes()).decode('ascii'), half_width
+
+
+def _parse_center(data):
+    """Waliduje i zwraca punkt rozwiniecia a z requestu."""
+    center = float(data.get('center', 0))
+    if math.isnan(center) or math.isinf(center):
+        raise ValueError("Punkt rozwiniecia musi byc liczba skonczona")
+    if abs(center) > 20:
+        raise ValueError("Punkt rozwiniecia musi byc z zakresu [-20, 20]")
+    return center
+
+
+def _plot_range(func_info, center):
+    """Zakres wykresu - domyslny, przesuniety tak by centrum bylo w srodku."""
+    x_range = func_info['default_range']
+    if center != 0:
+        half_range = (x_range[1] - x_range[0]) / 2
+        x_range = [center - half_range, center + half_range]
+    return x_range
+
+
 def _validate_request_json():
     """Waliduje ze request zawiera poprawny JSON."""
     data = request.json
@@ -274,6 +581,10 @@ def compute():
         func: string - identyfikator funkcji
         degree: int - stopien wielomianu (0-20)
         center: float - punkt rozwiniecia a
+        precision: string - 'standard' (float64) lub 'high'
+            (dokladne wspolczynniki wymierne + sumowanie z kompensacja)
+        approximation: string - 'taylor' (domyslnie), 'pade' [L/M]
+            z M = n // 2, 'chebyshev' (interpolacja stopnia n) lub 'all'
 
     Response JSON:
         func_data: {x, y} - dane oryginalnej funkcji
@@ -281,6 +592,15 @@ def compute():
         coefficients: list - wspolczynniki
         polynomial: string - wielomian jako tekst
         error_at_point: float - blad w wybranym punkcie
+        error_data: {x, y} - rzeczywisty blad |f(x) - T_n(x)|
+        remainder_bound: {x, y} - oszacowanie Lagrange'a reszty
+            (null tam gdzie pochodna nieograniczona na odcinku [a, x])
+        bound_at_point: float - oszacowanie reszty w wybranym punkcie
+        approximations: dict - {rodzaj: {y, max_error}} dla wybranych
+            aproksymacji na wspolnej siatce x (max_error - blad jednostajny
+            na przedziale okreslonosci f wokol centrum)
+        coefficients_exact: list - wspolczynniki jako ulamki 'p/q'
+            (tylko precision='high' i a=0, inaczej null)
     """
     try:
         data = _validate_request_json()
@@ -293,11 +613,22 @@ def compute():
         if degree < 0 or degree > 20:
             raise ValueError("Stopien wielomianu musi byc miedzy 0 a 20")
 
-        center = float(data.get('center', 0))
-        if math.isnan(center) or math.isinf(center):
-            raise ValueError("Punkt rozwiniecia musi byc liczba skonczona")
-        if abs(center) > 20:
-            raise ValueError("Punkt rozwiniecia musi byc z zakresu [-20, 20]")
+        center = _parse_center(data)
+
+        precision = data.get('precision', 'standard')
+        if precision not in VALID_PRECISIONS:
+            raise ValueError(
+                f"Nieprawidlowa precyzja: {precision}. "
+                f"Dozwolone: {', '.join(VALID_PRECISIONS)}"
+            )
+        high_precision = precision == 'high'
+
+        approximation = data.get('approximation', 'taylor')
+        if approximation not in VALID_APPROXIMATIONS:
+            raise ValueError(
+                f"Nieprawidlowa aproksymacja: {approximation}. "
+                f"Dozwolone: {', '.join(VALID_APPROXIMATIONS)}"
+            )
 
         eval_point = data.get('eval_point', None)
         if eval_point is not None:
@@ -308,22 +639,17 @@ def compute():
         func_info = FUNCTIONS[func_id]
 
         # Zakres wykresu
-        x_range = func_info['default_range']
-        # Przesun zakres jesli centrum nie jest w srodku
-        if center != 0:
-            half_range = (x_range[1] - x_range[0]) / 2
-            x_range = [center - half_range, center + half_range]
-
+        x_range = _plot_range(func_info, center)
         x_arr = np.linspace(x_range[0], x_range[1], 500)
 
         # Oryginalna funkcja
         y_func = _evaluate_function(func_id, x_arr)
 
         # Wspolczynniki Taylora
-        coeffs = _taylor_coefficients(func_id, center, degree)
+        coeffs = _taylor_coefficients(func_id, center, degree, exact=high_precision)
 
         # Wielomian Taylora
-        y_taylor = _evaluate_taylor(coeffs, center, x_arr)
+        y_taylor = _evaluate_taylor(coeffs, center, x_arr, compensated=high_precision)
 
         # Ogranicz wartosci Taylora do rozsadnego zakresu
         y_func_clean = np.where(np.isnan(y_func) | np.isinf(y_func), None, y_func)
@@ -337,17 +663,63 @@ def compute():
 
         y_taylor_display = np.clip(y_taylor, display_min, display_max)
 
+        # Porownanie aproksymacji na wspolnej siatce
+        if approximation == 'all':
+            kinds = ('taylor', 'pade', 'chebyshev')
+        else:
+            kinds = (approximation,)
+        interval = _defined_interval(x_arr, y_func, center)
+        approximations = {}
+        for kind in kinds:
+            if kind == 'taylor':
+                y_approx = y_taylor
+            elif kind == 'pade':
+                p, q = _pade_coefficients(coeffs, degree // 2)
+                y_approx = _evaluate_pade(p, q, center, x_arr)
+            elif interval is not None:
+                cheb = _chebyshev_coefficients(func_id, degree, interval)
+                y_approx = _evaluate_chebyshev(cheb, interval, x_arr)
+            else:
+                y_approx = np.full_like(x_arr, np.nan)
+
+            max_error = None
+            if interval is not None:
+                in_interval = (x_arr >= interval[0]) & (x_arr <= interval[1])
+                with np.errstate(all='ignore'):
+                    approx_error = np.abs(y_func - y_approx)[in_interval]
+                max_error = safe_float(np.max(approx_error))
+
+            with np.errstate(invalid='ignore'):
+                y_display = np.clip(y_approx, display_min, display_max)
+            approximations[kind] = {
+                'y': [safe_float(v) for v in np.round(y_display, 8)],
+                'max_error': max_error,
+            }
+
         # Blad w wybranym punkcie
         error_at_point = None
+        bound_at_point = None
         if eval_point is not None:
             ep_arr = np.array([eval_point])
             f_val = float(_evaluate_function(func_id, ep_arr)[0])
-            t_val = float(_evaluate_taylor(coeffs, center, ep_arr)[0])
+            t_val = float(_evaluate_taylor(coeffs, center, ep_arr, compensated=high_precision)[0])
             if not (math.isnan(f_val) or math.isinf(f_val)):
                 error_at_point = abs(f_val - t_val)
+            path = np.linspace(min(center, eval_point), max(center, eval_point), 65)
+            path_bound = _remainder_bound(func_id, degree, center, path)
+            bound_at_point = float(path_bound[0] if eval_point < center else path_bound[-1])
+
+        # Rzeczywisty blad i gwarantowane oszacowanie reszty
+        with np.errstate(all='ignore'):
+            y_error = np.abs(y_func - y_taylor)
+        y_bound = _remainder_bound(func_id, degree, center, x_arr)
 
         # Formatuj wielomian
-        polynomial_str = _format_polynomial(coeffs, center)
+        polynomial_str = _format_polynomial([float(c) for c in coeffs], center)
+
+        coefficients_exact = None
+        if all(isinstance(c, Fraction) for c in coeffs):
+            coefficients_exact = [str(c) for c in coeffs]
 
         # Przygotuj dane bezpieczne do JSON
         func_x = x_arr.tolist()
@@ -365,11 +737,18 @@ def compute():
             'func_data': {'x': func_x, 'y': func_y},
             'taylor_data': {'x': func_x, 'y': taylor_y},
             'coefficients': safe_coeffs,
+            'coefficients_exact': coefficients_exact,
             'polynomial': polynomial_str,
             'error_at_point': round(safe_float(error_at_point), 10) if error_at_point is not None and safe_float(error_at_point) is not None else None,
+            'error_data': {'x': func_x, 'y': [safe_float(v) for v in y_error]},
+            'remainder_bound': {'x': func_x, 'y': [safe_float(v) for v in y_bound]},
+            'bound_at_point': safe_float(bound_at_point),
+            'approximations': approximations,
+            'approximation_interval': interval,
             'y_range': [round(float(display_min), 4), round(float(display_max), 4)],
             'convergence_radius': func_info['convergence_radius'],
             'center': center,
+            'precision': precision,
         }
 
         return jsonify(result)
@@ -383,6 +762,159 @@ def compute():
         }), 500
 
 
+@app.route('/api/error_surface', methods=['POST'])
+def error_surface():
+    """
+    Oblicza powierzchnie bledu |f(x) - T_n(x)| dla n = 0..max_degree.
+
+    Wszystkie sumy czesciowe liczone sa w jednym przebiegu
+    (skumulowana suma wyrazow), zamiast osobnego wywolania
+    /api/compute dla kazdego stopnia.
+
+    Request JSON:
+        func: string - identyfikator funkcji
+        center: float - punkt rozwiniecia a
+        max_degree: int - najwyzszy stopien (0-20, domyslnie 20)
+        points: int - liczba punktow siatki x (10-500, domyslnie 200)
+
+    Response JSON:
+        x: list - siatka x
+        degrees: list - stopnie 0..max_degree
+        log_error: list[list] - log10|f - T_n|, wiersz na stopien
+            (null tam gdzie f nie jest okreslona)
+        log_error_range: [min, max] - zakres do skali kolorow
+    """
+    try:
+        data = _validate_request_json()
+
+        func_id = data.get('func', 'sin')
+        if func_id not in FUNCTIONS:
+            raise ValueError(f"Nieznana funkcja: {func_id}")
+
+        max_degree = int(data.get('max_degree', 20))
+        if max_degree < 0 or max_degree > 20:
+            raise ValueError("Stopien wielomianu musi byc miedzy 0 a 20")
+
+        num_points = int(data.get('points', 200))
+        if num_points < 10 or num_points > 500:
+            raise ValueError("Liczba punktow musi byc miedzy 10 a 500")
+
+        center = _parse_center(data)
+        func_info = FUNCTIONS[func_id]
+
+        x_range = _plot_range(func_info, center)
+        x_arr = np.linspace(x_range[0], x_range[1], num_points)
+
+        y_func = _evaluate_function(func_id, x_arr)
+        coeffs = _taylor_coefficients(func_id, center, max_degree)
+        partial_sums = _taylor_partial_sums(coeffs, center, x_arr)
+
+        with np.errstate(all='ignore'):
+            log_error = np.log10(np.abs(y_func[None, :] - partial_sums))
+        # Blad ponizej precyzji float64 traktujemy jako jej dolna granice
+        log_error = np.maximum(log_error, ERROR_SURFACE_FLOOR)
+        valid = np.isfinite(log_error)
+
+        if np.any(valid):
+            log_range = [round(float(np.min(log_error[valid])), 4),
+                         round(float(np.max(log_error[valid])), 4)]
+        else:
+            log_range = [ERROR_SURFACE_FLOOR, 0]
+
+        rounded = np.round(log_error, 4)
+        log_error_list = np.where(valid, rounded, None).tolist()
+
+        return jsonify({
+            'success': True,
+            'x': x_arr.tolist(),
+            'degrees': list(range(max_degree + 1)),
+            'log_error': log_error_list,
+            'log_error_range': log_range,
+            'convergence_radius': func_info['convergence_radius'],
+            'center': center,
+        })
+
+    except (ValueError, TypeError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception:
+        return jsonify({
+            'success': False,
+            'error': 'Nieoczekiwany blad serwera'
+        }), 500
+
+
+@app.route('/api/complex_error', methods=['POST'])
+def complex_error():
+    """
+    Obraz bledu |f(z) - T_n(z)| na plaszczyznie zespolonej.
+
+    Pokazuje kolo zbieznosci wokol centrum i osobliwosci,
+    ktore wyznaczaja jego promien.
+
+    Request JSON:
+        func: string - identyfikator funkcji
+        degree: int - stopien wielomianu (0-20)
+        center: float - punkt rozwiniecia a
+        size: int - rozdzielczosc obrazu (16-512, domyslnie 256)
+
+    Response JSON:
+        image: string - base64 z size*size bajtow uint8 (wierszami,
+            od gory), wartosc k odpowiada log10 bledu
+            scale[0] + k/254 * (scale[1] - scale[0])
+        nodata: int - wartosc bajtu dla punktow bez wartosci
+        scale: [min, max] - zakres log10 bledu
+        extent: {re: [min, max], im: [min, max]}
+        singularities: list of {re, im}
+        convergence_radius: float - odleglosc do najblizszej osobliwosci
+    """
+    try:
+        data = _validate_request_json()
+
+        func_id = data.get('func', 'sin')
+        if func_id not in FUNCTIONS:
+            raise ValueError(f"Nieznana funkcja: {func_id}")
+
+        degree = int(data.get('degree', 5))
+        if degree < 0 or degree > 20:
+            raise ValueError("Stopien wielomianu musi byc miedzy 0 a 20")
+
+        size = int(data.get('size', 256))
+        if size < 16 or size > 512:
+            raise ValueError("Rozdzielczosc musi byc miedzy 16 a 512")
+
+        center = _parse_center(data)
+
+        image, half_width = _complex_error_image(func_id, degree, center, size)
+
+        singularities = [
+            {'re': complex(s).real, 'im': complex(s).imag}
+            for s in FUNCTIONS[func_id]['singularities']
+        ]
+
+        return jsonify({
+            'success': True,
+            'image': image,
+            'size': size,
+            'nodata': COMPLEX_NODATA,
+            'scale': list(COMPLEX_LOG_RANGE),
+            'extent': {
+                're': [center - half_width, center + half_width],
+                'im': [-half_width, half_width],
+            },
+            'singularities': singularities,
+            'convergence_radius': _singularity_radius(func_id, center),
+            'center': center,
+        })
+
+    except (ValueError, TypeError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception:
+        return jsonify({
+            'success': False,
+            'error': 'Nieoczekiwany blad serwera'
+        }), 500
+
+
 @app.route('/api/functions')
 def functions():
     """Zwraca liste dostepnych funkcji."""